@@ -1,38 +1,204 @@
+import contextvars
 import os
-from dotenv import load_dotenv
+import threading
+from contextlib import contextmanager
 
-# Load environment variables from .env file if it exists
-load_dotenv()
+# Per-tenant values shadowing the deployment's settings in the current context
+# (see Settings.override); copied into worker threads along with the trace.
+_overrides = contextvars.ContextVar("settings_overrides", default=None)
 
 class Settings:
-    """Centralized configuration for the ATS Integration Microservice."""
-    
-    ATS_PROVIDER = os.getenv("ATS_PROVIDER", "greenhouse").lower()
-    ATS_API_KEY = os.getenv("ATS_API_KEY", "")
-    ATS_BASE_URL = os.getenv("ATS_BASE_URL", "https://api.mockats.com")
-    ATS_ACCOUNT_ID = os.getenv("ATS_ACCOUNT_ID", "")
-
-    # Zoho Specific
-    ZOHO_CLIENT_ID = os.getenv("ZOHO_CLIENT_ID", "")
-    ZOHO_CLIENT_SECRET = os.getenv("ZOHO_CLIENT_SECRET", "")
-    ZOHO_REFRESH_TOKEN = os.getenv("ZOHO_REFRESH_TOKEN", "")
-    ZOHO_BASE_URL = os.getenv("ZOHO_BASE_URL", "https://recruit.zoho.com/recruit/v2")
-    ZOHO_TOKEN_URL = os.getenv("ZOHO_TOKEN_URL", "https://accounts.zoho.com/oauth/v2/token")
-
-    # Define supported providers
-    SUPPORTED_PROVIDERS = ["greenhouse", "workable", "zoho"]
-
-    @classmethod
-    def validate(cls):
+    """
+    Centralized configuration for the ATS Integration Microservice.
+
+    Values are read from the environment (and a .env file, if present) once, on
+    first attribute access, so importing this module costs nothing on cold start.
+    """
+
+    def __init__(self):
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __getattribute__(self, name):
+        overrides = _overrides.get()
+        if overrides is not None and name in overrides:
+            return overrides[name]
+        return object.__getattribute__(self, name)
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set yet: resolve the whole configuration once
+        if name.startswith("_") or self.__dict__.get("_loaded"):
+            raise AttributeError(name)
+        self.load()
+        return object.__getattribute__(self, name)
+
+    def load(self):
+        """Resolve settings from the environment. Safe to call more than once."""
+        with self._lock:
+            if self._loaded:
+                return
+            from dotenv import load_dotenv
+            # Load environment variables from .env file if it exists
+            load_dotenv()
+            self._read_env()
+            self._loaded = True
+        self.validate()
+
+    @contextmanager
+    def override(self, values):
+        """Shadow settings with `values` (name -> value) in the current thread or task."""
+        token = _overrides.set({**(_overrides.get() or {}), **values})
+        try:
+            yield self
+        finally:
+            _overrides.reset(token)
+
+    def reload(self):
+        """Re-read the environment (e.g. after tests change it)."""
+        with self._lock:
+            self._loaded = False
+        self.load()
+
+    def _read_env(self):
+        self.ATS_PROVIDER = os.getenv("ATS_PROVIDER", "greenhouse").lower()
+        self.ATS_API_KEY = os.getenv("ATS_API_KEY", "")
+        self.ATS_BASE_URL = os.getenv("ATS_BASE_URL", "https://api.mockats.com")
+        self.ATS_ACCOUNT_ID = os.getenv("ATS_ACCOUNT_ID", "")
+        # Extra providers without code changes, e.g. "lever=my_ats.lever:LeverProvider,other=..."
+        self.ATS_PROVIDER_CLASSES = os.getenv("ATS_PROVIDER_CLASSES", "")
+
+        # Multi-tenant routing: per-tenant overrides of these settings, as JSON
+        # {"tenant": {"ATS_PROVIDER": "zoho", "ZOHO_CLIENT_ID": ...}, ...}; empty serves one account
+        self.TENANTS_FILE = os.getenv("TENANTS_FILE", "")
+        self.TENANTS_JSON = os.getenv("TENANTS_JSON", "")  # inline alternative to TENANTS_FILE
+        self.TENANT_HEADER = os.getenv("TENANT_HEADER", "X-Tenant-Id")  # or a /t/{tenant}/... path
+        self.TENANT_DEFAULT = os.getenv("TENANT_DEFAULT", "")  # tenant for requests that name none; empty rejects them
+        self.TENANT_ID = ""  # set per request by utils.tenants
+        self.PROVIDER_POOL_SIZE = int(os.getenv("PROVIDER_POOL_SIZE", "32"))  # warm provider instances kept (LRU)
+
+        # GET /jobs?providers=a,b: seconds each provider may take before its jobs are returned as they are
+        self.AGGREGATE_PROVIDER_BUDGET = float(os.getenv("AGGREGATE_PROVIDER_BUDGET", "8"))
+        self.AGGREGATE_PROVIDER_BUDGETS = os.getenv("AGGREGATE_PROVIDER_BUDGETS", "")  # per provider, e.g. "zoho=12,greenhouse=4"
+
+        # Zoho Specific
+        self.ZOHO_CLIENT_ID = os.getenv("ZOHO_CLIENT_ID", "")
+        self.ZOHO_CLIENT_SECRET = os.getenv("ZOHO_CLIENT_SECRET", "")
+        self.ZOHO_REFRESH_TOKEN = os.getenv("ZOHO_REFRESH_TOKEN", "")
+        self.ZOHO_BASE_URL = os.getenv("ZOHO_BASE_URL", "https://recruit.zoho.com/recruit/v2")
+        self.ZOHO_TOKEN_URL = os.getenv("ZOHO_TOKEN_URL", "https://accounts.zoho.com/oauth/v2/token")
+        self.ZOHO_TOKEN_REFRESH_MARGIN = int(os.getenv("ZOHO_TOKEN_REFRESH_MARGIN", "300"))  # refresh this many seconds early
+        self.ZOHO_TOKEN_RETRY_BACKOFF = int(os.getenv("ZOHO_TOKEN_RETRY_BACKOFF", "30"))  # wait after a failed refresh
+        self.ZOHO_TOKEN_FAILURE_BACKOFF = int(os.getenv("ZOHO_TOKEN_FAILURE_BACKOFF", "5"))  # fail fast this long when a failed refresh left no token
+        self.ZOHO_TOKEN_CACHE_DIR = os.getenv("ZOHO_TOKEN_CACHE_DIR", "")  # e.g. /tmp; empty disables persistence
+        self.ZOHO_PER_PAGE = int(os.getenv("ZOHO_PER_PAGE", "200"))  # Zoho's maximum page size
+        self.ZOHO_PAGE_CONCURRENCY = int(os.getenv("ZOHO_PAGE_CONCURRENCY", "4"))  # pages fetched ahead in parallel
+        self.ZOHO_BATCH_SIZE = int(os.getenv("ZOHO_BATCH_SIZE", "100"))  # Zoho's multi-record insert limit
+        self.ZOHO_SEARCH_CRITERIA_MAX = int(os.getenv("ZOHO_SEARCH_CRITERIA_MAX", "10"))  # conditions per search criteria
+        self.ZOHO_CRITERIA_MAX_LENGTH = int(os.getenv("ZOHO_CRITERIA_MAX_LENGTH", "1000"))  # characters per search criteria
+        self.ZOHO_CONDITIONAL_GET = os.getenv("ZOHO_CONDITIONAL_GET", "true").lower() == "true"  # If-Modified-Since revalidation
+        self.ZOHO_SNAPSHOT_MAX_AGE = int(os.getenv("ZOHO_SNAPSHOT_MAX_AGE", "900"))  # force a full refetch after this many seconds
+        self.ZOHO_SNAPSHOT_MAX_ENTRIES = int(os.getenv("ZOHO_SNAPSHOT_MAX_ENTRIES", "64"))
+
+        # Batch candidate ingestion
+        self.BATCH_MAX_CANDIDATES = int(os.getenv("BATCH_MAX_CANDIDATES", "1000"))
+
+        # Async candidate submission: POST /candidates enqueues and returns 202 (sync | async)
+        self.CANDIDATE_SUBMIT_MODE = os.getenv("CANDIDATE_SUBMIT_MODE", "sync").lower()  # clients may also send Prefer: respond-async
+        self.SUBMISSION_QUEUE_BACKEND = os.getenv("SUBMISSION_QUEUE_BACKEND", "sqlite").lower()
+        self.SUBMISSION_QUEUE_PATH = os.getenv("SUBMISSION_QUEUE_PATH", "/tmp/ats_submissions.sqlite3")  # must be shared with the worker
+        self.SUBMISSION_WORKER_ENABLED = os.getenv("SUBMISSION_WORKER_ENABLED", "false").lower() == "true"  # Prefer: respond-async is only honoured with the worker on
+        self.SUBMISSION_BATCH_SIZE = int(os.getenv("SUBMISSION_BATCH_SIZE", "100"))  # submissions coalesced per worker batch
+        self.SUBMISSION_MAX_BATCHES = int(os.getenv("SUBMISSION_MAX_BATCHES", "20"))  # per worker invocation
+        self.SUBMISSION_LEASE_SECONDS = int(os.getenv("SUBMISSION_LEASE_SECONDS", "300"))  # reclaim from a dead worker after this
+        self.SUBMISSION_MAX_ATTEMPTS = int(os.getenv("SUBMISSION_MAX_ATTEMPTS", "5"))  # retryable (429/5xx) failures
+        self.SUBMISSION_RETENTION = int(os.getenv("SUBMISSION_RETENTION", "86400"))  # keep finished statuses this long
+
+        # Email -> candidate id index, so repeat applicants skip create/search calls (memory | sqlite | none)
+        self.CANDIDATE_INDEX_BACKEND = os.getenv("CANDIDATE_INDEX_BACKEND", "sqlite").lower()
+        self.CANDIDATE_INDEX_PATH = os.getenv("CANDIDATE_INDEX_PATH", "/tmp/ats_candidates.sqlite3")
+        self.CANDIDATE_INDEX_MAX_ENTRIES = int(os.getenv("CANDIDATE_INDEX_MAX_ENTRIES", "50000"))  # persisted LRU bound
+        self.CANDIDATE_INDEX_MEMORY_ENTRIES = int(os.getenv("CANDIDATE_INDEX_MEMORY_ENTRIES", "1024"))  # in-memory LRU bound
+
+        # Multi-job application fetches
+        self.APPLICATIONS_MAX_JOB_IDS = int(os.getenv("APPLICATIONS_MAX_JOB_IDS", "100"))
+        self.APPLICATIONS_FANOUT_CONCURRENCY = int(os.getenv("APPLICATIONS_FANOUT_CONCURRENCY", "4"))
+
+        # Async providers (see handler *_async entry points)
+        self.ASYNC_MAX_CONNECTIONS = int(os.getenv("ASYNC_MAX_CONNECTIONS", "50"))  # requests in flight per container
+        self.ASYNC_HTTP_TIMEOUT = float(os.getenv("ASYNC_HTTP_TIMEOUT", "25"))
+
+        # Response compression (negotiated from Accept-Encoding; brotli only if the module is installed)
+        self.RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"
+        self.RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))  # smaller bodies are sent as-is
+        self.RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "5"))  # 1 (fast) .. 9 (small)
+        self.RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))  # 0 (fast) .. 11 (small)
+
+        # Pagination
+        self.PAGINATION_MAX_PAGES = int(os.getenv("PAGINATION_MAX_PAGES", "500"))
+        self.LIST_DEFAULT_LIMIT = int(os.getenv("LIST_DEFAULT_LIMIT", "100"))  # page size when only ?cursor= is given
+        self.LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "500"))
+        self.CURSOR_SECRET = os.getenv("CURSOR_SECRET", "")  # HMAC key for ?cursor= tokens; derived from ATS credentials if empty, random per container if there are none
+
+        # Read cache for provider listings (memory | file | sqlite | none)
+        self.CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+        self.CACHE_DIR = os.getenv("CACHE_DIR", "/tmp/ats_cache")
+        self.CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "/tmp/ats_cache.sqlite3")
+        self.CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+        self.CACHE_JOBS_TTL = int(os.getenv("CACHE_JOBS_TTL", "300"))
+        self.CACHE_APPLICATIONS_TTL = int(os.getenv("CACHE_APPLICATIONS_TTL", "60"))
+        self.CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "600"))  # serve stale while revalidating for this long
+
+        # Coalesce identical concurrent upstream reads into one fetch per container
+        self.SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+        self.SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "25"))  # seconds a waiting caller waits for the shared fetch
+
+        # Local replica of jobs/applications kept current by delta syncs
+        self.REPLICA_ENABLED = os.getenv("REPLICA_ENABLED", "false").lower() == "true"
+        self.REPLICA_READS = os.getenv("REPLICA_READS", "false").lower() == "true"  # serve GET endpoints from the replica
+        self.REPLICA_PATH = os.getenv("REPLICA_PATH", "/tmp/ats_replica.sqlite3")
+        self.REPLICA_MAX_STALENESS = int(os.getenv("REPLICA_MAX_STALENESS", "300"))  # sync before reading if older than this
+
+        # Zoho Recruit push notifications (POST /webhooks/zoho)
+        self.ZOHO_WEBHOOK_TOKEN = os.getenv("ZOHO_WEBHOOK_TOKEN", "")  # token set on the notification channel; empty rejects all
+        self.WEBHOOK_TOMBSTONE_TTL = int(os.getenv("WEBHOOK_TOMBSTONE_TTL", "604800"))  # remember pushed deletes this long
+
+        # HTTP connection pooling (shared by providers across warm invocations)
+        self.HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))  # number of hosts kept pooled
+        self.HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))  # keep-alive connections per host
+        self.HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+        self.HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))  # connection-level retries only
+        self.HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))  # seconds per upstream call
+        self.HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))  # seconds per upstream call
+
+        # Per-invocation deadline from the Lambda context (see utils.deadline)
+        self.DEADLINE_ENABLED = os.getenv("DEADLINE_ENABLED", "true").lower() == "true"
+        self.DEADLINE_MARGIN_MS = int(os.getenv("DEADLINE_MARGIN_MS", "1500"))  # kept back to encode the response
+
+        # Upstream call policy, per provider account (rate limit, retries, circuit breaker)
+        self.UPSTREAM_RATE_PER_MINUTE = float(os.getenv("UPSTREAM_RATE_PER_MINUTE", "100"))  # sustained request rate
+        self.UPSTREAM_BURST = int(os.getenv("UPSTREAM_BURST", "10"))  # requests allowed back to back
+        self.UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))  # idempotent calls only, on 429/5xx
+        self.UPSTREAM_BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))  # seconds, doubled per attempt
+        self.UPSTREAM_BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "10"))  # also caps Retry-After
+        self.UPSTREAM_BREAKER_THRESHOLD = int(os.getenv("UPSTREAM_BREAKER_THRESHOLD", "5"))  # consecutive failures to open
+        self.UPSTREAM_BREAKER_RESET = float(os.getenv("UPSTREAM_BREAKER_RESET", "30"))  # seconds before a trial call
+
+        # Per-request timing spans and metrics, logged in CloudWatch Embedded Metric Format
+        self.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+        self.METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "1.0"))  # fraction of invocations traced
+        self.METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "ATSIntegration")
+        self.METRICS_MAX_SPANS = int(os.getenv("METRICS_MAX_SPANS", "100"))  # span details kept per log line
+
+    def validate(self):
         """Simple validation for required settings."""
-        if not cls.ATS_API_KEY:
+        if not self.ATS_API_KEY:
             # We don't raise error here to allow mock/dev environment if needed
             # but in production, this would be critical
             print("Warning: ATS_API_KEY is not set.")
-        
-        if cls.ATS_PROVIDER not in cls.SUPPORTED_PROVIDERS:
-            print(f"Warning: Unsupported ATS provider: {cls.ATS_PROVIDER}")
 
-# Initialize settings
+        from providers.registry import provider_names
+        if self.ATS_PROVIDER not in provider_names():
+            print(f"Warning: Unsupported ATS provider: {self.ATS_PROVIDER}")
+
+# Initialize settings (resolved lazily on first use)
 settings = Settings()
-settings.validate()
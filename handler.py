@@ -1,27 +1,65 @@
 import json
-from services.jobs_service import JobsService
-from services.candidate_service import CandidateService
-from services.application_service import ApplicationService
-from utils.response import success_response, error_response
-from utils.errors import ATSError
+from utils.response import success_response, error_response, stream_response, negotiate_response, compress_response, get_body, get_header
+from utils.deadline import deadline_aware
+from utils.errors import ATSError, ValidationError
+from utils.telemetry import traced
+from utils.tenants import tenant_aware
 
+# Services (and through them providers, HTTP clients and SQLite) are imported inside
+# each handler, so a cold start only loads what the invoked function needs.
+
+@tenant_aware
+@traced
+@deadline_aware
 def get_jobs(event, context):
-    """GET /jobs"""
+    """
+    GET /jobs[?fields=&status=&location=&updated_since=] (add limit=N[&cursor=...] for one window at a time,
+    or providers=a,b,... to merge several ATS providers)
+    """
     try:
+        from services.jobs_service import JobsService
+        from utils.query import ListQuery
+        query_params = event.get("queryStringParameters") or {}
+        query = ListQuery.from_params(query_params, "jobs")
+        if query_params.get("providers"):
+            if "limit" in query_params or "cursor" in query_params:
+                raise ValidationError("limit and cursor cannot be combined with providers.")
+            from services.aggregate_service import AggregateJobsService
+            result = AggregateJobsService().list_jobs(query_params["providers"].split(","), query=query)
+            return negotiate_response(success_response(result), event)
         service = JobsService()
-        jobs = service.list_jobs()
-        return success_response(jobs)
+        if "limit" in query_params or "cursor" in query_params:
+            window = service.list_jobs_window(query_params.get("limit"), query_params.get("cursor"), query=query)
+            return negotiate_response(success_response(window), event)
+        return negotiate_response(stream_response(service.iter_jobs(query=query)), event)
     except ATSError as e:
         return error_response(e.message, e.status_code)
     except Exception as e:
         print(f"Unhandled error: {str(e)}")
         return error_response("Internal Server Error", 500)
 
+@tenant_aware
+@traced
+@deadline_aware
 def create_candidate(event, context):
-    """POST /candidates"""
+    """POST /candidates (202 with a tracking id in async mode, or with Prefer: respond-async when the worker is enabled)"""
     try:
-        body = json.loads(event.get("body") or "{}")
+        body = json.loads(get_body(event) or "{}")
+        from services.candidate_service import CandidateService
         service = CandidateService()
+        prefer = get_header(event, "Prefer")
+        if service.accepts_async(prefer):
+            submission_id = service.submit(body)
+            status_url = f"/candidates/status/{submission_id}"
+            headers = {"Location": status_url}
+            if "respond-async" in (prefer or ""):
+                headers["Preference-Applied"] = "respond-async"
+            return success_response({
+                "message": "Candidate submission accepted",
+                "submission_id": submission_id,
+                "status": "queued",
+                "status_url": status_url
+            }, status_code=202, headers=headers)
         application_id = service.apply_to_job(body)
         
         return success_response({
@@ -34,18 +72,221 @@ def create_candidate(event, context):
         print(f"Unhandled error: {str(e)}")
         return error_response("Internal Server Error", 500)
 
+@tenant_aware
+@traced
+@deadline_aware
+def search_applications(event, context):
+    """POST /applications/search with {"job_ids": [...]}"""
+    try:
+        body = json.loads(get_body(event) or "{}")
+        from services.application_service import ApplicationService
+        service = ApplicationService()
+        jobs = service.list_applications_for_jobs(body.get("job_ids"))
+        return compress_response(success_response({"jobs": jobs}), event)
+    except json.JSONDecodeError:
+        return error_response("Request body must be valid JSON.", 400)
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@tenant_aware
+@traced
+@deadline_aware
+def create_candidates_batch(event, context):
+    """POST /candidates/batch"""
+    try:
+        body = json.loads(get_body(event) or "{}")
+        from services.candidate_service import CandidateService
+        service = CandidateService()
+        results = service.apply_batch(body)
+
+        failed = sum(1 for r in results if r["status"] != "success")
+        return success_response({
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results
+        }, status_code=201 if not failed else 207)
+    except json.JSONDecodeError:
+        return error_response("Request body must be valid JSON.", 400)
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@tenant_aware
+@traced
+@deadline_aware
 def get_applications(event, context):
-    """GET /applications?job_id=JOB_ID"""
+    """GET /applications?job_id=JOB_ID[&fields=&status=&updated_since=&limit=N&cursor=...] (or job_id=A,B,C for several jobs)"""
     try:
         query_params = event.get("queryStringParameters") or {}
         job_id = query_params.get("job_id")
-        
+
+        from services.application_service import ApplicationService
+        from utils.query import ListQuery
         service = ApplicationService()
-        applications = service.list_applications(job_id)
+        if job_id and "," in job_id:
+            jobs = service.list_applications_for_jobs(job_id.split(","))
+            return negotiate_response(success_response({"jobs": jobs}), event)
+        query = ListQuery.from_params(query_params, "applications")
+        if "limit" in query_params or "cursor" in query_params:
+            window = service.list_applications_window(
+                job_id, query_params.get("limit"), query_params.get("cursor"), query=query
+            )
+            return negotiate_response(success_response(window), event)
+        
+        applications = service.iter_applications(job_id, query=query)
         
-        return success_response(applications)
+        return negotiate_response(stream_response(applications), event)
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@tenant_aware
+@traced
+@deadline_aware
+def get_jobs_async(event, context):
+    """
+    GET /jobs on the async provider, driven by the container's event loop.
+    Unlike get_jobs, every call lists the ATS in full: the read cache, local replica
+    and conditional GET are not consulted, and query parameters (cursor windows,
+    filters, fields) are ignored.
+    """
+    from services.async_service import AsyncATSService
+    from utils.async_runtime import run as run_async
+    try:
+        jobs = run_async(AsyncATSService().list_jobs())
+        return negotiate_response(stream_response(jobs), event)
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@tenant_aware
+@traced
+@deadline_aware
+def create_candidate_async(event, context):
+    """POST /candidates on the async provider (always synchronous; the submission queue is not used)."""
+    from services.async_service import AsyncATSService
+    from utils.async_runtime import run as run_async
+    try:
+        body = json.loads(get_body(event) or "{}")
+        application_id = run_async(AsyncATSService().apply_to_job(body))
+        return success_response({
+            "message": "Candidate applied successfully",
+            "application_id": application_id
+        }, status_code=201)
     except ATSError as e:
         return error_response(e.message, e.status_code)
     except Exception as e:
         print(f"Unhandled error: {str(e)}")
         return error_response("Internal Server Error", 500)
+
+@tenant_aware
+@traced
+@deadline_aware
+def get_applications_async(event, context):
+    """
+    GET /applications?job_id=A[,B,...] on the async provider. Like get_jobs_async it
+    skips the read cache, replica and conditional GET and ignores filters and cursors.
+    """
+    from services.async_service import AsyncATSService
+    from utils.async_runtime import run as run_async
+    try:
+        query_params = event.get("queryStringParameters") or {}
+        job_id = query_params.get("job_id")
+        service = AsyncATSService()
+        if job_id and "," in job_id:
+            jobs = run_async(service.list_applications_for_jobs(job_id.split(",")))
+            return negotiate_response(success_response({"jobs": jobs}), event)
+        applications = run_async(service.list_applications(job_id))
+        return negotiate_response(stream_response(applications), event)
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@traced
+def sync_replica(event, context):
+    """Scheduled: delta-sync the local replica from the ATS."""
+    try:
+        from services.sync_service import SyncService
+        from utils.tenants import for_each_tenant
+        return success_response(for_each_tenant(lambda: SyncService().sync()))
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@traced
+def process_submissions(event, context):
+    """Scheduled: drain queued candidate submissions in coalesced batches."""
+    try:
+        from services.candidate_service import CandidateService
+        from utils.tenants import for_each_tenant
+        return success_response(for_each_tenant(lambda: CandidateService().process_submissions()))
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@tenant_aware
+@traced
+@deadline_aware
+def get_submission_status(event, context):
+    """GET /candidates/status/{id}"""
+    try:
+        submission_id = (event.get("pathParameters") or {}).get("id")
+        from services.candidate_service import CandidateService
+        return success_response(CandidateService().submission_status(submission_id))
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+@tenant_aware
+@traced
+@deadline_aware
+def zoho_webhook(event, context):
+    """POST /webhooks/zoho (Zoho Recruit change notifications)"""
+    try:
+        from services.webhook_service import WebhookService, ZohoNotification, delivery_token, verify_token
+        body, content_type = get_body(event), get_header(event, "Content-Type")
+        query_params, header_token = event.get("queryStringParameters"), get_header(event, "X-Zoho-Webhook-Token")
+        # Unauthenticated deliveries are rejected before the payload is validated
+        verify_token(delivery_token(body, content_type, query_params, header_token))
+        notification = ZohoNotification.parse(body, content_type, query_params, header_token)
+        return success_response(WebhookService().handle_zoho(notification))
+    except ATSError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        print(f"Unhandled error: {str(e)}")
+        return error_response("Internal Server Error", 500)
+
+def get_cache_stats(event, context):
+    """GET /internal/cache-stats"""
+    from utils.cache import get_cache
+    cache = get_cache()
+    return success_response(cache.stats() if cache is not None else {"enabled": False})
+
+def get_upstream_stats(event, context):
+    """GET /internal/upstream-stats"""
+    from utils.resilience import guard_snapshots
+    from utils.single_flight import single_flight_stats
+    return success_response({"upstreams": guard_snapshots(), "single_flight": single_flight_stats()})
+
+def get_tenant_usage(event, context):
+    """GET /internal/tenant-usage"""
+    from services.jobs_service import provider_pool_stats
+    from utils.tenants import tenant_usage
+    return success_response({"tenants": tenant_usage(), "provider_pool": provider_pool_stats()})
@@ -0,0 +1,116 @@
+import asyncio
+from abc import ABC, abstractmethod
+from config.settings import settings
+from utils.errors import ATSError
+from .base_provider import job_result
+
+class AsyncBaseATSProvider(ABC):
+    """
+    asyncio counterpart of BaseATSProvider.
+    Implementations keep many upstream requests in flight on one event loop
+    instead of using a thread per request.
+    """
+
+    page_concurrency = 1
+
+    @property
+    def account(self):
+        """Identifies the upstream account (see BaseATSProvider.account)."""
+        return settings.ATS_ACCOUNT_ID or settings.TENANT_ID
+
+    @abstractmethod
+    async def get_jobs(self):
+        """
+        Fetch all jobs from the ATS and normalize them.
+        :return: List of normalized job dictionaries.
+        """
+        pass
+
+    @abstractmethod
+    async def create_candidate(self, candidate_data):
+        """
+        Create a candidate in the ATS.
+        :param candidate_data: Dict containing name, email, phone, etc.
+        :return: Internal candidate ID.
+        """
+        pass
+
+    @abstractmethod
+    async def attach_candidate_to_job(self, candidate_id, job_id):
+        """
+        Link a candidate to a specific job opening.
+        :return: Application/Pipeline entry ID.
+        """
+        pass
+
+    @abstractmethod
+    async def get_applications(self, job_id):
+        """
+        Fetch applications for a specific job and normalize them.
+        :return: List of normalized application dictionaries.
+        """
+        pass
+
+    async def get_applications_for_jobs(self, job_ids):
+        """
+        Fetch applications for several jobs concurrently (bounded by APPLICATIONS_FANOUT_CONCURRENCY).
+        :return: Dict of job_id -> {"applications": [...], "error": None or {"message", "status_code"}}.
+        """
+        semaphore = asyncio.Semaphore(settings.APPLICATIONS_FANOUT_CONCURRENCY)
+
+        async def fetch(job_id):
+            async with semaphore:
+                try:
+                    return job_result(await self.get_applications(job_id))
+                except ATSError as e:
+                    return job_result(error={"message": e.message, "status_code": e.status_code})
+
+        results = await asyncio.gather(*(fetch(job_id) for job_id in job_ids))
+        return dict(zip(job_ids, results))
+
+    def forget_candidate(self, email):
+        """Drop any locally remembered candidate id for an email (see BaseATSProvider)."""
+        pass
+
+    async def aclose(self):
+        """Release pooled connections."""
+        pass
+
+    def normalize_job(self, raw_job):
+        """Standardize job fields across different ATS."""
+        raise NotImplementedError
+
+    def normalize_application(self, raw_app):
+        """Standardize application fields across different ATS."""
+        raise NotImplementedError
+
+class AsyncProviderAdapter(AsyncBaseATSProvider):
+    """
+    Exposes a sync BaseATSProvider through the async interface by running its
+    blocking calls in worker threads. Used for providers without a native async client.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    @property
+    def account(self):
+        return self.provider.account
+
+    async def get_jobs(self):
+        return await asyncio.to_thread(self.provider.get_jobs)
+
+    async def create_candidate(self, candidate_data):
+        return await asyncio.to_thread(self.provider.create_candidate, candidate_data)
+
+    async def attach_candidate_to_job(self, candidate_id, job_id):
+        return await asyncio.to_thread(self.provider.attach_candidate_to_job, candidate_id, job_id)
+
+    async def get_applications(self, job_id):
+        return await asyncio.to_thread(self.provider.get_applications, job_id)
+
+    async def get_applications_for_jobs(self, job_ids):
+        return await asyncio.to_thread(self.provider.get_applications_for_jobs, job_ids)
+
+    def forget_candidate(self, email):
+        self.provider.forget_candidate(email)
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import httpx
+from .async_base_provider import AsyncBaseATSProvider
+from .base_provider import job_result
+from .zoho import ZohoProvider, IDEMPOTENT_METHODS, JOB_FIELD_SOURCES, upstream_path, upstream_fields, criteria_value
+from config.settings import settings
+from utils.deadline import request_timeout, within_deadline
+from utils.errors import ATSError, CandidateNotFoundError
+from utils.pagination import apaginate_all, PaginatedList
+from utils.candidate_index import get_candidate_index
+from utils.replica import application_job_id
+from utils.resilience import get_guard
+from utils.telemetry import span
+from utils.token_cache import AsyncTokenManager
+
+class AsyncZohoProvider(AsyncBaseATSProvider):
+    """
+    Zoho Recruit ATS Integration on a pooled async HTTP client.
+    Covers full listings, application searches and candidate creation only: there is
+    no conditional GET, query pushdown, replica sync or bulk candidate insert here, so
+    those stay on ZohoProvider (see the *_async handlers in handler.py).
+    """
+
+    # Record mapping and criteria grouping are shared with the sync provider
+    normalize_job = ZohoProvider.normalize_job
+    normalize_application = ZohoProvider.normalize_application
+    normalize_jobs = ZohoProvider.normalize_jobs
+    normalize_applications = ZohoProvider.normalize_applications
+    _group_job_criteria = ZohoProvider._group_job_criteria
+    _indexed_candidate = ZohoProvider._indexed_candidate
+    _remember_candidate = ZohoProvider._remember_candidate
+    forget_candidate = ZohoProvider.forget_candidate
+    account = ZohoProvider.account
+
+    def __init__(self):
+        self.client_id = settings.ZOHO_CLIENT_ID
+        self.client_secret = settings.ZOHO_CLIENT_SECRET
+        self.refresh_token = settings.ZOHO_REFRESH_TOKEN
+        self.base_url = settings.ZOHO_BASE_URL
+        self.token_url = settings.ZOHO_TOKEN_URL
+        self.per_page = settings.ZOHO_PER_PAGE
+        self.page_concurrency = settings.ZOHO_PAGE_CONCURRENCY
+        self.search_criteria_max = settings.ZOHO_SEARCH_CRITERIA_MAX
+        self.criteria_max_length = settings.ZOHO_CRITERIA_MAX_LENGTH
+        # Same key as ZohoProvider, so sync and async providers share cached tokens
+        self.token_manager = AsyncTokenManager((self.client_id, self.refresh_token), self._fetch_access_token)
+        # Shares the sync provider's guard, so both count against one rate limit and breaker
+        self.guard = get_guard("zoho", self.client_id)
+        self.candidate_index = get_candidate_index(f"zoho:{self.client_id}")
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_POOL_MAXSIZE
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=settings.HTTP_MAX_RETRIES),
+            timeout=settings.ASYNC_HTTP_TIMEOUT
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _get_access_token(self, stale_token=None):
+        return await self.token_manager.get_token(stale_token=stale_token)
+
+    async def _fetch_access_token(self):
+        """Exchange the refresh token for a new access token. Returns (token, expires_in)."""
+        payload = {
+            "refresh_token": self.refresh_token,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "grant_type": "refresh_token"
+        }
+
+        try:
+            with span("auth.token") as timing:
+                response = await self.client.post(self.token_url, params=payload, timeout=_call_timeout())
+                timing.set(status=response.status_code)
+            response.raise_for_status()
+            data = response.json()
+            if "access_token" not in data:
+                raise ATSError(f"Failed to get access token: {data.get('error', 'Unknown error')}", 401)
+            return data["access_token"], data.get("expires_in")
+        except httpx.HTTPError as e:
+            raise ATSError(f"Zoho Auth Error: {str(e)}", 401)
+
+    async def _request(self, method, url, headers=None, **kwargs):
+        """
+        Send an authenticated request through the upstream guard, retrying once with a fresh
+        token on 401. Each call's timeouts end by the request deadline (see utils.deadline).
+        """
+        path, page = upstream_path(url, self.base_url), (kwargs.get("params") or {}).get("page")
+
+        async def attempt():
+            token = await self._get_access_token()
+            with span("upstream.http", method=method.upper(), path=path, page=page) as timing:
+                response = await self.client.request(
+                    method, url, headers=self._headers(token, headers), timeout=_call_timeout(), **kwargs
+                )
+                if response.status_code == 401:
+                    token = await self._get_access_token(stale_token=token)
+                    response = await self.client.request(
+                        method, url, headers=self._headers(token, headers), timeout=_call_timeout(), **kwargs
+                    )
+                timing.set(status=response.status_code)
+            return response
+
+        return await self.guard.acall(
+            attempt, idempotent=method.lower() in IDEMPOTENT_METHODS,
+            retry_exceptions=(httpx.ConnectError, httpx.TimeoutException)
+        )
+
+    @staticmethod
+    def _headers(token, extra_headers=None):
+        headers = {
+            "Authorization": f"Zoho-oauthtoken {token}",
+            "Content-Type": "application/json"
+        }
+        if extra_headers:
+            headers.update(extra_headers)
+        return headers
+
+    async def _fetch_raw_page(self, page=1, path="JobOpenings", params=None, headers=None):
+        """Fetch a single page of raw records from a module path. Returns (records, more_records)."""
+        url = f"{self.base_url}/{path}"
+        params = {**(params or {}), "page": page, "per_page": self.per_page}
+
+        try:
+            response = await self._request("GET", url, params=params, headers=headers)
+
+            if response.status_code in (204, 304) or not response.text:
+                return [], False
+
+            response.raise_for_status()
+            data = response.json()
+            return data.get("data", []), ZohoProvider._more_records(data)
+        except httpx.HTTPError as e:
+            raise ATSError(f"Zoho API Error: {str(e)}", 502)
+        except json.JSONDecodeError:
+            raise ATSError("Zoho API Error: Received invalid JSON response", 500)
+
+    async def get_jobs(self):
+        """Fetch all job openings, keeping up to `page_concurrency` pages in flight."""
+        raw_jobs = await apaginate_all(
+            self._fetch_raw_page, concurrency=self.page_concurrency,
+            path="JobOpenings", params={"fields": upstream_fields(JOB_FIELD_SOURCES)}
+        )
+        with span("normalize", resource="jobs", records=len(raw_jobs)):
+            jobs = self.normalize_jobs(raw_jobs)
+        return _with_truncation(jobs, raw_jobs)
+
+    async def get_applications(self, job_id):
+        raw_apps = await apaginate_all(
+            self._fetch_raw_page, concurrency=self.page_concurrency,
+            path="Applications/search", params={"criteria": f"($Job_Opening_Id:equals:{criteria_value(job_id)})"}
+        )
+        with span("normalize", resource="applications", records=len(raw_apps)):
+            applications = self.normalize_applications(raw_apps)
+        return _with_truncation(applications, raw_apps)
+
+    async def get_applications_for_jobs(self, job_ids):
+        """OR job ids into shared search criteria, then fetch all groups concurrently."""
+        semaphore = asyncio.Semaphore(settings.APPLICATIONS_FANOUT_CONCURRENCY)
+
+        async def fetch_group(criteria, group_ids):
+            async with semaphore:
+                try:
+                    raw_apps = await apaginate_all(
+                        self._fetch_raw_page, concurrency=self.page_concurrency,
+                        path="Applications/search", params={"criteria": criteria}
+                    )
+                except ATSError as e:
+                    error = {"message": e.message, "status_code": e.status_code}
+                    return {job_id: job_result(error=error) for job_id in group_ids}
+            by_job = {job_id: [] for job_id in group_ids}
+            for raw in raw_apps:
+                job_id = application_job_id(raw)
+                if job_id in by_job:
+                    by_job[job_id].append(self.normalize_application(raw))
+            return {job_id: job_result(apps) for job_id, apps in by_job.items()}
+
+        groups = await asyncio.gather(*(fetch_group(c, ids) for c, ids in self._group_job_criteria(job_ids)))
+        merged = {}
+        for group in groups:
+            merged.update(group)
+        return {job_id: merged[job_id] for job_id in job_ids}
+
+    async def create_candidate(self, candidate_data):
+        """Create a candidate in Zoho Recruit, or return existing ID if duplicate."""
+        url = f"{self.base_url}/Candidates"
+        email = candidate_data.get("email")
+        known_id = self._indexed_candidate(email)
+        if known_id:
+            return known_id
+        payload = {"data": [ZohoProvider._candidate_record(candidate_data)]}
+
+        try:
+            response = await self._request("POST", url, content=json.dumps(payload))
+            response.raise_for_status()
+            data = response.json().get("data", [{}])[0]
+        except httpx.HTTPError as e:
+            raise ATSError(f"Zoho API Error: {str(e)}", 500)
+
+        if data.get("status") == "success":
+            return self._remember_candidate(email, data.get("details", {}).get("id"))
+        if ZohoProvider._is_duplicate(data):
+            return self._remember_candidate(email, await self._search_candidate_by_email(email))
+        if data.get("status") == "error":
+            raise ATSError(f"Zoho Candidate Creation Error: {data.get('message')}", 400)
+        return data.get("details", {}).get("id")
+
+    async def _search_candidate_by_email(self, email):
+        candidates, _ = await self._fetch_raw_page(
+            path="Candidates/search", params={"criteria": f"Email:equals:{criteria_value(email)}"}
+        )
+        if candidates:
+            return candidates[0].get("id")
+        raise ATSError(f"Could not find existing candidate with email {email} despite duplicate error.", 404)
+
+    async def attach_candidate_to_job(self, candidate_id, job_id):
+        """Associate a candidate with a job opening."""
+        url = f"{self.base_url}/Candidates/actions/associate"
+        payload = {"data": [{"ids": [candidate_id], "jobids": [job_id], "status": "Associated"}]}
+
+        try:
+            response = await self._request("PUT", url, content=json.dumps(payload))
+            response.raise_for_status()
+            data = response.json().get("data", [{}])[0]
+        except httpx.HTTPError as e:
+            raise ATSError(f"Zoho API Error: {str(e)}", 500)
+
+        if ZohoProvider._is_missing_candidate(data, candidate_id):
+            raise CandidateNotFoundError(candidate_id)
+        if data.get("status") == "error":
+            raise ATSError(f"Zoho Association Error: {data.get('message')}", 400)
+        return f"{candidate_id}_{job_id}"
+
+def _with_truncation(items, source):
+    """Carry the pagination truncation and partial flags over to a normalized list."""
+    return PaginatedList(items, truncated=source.truncated, pages=source.pages, partial=source.partial)
+
+def _call_timeout():
+    """httpx timeouts for one call: ASYNC_HTTP_TIMEOUT and HTTP_CONNECT_TIMEOUT, ending by the request deadline."""
+    connect, _ = request_timeout()
+    return httpx.Timeout(within_deadline(settings.ASYNC_HTTP_TIMEOUT), connect=connect)
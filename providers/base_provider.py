@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import settings
+from utils.errors import ATSError
+from utils.telemetry import submit
 
 class BaseATSProvider(ABC):
     """
@@ -6,6 +10,20 @@ class BaseATSProvider(ABC):
     All ATS specific logic must be encapsulated in subclasses.
     """
 
+    # How many pages a provider may fetch in parallel (see utils.pagination.paginate_all)
+    page_concurrency = 1
+
+    # Whether the provider can keep a utils.replica.ReplicaStore in sync (see sync_replica)
+    supports_replica = False
+
+    # Records per upstream page for fetch_*_page; None when everything comes back as page 1
+    page_size = None
+
+    @property
+    def account(self):
+        """Identifies the upstream account, so per-process shared state never mixes accounts."""
+        return settings.ATS_ACCOUNT_ID or settings.TENANT_ID
+
     @abstractmethod
     def get_jobs(self):
         """
@@ -39,6 +57,119 @@ class BaseATSProvider(ABC):
         """
         pass
 
+    def get_applications_for_jobs(self, job_ids):
+        """
+        Fetch applications for several jobs, fanning out with bounded concurrency.
+        :return: Dict of job_id -> {"applications": [...], "error": None or {"message", "status_code"}}.
+        """
+        results = {}
+        for job_id, applications, error in fan_out(self.get_applications, job_ids):
+            results[job_id] = job_result(applications, error)
+        return results
+
+    def create_candidates(self, candidates):
+        """
+        Create many candidates in as few upstream calls as the ATS allows.
+        :param candidates: List of candidate dicts (name, email, phone, ...).
+        :return: List of per-record results in input order, each either
+                 {"status": "success", "id": ...} or {"status": "error", "message": ..., "status_code": ...}.
+        """
+        results = []
+        for candidate_data in candidates:
+            try:
+                results.append(batch_success(self.create_candidate(candidate_data)))
+            except ATSError as e:
+                results.append(batch_error(e.message, e.status_code))
+        return results
+
+    def attach_candidates(self, pairs):
+        """
+        Link many candidates to job openings.
+        :param pairs: List of (candidate_id, job_id) tuples.
+        :return: List of per-record results in input order (see create_candidates).
+        """
+        results = []
+        for candidate_id, job_id in pairs:
+            try:
+                results.append(batch_success(self.attach_candidate_to_job(candidate_id, job_id)))
+            except ATSError as e:
+                results.append(batch_error(e.message, e.status_code))
+        return results
+
+    def forget_candidate(self, email):
+        """
+        Drop any locally remembered candidate id for an email (e.g. after the ATS
+        reported it gone). Providers without a candidate index have nothing to forget.
+        """
+        pass
+
+    def forget_candidate_id(self, candidate_id):
+        """
+        Drop the remembered email -> id entry for a candidate id (e.g. after an id-only
+        change notification). :return: True if an entry was forgotten.
+        """
+        return False
+
+    def forget_listing(self, resource, job_id=None):
+        """
+        Drop any provider-side copy of a listing ("jobs", or a job's "applications";
+        every job's when job_id is None) after a pushed change. Providers that keep
+        no copies have nothing to forget.
+        """
+        pass
+
+    def iter_jobs(self):
+        """
+        Lazily yield normalized jobs.
+        Providers with paginated upstreams should override this to stream page by page.
+        """
+        return iter(self.get_jobs())
+
+    def iter_applications(self, job_id):
+        """
+        Lazily yield normalized applications for a job.
+        Providers with paginated upstreams should override this to stream page by page.
+        """
+        return iter(self.get_applications(job_id))
+
+    def fetch_jobs_page(self, page=1):
+        """
+        Fetch one upstream page of normalized jobs, for cursor-windowed listings.
+        Providers with upstream paging override this and set `page_size`.
+        :return: (jobs, more_records)
+        """
+        return (list(self.get_jobs()), False) if page == 1 else ([], False)
+
+    def fetch_applications_page(self, job_id, page=1):
+        """
+        Fetch one upstream page of normalized applications for a job (see fetch_jobs_page).
+        :return: (applications, more_records)
+        """
+        return (list(self.get_applications(job_id)), False) if page == 1 else ([], False)
+
+    def query_jobs(self, query):
+        """
+        Lazily yield normalized jobs matching a utils.query.ListQuery.
+        Providers translate what their API supports into upstream parameters and
+        evaluate the rest with `query.apply`; this default evaluates everything locally.
+        """
+        return query.apply(self.iter_jobs())
+
+    def query_applications(self, job_id, query):
+        """Lazily yield normalized applications for a job matching a ListQuery (see query_jobs)."""
+        return query.apply(self.iter_applications(job_id))
+
+    def record_updated_at(self, raw_record):
+        """Modification time of a raw upstream record as an aware datetime, or None if unknown."""
+        return None
+
+    def sync_replica(self, store):
+        """
+        Apply upstream changes since the last sync to a local ReplicaStore.
+        :return: Dict of per-resource sync counts.
+        """
+        raise NotImplementedError
+
     def normalize_job(self, raw_job):
         """Standardize job fields across different ATS."""
         raise NotImplementedError
@@ -46,3 +177,42 @@ class BaseATSProvider(ABC):
     def normalize_application(self, raw_app):
         """Standardize application fields across different ATS."""
         raise NotImplementedError
+
+    def normalize_jobs(self, raw_jobs):
+        """
+        Normalize a whole upstream page into utils.records.Job records.
+        Providers override this with a single loop over precomputed lookup tables.
+        """
+        return [self.normalize_job(raw_job) for raw_job in raw_jobs]
+
+    def normalize_applications(self, raw_apps):
+        """Normalize a whole upstream page into utils.records.Application records (see normalize_jobs)."""
+        return [self.normalize_application(raw_app) for raw_app in raw_apps]
+
+def batch_success(record_id):
+    """Per-record result for a successful batch operation."""
+    return {"status": "success", "id": record_id}
+
+def batch_error(message, status_code=400):
+    """Per-record result for a failed batch operation."""
+    return {"status": "error", "message": message, "status_code": status_code}
+
+def job_result(applications=None, error=None):
+    """Per-job entry of a multi-job applications response."""
+    return {"applications": list(applications or []), "error": error}
+
+def fan_out(func, items, concurrency=None):
+    """
+    Call func(item) for each item on a bounded thread pool.
+    Yields (item, result, error) in input order; ATSErrors are captured per item
+    as {"message", "status_code"} instead of failing the whole fan-out.
+    """
+    items = list(items)
+    concurrency = concurrency or settings.APPLICATIONS_FANOUT_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items) or 1))) as executor:
+        futures = [submit(executor, func, item) for item in items]
+        for item, future in zip(items, futures):
+            try:
+                yield item, future.result(), None
+            except ATSError as e:
+                yield item, None, {"message": e.message, "status_code": e.status_code}
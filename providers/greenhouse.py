@@ -1,17 +1,32 @@
-from .base_provider import BaseATSProvider
-from utils.pagination import paginate_all
+from .base_provider import BaseATSProvider, batch_success
+from utils.pagination import paginate_all, iter_items
+from utils.records import Job, Application
 import uuid
 
+# Greenhouse application statuses -> normalized statuses (anything else is APPLIED)
+APPLICATION_STATUSES = {
+    "initial_review": "SCREENING",
+    "active": "APPLIED",
+    "hired": "HIRED",
+    "rejected": "REJECTED"
+}
+
 class GreenhouseProvider(BaseATSProvider):
     """Greenhouse ATS Integration (Mock Implementation)"""
 
+    # Harvest allows 50 requests per 10 seconds, so keep the prefetch window small
+    page_concurrency = 2
+
     def get_jobs(self):
         # Fetching all pages internally
-        return paginate_all(self._fetch_jobs_page)
+        return paginate_all(self._fetch_jobs_page, concurrency=self.page_concurrency)
+
+    def iter_jobs(self):
+        return iter_items(self._fetch_jobs_page, concurrency=self.page_concurrency)
 
     def _fetch_jobs_page(self, page):
         # Mock data for Greenhouse
-        if page > 1: return [] # Only return 1 page for mock
+        if page > 1: return [], False # Only return 1 page for mock
         
         raw_jobs = [
             {
@@ -29,7 +44,7 @@ class GreenhouseProvider(BaseATSProvider):
                 "absolute_url": "https://boards.greenhouse.io/job/2"
             }
         ]
-        return [self.normalize_job(j) for j in raw_jobs]
+        return self.normalize_jobs(raw_jobs), False
 
     def create_candidate(self, candidate_data):
         # Mock candidate creation
@@ -41,6 +56,16 @@ class GreenhouseProvider(BaseATSProvider):
         print(f"Greenhouse: Attaching candidate {candidate_id} to job {job_id}")
         return f"app_{uuid.uuid4().hex[:8]}"
 
+    def create_candidates(self, candidates):
+        # Mock bulk candidate creation
+        print(f"Greenhouse: Creating {len(candidates)} candidates")
+        return [batch_success(f"can_{uuid.uuid4().hex[:8]}") for _ in candidates]
+
+    def attach_candidates(self, pairs):
+        # Mock bulk application creation
+        print(f"Greenhouse: Attaching {len(pairs)} candidates to jobs")
+        return [batch_success(f"app_{uuid.uuid4().hex[:8]}") for _ in pairs]
+
     def get_applications(self, job_id):
         # Mock fetching applications for a job
         raw_apps = [
@@ -50,28 +75,30 @@ class GreenhouseProvider(BaseATSProvider):
                 "status": "initial_review"
             }
         ]
-        return [self.normalize_application(a) for a in raw_apps]
+        return self.normalize_applications(raw_apps)
 
     def normalize_job(self, raw_job):
-        return {
-            "id": str(raw_job["id"]),
-            "title": raw_job["title"],
-            "location": raw_job["location"]["name"],
-            "status": "OPEN" if raw_job["status"] == "active" else "CLOSED",
-            "external_url": raw_job["absolute_url"]
-        }
+        return self.normalize_jobs((raw_job,))[0]
+
+    def normalize_jobs(self, raw_jobs):
+        return [
+            Job(
+                str(raw["id"]), raw["title"], raw["location"]["name"],
+                "OPEN" if raw["status"] == "active" else "CLOSED", raw["absolute_url"]
+            )
+            for raw in raw_jobs
+        ]
 
     def normalize_application(self, raw_app):
-        # Map statuses: initial_review -> SCREENING, etc.
-        status_map = {
-            "initial_review": "SCREENING",
-            "active": "APPLIED",
-            "hired": "HIRED",
-            "rejected": "REJECTED"
-        }
-        return {
-            "id": str(raw_app["id"]),
-            "candidate_name": f"{raw_app['candidate']['first_name']} {raw_app['candidate']['last_name']}",
-            "email": raw_app["candidate"]["email"],
-            "status": status_map.get(raw_app["status"], "APPLIED")
-        }
+        return self.normalize_applications((raw_app,))[0]
+
+    def normalize_applications(self, raw_apps):
+        statuses = APPLICATION_STATUSES
+        applications = []
+        for raw in raw_apps:
+            candidate = raw["candidate"]
+            applications.append(Application(
+                str(raw["id"]), f"{candidate['first_name']} {candidate['last_name']}",
+                candidate["email"], statuses.get(raw["status"], "APPLIED")
+            ))
+        return applications
@@ -0,0 +1,76 @@
+import importlib
+import threading
+from utils.errors import ProviderNotFoundError
+
+# Provider name -> "module:Class". Modules are imported only when their provider is
+# first used, so unused providers (and their HTTP clients) stay off the cold-start path.
+_providers = {
+    "greenhouse": "providers.greenhouse:GreenhouseProvider",
+    "workable": "providers.workable:WorkableProvider",
+    "zoho": "providers.zoho:ZohoProvider",
+}
+# Providers with a native AsyncBaseATSProvider; others are wrapped in AsyncProviderAdapter
+_async_providers = {
+    "zoho": "providers.async_zoho:AsyncZohoProvider",
+}
+_configured = False
+_lock = threading.Lock()
+
+def register_provider(name, target, async_target=None):
+    """
+    Register (or replace) a provider.
+
+    :param name: Value of ATS_PROVIDER that selects it.
+    :param target: A BaseATSProvider subclass, or a "module:Class" path imported on first use.
+    :param async_target: Optional AsyncBaseATSProvider subclass or path for the async handlers.
+    """
+    with _lock:
+        _providers[name.lower()] = target
+        if async_target is not None:
+            _async_providers[name.lower()] = async_target
+        else:
+            _async_providers.pop(name.lower(), None)
+
+def provider_names():
+    _load_configured()
+    with _lock:
+        return sorted(_providers)
+
+def load_provider_class(name):
+    """Return the provider class registered under `name`, importing it if needed."""
+    _load_configured()
+    with _lock:
+        target = _providers.get(name)
+    if target is None:
+        raise ProviderNotFoundError(name)
+    return _resolve(target)
+
+def load_async_provider_class(name):
+    """Return the native async provider class for `name`, or None if it has none."""
+    _load_configured()
+    with _lock:
+        target = _async_providers.get(name)
+    return _resolve(target) if target is not None else None
+
+def _resolve(target):
+    if not isinstance(target, str):
+        return target
+    module_name, _, class_name = target.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+def _load_configured():
+    """Register providers listed in ATS_PROVIDER_CLASSES (once)."""
+    global _configured
+    if _configured:
+        return
+    from config.settings import settings
+    entries = settings.ATS_PROVIDER_CLASSES  # first access may load settings, which configures us via validate()
+    if _configured:
+        return
+    for entry in entries.split(","):
+        name, _, target = entry.strip().partition("=")
+        if name and ":" in target:
+            register_provider(name.strip(), target.strip())
+        elif entry.strip():
+            print(f"Warning: Ignoring malformed ATS_PROVIDER_CLASSES entry: {entry.strip()}")
+    _configured = True
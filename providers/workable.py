@@ -1,6 +1,15 @@
-from .base_provider import BaseATSProvider
+from .base_provider import BaseATSProvider, batch_success
+from utils.records import Job, Application
 import uuid
 
+# Workable candidate stages -> normalized statuses (anything else is APPLIED)
+APPLICATION_STATUSES = {
+    "applied": "APPLIED",
+    "phone_screen": "SCREENING",
+    "hired": "HIRED",
+    "disqualified": "REJECTED"
+}
+
 class WorkableProvider(BaseATSProvider):
     """Workable ATS Integration (Mock Implementation)"""
 
@@ -15,7 +24,7 @@ class WorkableProvider(BaseATSProvider):
                 "url": "https://workable.com/job/1"
             }
         ]
-        return [self.normalize_job(j) for j in raw_jobs]
+        return self.normalize_jobs(raw_jobs)
 
     def create_candidate(self, candidate_data):
         print(f"Workable: Creating candidate {candidate_data['name']}")
@@ -25,6 +34,14 @@ class WorkableProvider(BaseATSProvider):
         print(f"Workable: Creating application for {candidate_id}")
         return f"wk_app_{uuid.uuid4().hex[:8]}"
 
+    def create_candidates(self, candidates):
+        print(f"Workable: Creating {len(candidates)} candidates")
+        return [batch_success(f"wk_can_{uuid.uuid4().hex[:8]}") for _ in candidates]
+
+    def attach_candidates(self, pairs):
+        print(f"Workable: Creating {len(pairs)} applications")
+        return [batch_success(f"wk_app_{uuid.uuid4().hex[:8]}") for _ in pairs]
+
     def get_applications(self, job_id):
         raw_apps = [
             {
@@ -34,27 +51,26 @@ class WorkableProvider(BaseATSProvider):
                 "stage": "applied"
             }
         ]
-        return [self.normalize_application(a) for a in raw_apps]
+        return self.normalize_applications(raw_apps)
 
     def normalize_job(self, raw_job):
-        return {
-            "id": raw_job["shortcode"],
-            "title": raw_job["title"],
-            "location": raw_job["location"]["city"],
-            "status": "OPEN" if raw_job["state"] == "published" else "CLOSED",
-            "external_url": raw_job["url"]
-        }
+        return self.normalize_jobs((raw_job,))[0]
+
+    def normalize_jobs(self, raw_jobs):
+        return [
+            Job(
+                raw["shortcode"], raw["title"], raw["location"]["city"],
+                "OPEN" if raw["state"] == "published" else "CLOSED", raw["url"]
+            )
+            for raw in raw_jobs
+        ]
 
     def normalize_application(self, raw_app):
-        status_map = {
-            "applied": "APPLIED",
-            "phone_screen": "SCREENING",
-            "hired": "HIRED",
-            "disqualified": "REJECTED"
-        }
-        return {
-            "id": str(raw_app["id"]),
-            "candidate_name": raw_app["name"],
-            "email": raw_app["email"],
-            "status": status_map.get(raw_app["stage"], "APPLIED")
-        }
+        return self.normalize_applications((raw_app,))[0]
+
+    def normalize_applications(self, raw_apps):
+        statuses = APPLICATION_STATUSES
+        return [
+            Application(str(raw["id"]), raw["name"], raw["email"], statuses.get(raw["stage"], "APPLIED"))
+            for raw in raw_apps
+        ]
@@ -1,26 +1,87 @@
 import requests
 import json
-from .base_provider import BaseATSProvider
+import time
+from datetime import datetime, timezone
+from .base_provider import BaseATSProvider, batch_success, batch_error, fan_out, job_result
 from config.settings import settings
-from utils.errors import ATSError
-from utils.pagination import paginate_all
+from utils.cache import MemoryCacheBackend
+from utils.candidate_index import get_candidate_index
+from utils.deadline import request_timeout
+from utils.errors import ATSError, CandidateNotFoundError
+from utils.http import build_session
+from utils.pagination import paginate_all, iter_items, iter_pages, PaginatedList
+from utils.records import Job, Application
+from utils.replica import application_job_id
+from utils.resilience import get_guard
+from utils.telemetry import span, event
+from utils.token_cache import TokenManager
+
+# Associating a candidate with a job twice is harmless, so PUT is retried like GET
+IDEMPOTENT_METHODS = {"get", "put"}
+
+# Zoho fields read by normalize_job / normalize_application, per normalized field.
+# Only these are requested, instead of every field of every record.
+JOB_FIELD_SOURCES = {
+    "id": (),
+    "title": ("Posting_Title",),
+    "location": ("City",),
+    "status": ("Status",),
+    "external_url": (),
+}
+APPLICATION_FIELD_SOURCES = {
+    "id": (),
+    "candidate_name": ("Full_Name", "First_Name", "Last_Name"),
+    "email": ("Email",),
+    "status": ("Application_Status",),
+}
+# Upstream value behind the normalized OPEN status
+OPEN_JOB_STATUS = "In-progress"
+# Record ids Zoho accepts in one `ids` lookup
+RECORD_IDS_MAX = 100
+JOB_URL_PREFIX = "https://recruit.zoho.com/recruit/ViewJob.na?digest="
 
 class ZohoProvider(BaseATSProvider):
     """Zoho Recruit ATS Integration"""
 
+    supports_replica = True
+
+    # replica resource -> Zoho module
+    REPLICA_MODULES = {"jobs": "JobOpenings", "applications": "Applications"}
+
     def __init__(self):
         self.client_id = settings.ZOHO_CLIENT_ID
         self.client_secret = settings.ZOHO_CLIENT_SECRET
         self.refresh_token = settings.ZOHO_REFRESH_TOKEN
         self.base_url = settings.ZOHO_BASE_URL
         self.token_url = settings.ZOHO_TOKEN_URL
-        self._access_token = None
+        self.per_page = settings.ZOHO_PER_PAGE
+        self.page_size = self.per_page
+        self.page_concurrency = settings.ZOHO_PAGE_CONCURRENCY
+        self.batch_size = settings.ZOHO_BATCH_SIZE
+        self.search_criteria_max = settings.ZOHO_SEARCH_CRITERIA_MAX
+        self.criteria_max_length = settings.ZOHO_CRITERIA_MAX_LENGTH
+        self.token_manager = TokenManager((self.client_id, self.refresh_token), self._fetch_access_token)
+        # Long-lived keep-alive pool; the provider itself is reused across warm invocations
+        self.session = build_session()
+        # Rate limit, retry and circuit breaker state shared by every client of this account
+        self.guard = get_guard("zoho", self.client_id)
+        # Known email -> candidate id, so repeat applicants need only the associate call
+        self.candidate_index = get_candidate_index(f"zoho:{self.client_id}")
+        # Last known copy of each listing, revalidated with If-Modified-Since
+        self.conditional_get = settings.ZOHO_CONDITIONAL_GET
+        self.snapshot_max_age = settings.ZOHO_SNAPSHOT_MAX_AGE
+        self._snapshots = MemoryCacheBackend(settings.ZOHO_SNAPSHOT_MAX_ENTRIES)
+
+    @property
+    def account(self):
+        return self.client_id
 
-    def _get_access_token(self):
-        """Fetch access token using refresh token."""
-        if self._access_token:
-            return self._access_token
+    def _get_access_token(self, stale_token=None):
+        """Return a cached access token, refreshing it when close to expiry or rejected."""
+        return self.token_manager.get_token(stale_token=stale_token)
 
+    def _fetch_access_token(self):
+        """Exchange the refresh token for a new access token. Returns (token, expires_in)."""
         payload = {
             "refresh_token": self.refresh_token,
             "client_id": self.client_id,
@@ -29,71 +90,188 @@ class ZohoProvider(BaseATSProvider):
         }
         
         try:
-            response = requests.post(self.token_url, params=payload)
+            with span("auth.token") as timing:
+                response = self.session.post(self.token_url, params=payload, timeout=request_timeout())
+                timing.set(status=response.status_code)
             response.raise_for_status()
             data = response.json()
             if "access_token" not in data:
                 raise ATSError(f"Failed to get access token: {data.get('error', 'Unknown error')}", 401)
             
-            self._access_token = data["access_token"]
-            return self._access_token
+            return data["access_token"], data.get("expires_in")
         except requests.exceptions.RequestException as e:
             raise ATSError(f"Zoho Auth Error: {str(e)}", 401)
 
-    def _get_headers(self):
+    def _get_headers(self, token=None):
         return {
-            "Authorization": f"Zoho-oauthtoken {self._get_access_token()}",
+            "Authorization": f"Zoho-oauthtoken {token or self._get_access_token()}",
             "Content-Type": "application/json"
         }
 
+    def _request(self, method, url, headers=None, **kwargs):
+        """
+        Send an authenticated request through the account's upstream guard.
+        Retries once with a fresh token on 401; idempotent calls (GET/PUT) are also
+        retried on 429/5xx and connection errors. Each call's connect/read timeouts
+        end by the request deadline (see utils.deadline).
+        """
+        send = getattr(self.session, method)
+        path, page = upstream_path(url, self.base_url), (kwargs.get("params") or {}).get("page")
+
+        def attempt():
+            token = self._get_access_token()
+            with span("upstream.http", method=method.upper(), path=path, page=page) as timing:
+                response = send(url, headers=self._merge_headers(token, headers), timeout=request_timeout(), **kwargs)
+                if response.status_code == 401:
+                    token = self._get_access_token(stale_token=token)
+                    response = send(url, headers=self._merge_headers(token, headers), timeout=request_timeout(), **kwargs)
+                timing.set(status=response.status_code)
+            return response
+
+        return self.guard.call(
+            attempt, idempotent=method in IDEMPOTENT_METHODS,
+            retry_exceptions=(requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        )
+
+    def _merge_headers(self, token, extra_headers):
+        headers = self._get_headers(token)
+        if extra_headers:
+            headers.update(extra_headers)
+        return headers
+
+    def _conditional_list(self, key, url, params, load):
+        """
+        Serve a listing from its last known copy when Zoho reports nothing changed.
+
+        Zoho list endpoints treat If-Modified-Since as "records modified since", so
+        a one-record probe answering 304 means the previous copy is still current;
+        any other answer triggers a full fetch. Copies older than
+        ZOHO_SNAPSHOT_MAX_AGE are always refetched, since deletions don't show up
+        as modifications.
+        """
+        if not self.conditional_get:
+            return load()
+
+        snapshot = self._snapshots.get(key)
+        if snapshot and time.time() - snapshot["stored_at"] < self.snapshot_max_age:
+            if self._unchanged_since(url, params, snapshot["value"]["last_modified"]):
+                return PaginatedList(snapshot["value"]["items"], truncated=snapshot["value"]["truncated"])
+
+        # Taken before fetching so changes made during the fetch are seen next time
+        last_modified = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        items = load()
+        if getattr(items, "partial", False):
+            # Cut short by the request deadline; not a copy to serve later
+            return items
+        self._snapshots.set(key, {
+            "value": {"items": list(items), "truncated": getattr(items, "truncated", False), "last_modified": last_modified},
+            "stored_at": time.time()
+        })
+        return items
+
+    def _unchanged_since(self, url, params, last_modified):
+        """Probe a list endpoint with If-Modified-Since; True when Zoho answers 304."""
+        try:
+            response = self._request(
+                "get", url,
+                params={**params, "page": 1, "per_page": 1},
+                headers={"If-Modified-Since": last_modified}
+            )
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code == 304
+
     def get_jobs(self):
         """Fetch all job openings from Zoho Recruit using pagination."""
-        return paginate_all(self._fetch_jobs_page)
+        return self._conditional_list(
+            "jobs", f"{self.base_url}/JobOpenings", {},
+            lambda: paginate_all(self._fetch_jobs_page, concurrency=self.page_concurrency)
+        )
+
+    def iter_jobs(self):
+        """Lazily yield job openings, holding at most `page_concurrency` pages in memory."""
+        if self.conditional_get:
+            # Revalidating needs the full copy, so serve the (possibly unchanged) snapshot
+            return self.get_jobs()
+        return iter_items(self._fetch_jobs_page, concurrency=self.page_concurrency)
+
+    def fetch_jobs_page(self, page=1):
+        return self._fetch_jobs_page(page)
 
     def _fetch_jobs_page(self, page=1):
-        """Fetch a single page of job openings."""
-        # Zoho Recruit uses 'page' and 'per_page' (or 'fromIndex' in older APIs)
-        # For the current API, let's use page and default per_page (usually 200)
+        """Fetch a single page of job openings. Returns (jobs, more_records)."""
         url = f"{self.base_url}/JobOpenings"
-        params = {"page": page}
+        params = {"page": page, "per_page": self.per_page, "fields": upstream_fields(JOB_FIELD_SOURCES)}
         
         try:
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._request("get", url, params=params)
             
             if response.status_code == 204 or not response.text:
-                return []
+                return [], False
                 
             response.raise_for_status()
             data = response.json()
             raw_jobs = data.get("data", [])
-            return [self.normalize_job(j) for j in raw_jobs]
+            with span("normalize", resource="jobs", records=len(raw_jobs)):
+                jobs = self.normalize_jobs(raw_jobs)
+            return jobs, self._more_records(data)
         except requests.exceptions.RequestException as e:
             raise ATSError(f"Zoho API Error: {str(e)}", 500)
         except json.JSONDecodeError:
             raise ATSError("Zoho API Error: Received invalid JSON response", 500)
 
+    def query_jobs(self, query):
+        """
+        Push filters into a JobOpenings search and the projection into `fields`; the
+        query is still re-applied locally, which also covers anything Zoho matched
+        more loosely.
+        """
+        conditions = []
+        if query.status:
+            operator = "equals" if query.status.upper() == "OPEN" else "not_equal"
+            conditions.append(f"(Status:{operator}:{OPEN_JOB_STATUS})")
+        if query.location:
+            conditions.append(f"(City:equals:{criteria_value(query.location)})")
+        if query.updated_since:
+            conditions.append(f"(Modified_Time:greater_equal:{query.updated_since.isoformat(timespec='seconds')})")
+
+        params = {"fields": query_fields(JOB_FIELD_SOURCES, query)}
+        path = "JobOpenings"
+        if conditions:
+            path, params["criteria"] = "JobOpenings/search", and_criteria(conditions)
+        records = iter_items(self._fetch_raw_page, concurrency=self.page_concurrency, path=path, params=params)
+        return query.apply(records, normalize=self.normalize_job, updated_at=self.record_updated_at)
+
+    def query_applications(self, job_id, query):
+        """Push status/updated_since into the job's Applications search criteria and the projection into `fields` (see query_jobs)."""
+        conditions = [f"($Job_Opening_Id:equals:{criteria_value(job_id)})"]
+        if query.status:
+            conditions.append(f"(Application_Status:equals:{criteria_value(query.status)})")
+        if query.updated_since:
+            conditions.append(f"(Modified_Time:greater_equal:{query.updated_since.isoformat(timespec='seconds')})")
+
+        records = iter_items(
+            self._fetch_raw_page, concurrency=self.page_concurrency, path="Applications/search",
+            params={"criteria": and_criteria(conditions), "fields": query_fields(APPLICATION_FIELD_SOURCES, query)}
+        )
+        return query.apply(records, normalize=self.normalize_application, updated_at=self.record_updated_at)
+
+    def record_updated_at(self, raw_record):
+        return _parse_time(raw_record.get("Modified_Time"))
+
     def create_candidate(self, candidate_data):
         """Create a candidate in Zoho Recruit, or return existing ID if duplicate."""
         url = f"{self.base_url}/Candidates"
         
         email = candidate_data.get("email")
-        name_parts = candidate_data.get("name", "").split(" ", 1)
-        first_name = name_parts[0]
-        last_name = name_parts[1] if len(name_parts) > 1 else "N/A"
+        known_id = self._indexed_candidate(email)
+        if known_id:
+            return known_id
 
-        payload = {
-            "data": [
-                {
-                    "First_Name": first_name,
-                    "Last_Name": last_name,
-                    "Email": email,
-                    "Mobile": candidate_data.get("phone", "")
-                }
-            ]
-        }
+        payload = {"data": [self._candidate_record(candidate_data)]}
         
         try:
-            response = requests.post(url, headers=self._get_headers(), data=json.dumps(payload))
+            response = self._request("post", url, data=json.dumps(payload))
             response.raise_for_status()
             result = response.json()
             
@@ -101,12 +279,12 @@ class ZohoProvider(BaseATSProvider):
             
             # Handle success
             if data.get("status") == "success":
-                return data.get("details", {}).get("id")
+                return self._remember_candidate(email, data.get("details", {}).get("id"))
             
             # Handle duplicate error
-            if data.get("status") == "error" and (data.get("code") == "DUPLICATE_DATA" or "Duplicate values" in data.get("message", "")):
-                print(f"Zoho Debug: Candidate {email} already exists. Searching for existing ID...")
-                return self._search_candidate_by_email(email)
+            if self._is_duplicate(data):
+                event("zoho.candidate_duplicate")
+                return self._remember_candidate(email, self._search_candidate_by_email(email))
                 
             if data.get("status") == "error":
                 raise ATSError(f"Zoho Candidate Creation Error: {data.get('message')}", 400)
@@ -115,21 +293,145 @@ class ZohoProvider(BaseATSProvider):
         except requests.exceptions.RequestException as e:
             raise ATSError(f"Zoho API Error: {str(e)}", 500)
 
+    def _indexed_candidate(self, email):
+        return self.candidate_index.get(email) if self.candidate_index is not None else None
+
+    def _remember_candidate(self, email, candidate_id):
+        if self.candidate_index is not None:
+            self.candidate_index.put(email, candidate_id)
+        return candidate_id
+
+    def forget_candidate(self, email):
+        if self.candidate_index is not None:
+            self.candidate_index.discard(email)
+
+    def forget_candidate_id(self, candidate_id):
+        return self.candidate_index is not None and self.candidate_index.discard_id(candidate_id) is not None
+
+    def forget_listing(self, resource, job_id=None):
+        # Snapshot keys used by get_jobs / get_applications
+        if resource == "jobs":
+            self._snapshots.delete("jobs")
+        elif job_id is None:
+            self._snapshots.delete_prefix("applications:")
+        else:
+            self._snapshots.delete(f"applications:{job_id}")
+
+    def fetch_records(self, module, ids):
+        """Raw records of a module by id, RECORD_IDS_MAX per request (e.g. for webhook notifications)."""
+        ids = [str(record_id) for record_id in ids]
+        records = []
+        for start in range(0, len(ids), RECORD_IDS_MAX):
+            chunk = ids[start:start + RECORD_IDS_MAX]
+            records.extend(iter_items(self._fetch_raw_page, path=module, params={"ids": ",".join(chunk)}))
+        return records
+
+    @staticmethod
+    def _candidate_record(candidate_data):
+        """Map a candidate payload to a Zoho Candidates record."""
+        name_parts = candidate_data.get("name", "").split(" ", 1)
+        return {
+            "First_Name": name_parts[0],
+            "Last_Name": name_parts[1] if len(name_parts) > 1 else "N/A",
+            "Email": candidate_data.get("email"),
+            "Mobile": candidate_data.get("phone", "")
+        }
+
+    @staticmethod
+    def _is_duplicate(data):
+        return data.get("status") == "error" and (
+            data.get("code") == "DUPLICATE_DATA" or "Duplicate values" in data.get("message", "")
+        )
+
+    def create_candidates(self, candidates):
+        """
+        Create candidates with Zoho's multi-record insert (up to 100 per call).
+        Emails already in the candidate index reuse their id, like create_candidate.
+        Duplicates are resolved with batched email searches instead of one search each.
+        """
+        url = f"{self.base_url}/Candidates"
+        results = [None] * len(candidates)
+        duplicates = {}  # index -> email
+
+        pending = []
+        for index, candidate_data in enumerate(candidates):
+            known_id = self._indexed_candidate(candidate_data.get("email"))
+            if known_id:
+                results[index] = batch_success(known_id)
+            else:
+                pending.append(index)
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            payload = {"data": [self._candidate_record(candidates[i]) for i in chunk]}
+            try:
+                response = self._request("post", url, data=json.dumps(payload))
+                response.raise_for_status()
+                records = response.json().get("data", [])
+            except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                for i in chunk:
+                    results[i] = batch_error(f"Zoho API Error: {str(e)}", 500)
+                continue
+
+            for offset, i in enumerate(chunk):
+                email = candidates[i].get("email")
+                data = records[offset] if offset < len(records) else {}
+                if data.get("status") == "success":
+                    results[i] = batch_success(self._remember_candidate(email, data.get("details", {}).get("id")))
+                elif self._is_duplicate(data):
+                    duplicates[i] = email
+                else:
+                    message = data.get("message") or "No result returned for record"
+                    results[i] = batch_error(f"Zoho Candidate Creation Error: {message}", 400)
+
+        if duplicates:
+            existing, failures = self._search_candidates_by_emails(set(duplicates.values()))
+            for index, email in duplicates.items():
+                candidate_id = existing.get((email or "").lower())
+                failure = failures.get(email)
+                if candidate_id:
+                    results[index] = batch_success(self._remember_candidate(email, candidate_id))
+                elif failure is not None:
+                    # The search itself failed (e.g. 429/503), so the candidate may well exist
+                    results[index] = batch_error(f"Zoho Search Error: {failure.message}", failure.status_code)
+                else:
+                    results[index] = batch_error(
+                        f"Could not find existing candidate with email {email} despite duplicate error.", 404
+                    )
+        return results
+
+    def _search_candidates_by_emails(self, emails):
+        """
+        Look up candidate IDs for many emails, OR-ing them into as few searches as possible.
+        :return: (lowercased email -> id, email -> ATSError of the search that covered it when it failed)
+        """
+        emails = sorted(e for e in emails if e)
+        found, failures = {}, {}
+        for start in range(0, len(emails), self.search_criteria_max):
+            chunk = emails[start:start + self.search_criteria_max]
+            criteria = "or".join(f"(Email:equals:{criteria_value(email)})" for email in chunk)
+            try:
+                for record in iter_items(self._fetch_raw_page, path="Candidates/search", params={"criteria": f"({criteria})"}):
+                    if record.get("Email"):
+                        found.setdefault(record["Email"].lower(), record.get("id"))
+            except ATSError as e:
+                print(f"Warning: Bulk candidate search failed: {e.message}")
+                failures.update((email, e) for email in chunk)
+        return found, failures
+
     def _search_candidate_by_email(self, email):
         """Search for a candidate ID by email address."""
         url = f"{self.base_url}/Candidates/search"
-        params = {"criteria": f"Email:equals:{email}"}
+        params = {"criteria": f"Email:equals:{criteria_value(email)}"}
         
         try:
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._request("get", url, params=params)
             response.raise_for_status()
             data = response.json()
             
             candidates = data.get("data", [])
             if candidates:
-                existing_id = candidates[0].get("id")
-                print(f"Zoho Debug: Found existing candidate ID: {existing_id}")
-                return existing_id
+                return candidates[0].get("id")
                 
             raise ATSError(f"Could not find existing candidate with email {email} despite duplicate error.", 404)
         except requests.exceptions.RequestException as e:
@@ -150,11 +452,13 @@ class ZohoProvider(BaseATSProvider):
         }
         
         try:
-            response = requests.put(url, headers=self._get_headers(), data=json.dumps(payload))
+            response = self._request("put", url, data=json.dumps(payload))
             response.raise_for_status()
             result = response.json()
             
             data = result.get("data", [{}])[0]
+            if self._is_missing_candidate(data, candidate_id):
+                raise CandidateNotFoundError(candidate_id)
             if data.get("status") == "error":
                 raise ATSError(f"Zoho Association Error: {data.get('message')}", 400)
             
@@ -163,57 +467,306 @@ class ZohoProvider(BaseATSProvider):
             error_body = ""
             if hasattr(e, 'response') and e.response is not None:
                 error_body = e.response.text
-            print(f"Zoho Debug: Association failed. URL: {url} - Body: {error_body}")
+            print(f"Warning: Zoho association failed. URL: {url} - Body: {error_body[:500]}")
+            event("zoho.associate_failed", body=error_body[:500])
             raise ATSError(f"Zoho API Error: {str(e)}", 500)
 
+    @staticmethod
+    def _is_missing_candidate(data, candidate_id):
+        """True when Zoho rejected an association because the candidate id is unknown (e.g. deleted)."""
+        if data.get("status") != "error" or data.get("code") not in ("INVALID_DATA", "RECORD_NOT_FOUND"):
+            return False
+        details = data.get("details") or {}
+        return details.get("api_name") == "ids" or str(details.get("id")) == str(candidate_id)
+
+    def attach_candidates(self, pairs):
+        """
+        Associate many candidates with jobs, one multi-id `ids`/`jobids` call per job
+        (up to 100 candidates each).
+        """
+        url = f"{self.base_url}/Candidates/actions/associate"
+        results = [None] * len(pairs)
+        by_job = {}
+        for index, (candidate_id, job_id) in enumerate(pairs):
+            by_job.setdefault(job_id, []).append(index)
+
+        for job_id, indexes in by_job.items():
+            for start in range(0, len(indexes), self.batch_size):
+                chunk = indexes[start:start + self.batch_size]
+                candidate_ids = [pairs[i][0] for i in chunk]
+                payload = {"data": [{"ids": candidate_ids, "jobids": [job_id], "status": "Associated"}]}
+                try:
+                    response = self._request("put", url, data=json.dumps(payload))
+                    response.raise_for_status()
+                    records = response.json().get("data", [])
+                except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                    for i in chunk:
+                        results[i] = batch_error(f"Zoho API Error: {str(e)}", 500)
+                    continue
+
+                for position, i in enumerate(chunk):
+                    # Zoho may answer per candidate or once for the whole association
+                    data = records[position] if len(records) == len(chunk) else (records[0] if records else {})
+                    if self._is_missing_candidate(data, pairs[i][0]):
+                        # Same signal as attach_candidate_to_job's CandidateNotFoundError
+                        results[i] = batch_error(f"Zoho Association Error: candidate {pairs[i][0]} not found", 404)
+                    elif data.get("status") == "error":
+                        results[i] = batch_error(f"Zoho Association Error: {data.get('message')}", 400)
+                    else:
+                        results[i] = batch_success(f"{pairs[i][0]}_{job_id}")
+        return results
+
     def get_applications(self, job_id):
         """Fetch all applications for a job using pagination."""
-        return paginate_all(self._fetch_applications_page, job_id=job_id)
+        return self._conditional_list(
+            f"applications:{job_id}", f"{self.base_url}/Applications/search",
+            {"criteria": f"($Job_Opening_Id:equals:{criteria_value(job_id)})"},
+            lambda: paginate_all(self._fetch_applications_page, concurrency=self.page_concurrency, job_id=job_id)
+        )
+
+    def iter_applications(self, job_id):
+        """Lazily yield applications for a job, page by page."""
+        if self.conditional_get:
+            return self.get_applications(job_id)
+        return iter_items(self._fetch_applications_page, concurrency=self.page_concurrency, job_id=job_id)
+
+    def fetch_applications_page(self, job_id, page=1):
+        return self._fetch_applications_page(page, job_id=job_id)
 
     def _fetch_applications_page(self, page=1, job_id=None):
-        """Fetch a single page of applications for a job."""
+        """Fetch a single page of applications for a job. Returns (applications, more_records)."""
         url = f"{self.base_url}/Applications/search"
         params = {
-            "criteria": f"($Job_Opening_Id:equals:{job_id})",
-            "page": page
+            "criteria": f"($Job_Opening_Id:equals:{criteria_value(job_id)})",
+            "page": page,
+            "per_page": self.per_page
         }
         
         try:
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._request("get", url, params=params)
             
             if response.status_code == 204:
-                return []
+                return [], False
                 
             response.raise_for_status()
             data = response.json()
             raw_apps = data.get("data", [])
             
-            return [self.normalize_application(a) for a in raw_apps]
+            with span("normalize", resource="applications", records=len(raw_apps)):
+                applications = self.normalize_applications(raw_apps)
+            return applications, self._more_records(data)
+        except requests.exceptions.RequestException as e:
+            raise ATSError(f"Zoho API Error: Failed to fetch applications for job {job_id} page {page}: {str(e)}", 502)
+        except json.JSONDecodeError:
+            raise ATSError("Zoho API Error: Received invalid JSON response", 500)
+
+    def get_applications_for_jobs(self, job_ids):
+        """
+        Fetch applications for several jobs with as few searches as possible.
+
+        Job ids are OR'ed into a single `Applications/search` criteria while the
+        condition count and criteria length allow; the resulting groups are fetched
+        concurrently and split back per job.
+        """
+        groups = self._group_job_criteria(job_ids)
+        results = {}
+
+        def fetch_group(group):
+            criteria, group_ids = group
+            by_job = {job_id: [] for job_id in group_ids}
+            for raw in iter_items(self._fetch_raw_page, concurrency=self.page_concurrency,
+                                  path="Applications/search", params={"criteria": criteria}):
+                job_id = application_job_id(raw)
+                if job_id in by_job:
+                    by_job[job_id].append(self.normalize_application(raw))
+            return by_job
+
+        for group, outcome, error in fan_out(fetch_group, groups):
+            for job_id in group[1]:
+                if error is None:
+                    results[job_id] = job_result(outcome[job_id])
+                else:
+                    results[job_id] = job_result(error=error)
+        return results
+
+    def _group_job_criteria(self, job_ids):
+        """Split job ids into (criteria, job_ids) groups within Zoho's criteria limits."""
+        groups, current = [], []
+
+        def build(ids):
+            conditions = "or".join(f"($Job_Opening_Id:equals:{criteria_value(job_id)})" for job_id in ids)
+            return f"({conditions})" if len(ids) > 1 else conditions
+
+        for job_id in job_ids:
+            candidate = current + [job_id]
+            if current and (len(candidate) > self.search_criteria_max or len(build(candidate)) > self.criteria_max_length):
+                groups.append((build(current), current))
+                candidate = [job_id]
+            current = candidate
+        if current:
+            groups.append((build(current), current))
+        return groups
+
+    @staticmethod
+    def _more_records(data):
+        """Read Zoho's `info.more_records` flag from a list response."""
+        return bool((data.get("info") or {}).get("more_records", False))
+
+    def sync_replica(self, store):
+        """
+        Bring a local ReplicaStore up to date with Zoho.
+
+        Only records modified since each resource's watermark are fetched (oldest
+        first, so an interrupted sync resumes where it stopped), followed by the
+        module's deleted-records log since the last completed sync. The first sync
+        is a full copy. A resource only counts as synced once both are applied.
+
+        :return: Dict of upserted/deleted counts per resource, and whether its sync completed.
+        """
+        summary = {}
+        for resource, module in self.REPLICA_MODULES.items():
+            since, synced = store.get_watermark(resource), store.get_watermark(resource, completed=True)
+            headers = {"If-Modified-Since": since} if since else None
+            upsert = store.upsert_jobs if resource == "jobs" else store.upsert_applications
+
+            upserted, watermark = 0, since
+            pages = iter_pages(
+                self._fetch_raw_page, concurrency=self.page_concurrency, path=module,
+                params={"sort_by": "Modified_Time", "sort_order": "asc"}, headers=headers
+            )
+            for records in pages:
+                upserted += upsert(records)
+                watermark = _latest_modified_time(watermark, records)
+                # Persist progress page by page so a timeout doesn't restart the sync
+                store.set_progress(resource, watermark)
+
+            complete = not (pages.partial or pages.truncated)
+            deleted = 0
+            if complete and synced:
+                deleted_log = iter_items(
+                    self._fetch_raw_page, path=f"{module}/deleted", params={"type": "all"},
+                    headers={"If-Modified-Since": synced}
+                )
+                deleted = store.delete(resource, [r["id"] for r in deleted_log if r.get("id")])
+                complete = not (deleted_log.partial or deleted_log.truncated)
+
+            if complete:
+                store.mark_synced(resource, watermark)
+            summary[resource] = {"upserted": upserted, "deleted": deleted, "watermark": watermark, "complete": complete}
+            if not complete:
+                # Out of time or pages; the next sync resumes from the stored progress
+                break
+        return summary
+
+    def _fetch_raw_page(self, page=1, path="JobOpenings", params=None, headers=None):
+        """Fetch a single page of raw records from a module path. Returns (records, more_records)."""
+        url = f"{self.base_url}/{path}"
+        params = {**(params or {}), "page": page, "per_page": self.per_page}
+
+        try:
+            response = self._request("get", url, params=params, headers=headers)
+
+            # 304: nothing modified since the watermark
+            if response.status_code in (204, 304) or not response.text:
+                return [], False
+
+            response.raise_for_status()
+            data = response.json()
+            return data.get("data", []), self._more_records(data)
         except requests.exceptions.RequestException as e:
-            print(f"Warning: Failed to fetch applications for job {job_id} page {page}: {str(e)}")
-            return []
+            raise ATSError(f"Zoho API Error: {str(e)}", _throttle_status(e))
+        except json.JSONDecodeError:
+            raise ATSError("Zoho API Error: Received invalid JSON response", 500)
 
     def normalize_job(self, raw_job):
-        return {
-            "id": str(raw_job.get("id")),
-            "title": raw_job.get("Posting_Title"),
-            "location": raw_job.get("City", "N/A"),
-            "status": "OPEN" if raw_job.get("Status") == "In-progress" else "CLOSED",
-            "external_url": f"https://recruit.zoho.com/recruit/ViewJob.na?digest={raw_job.get('id')}"
-        }
+        return self.normalize_jobs((raw_job,))[0]
+
+    def normalize_jobs(self, raw_jobs):
+        jobs = []
+        append = jobs.append
+        for raw in raw_jobs:
+            get = raw.get
+            job_id = str(get("id"))
+            append(Job(
+                job_id, get("Posting_Title"), get("City", "N/A"),
+                "OPEN" if get("Status") == OPEN_JOB_STATUS else "CLOSED", JOB_URL_PREFIX + job_id
+            ))
+        return jobs
 
     def normalize_application(self, raw_app):
-        # The Applications module has candidate info directly or in fields like Full_Name, Email
-        candidate_name = raw_app.get("Full_Name") or "Unknown"
-        # If Full_Name is missing, try First/Last
-        if candidate_name == "Unknown":
-            first = raw_app.get("First_Name", "")
-            last = raw_app.get("Last_Name", "")
-            candidate_name = f"{first} {last}".strip() or "Unknown"
+        return self.normalize_applications((raw_app,))[0]
 
-        return {
-            "id": str(raw_app.get("id")),
-            "candidate_name": candidate_name,
-            "email": raw_app.get("Email", "N/A"),
-            "status": raw_app.get("Application_Status", "APPLIED")
-        }
+    def normalize_applications(self, raw_apps):
+        applications = []
+        append = applications.append
+        for raw in raw_apps:
+            get = raw.get
+            # The Applications module has candidate info directly or in fields like Full_Name, Email
+            candidate_name = get("Full_Name") or "Unknown"
+            # If Full_Name is missing, try First/Last
+            if candidate_name == "Unknown":
+                candidate_name = f"{get('First_Name', '')} {get('Last_Name', '')}".strip() or "Unknown"
+            append(Application(
+                str(get("id")), candidate_name, get("Email", "N/A"), get("Application_Status", "APPLIED")
+            ))
+        return applications
+
+def upstream_path(url, base_url):
+    """Module path of a Zoho API URL, for span labels (e.g. "/JobOpenings")."""
+    return url[len(base_url):] if url.startswith(base_url) else url
+
+def upstream_fields(sources, fields=None):
+    """Comma-separated Zoho field names needed to build the given normalized fields (all by default)."""
+    names = []
+    for field in fields or sources:
+        names.extend(sources.get(field, ()))
+    if not names:
+        # Fields like id come with every record, but Zoho needs at least one name
+        return upstream_fields(sources)
+    return ",".join(dict.fromkeys(names))
+
+def _throttle_status(error):
+    """429/503 when Zoho throttled or was unavailable (the caller may retry later), else 500."""
+    response = getattr(error, "response", None)
+    status = response.status_code if response is not None else None
+    return status if status in (429, 503) else 500
+
+def query_fields(sources, query):
+    """
+    Zoho field names for a ListQuery: its projection plus whatever its filters are
+    evaluated on locally (Modified_Time for updated_since).
+    """
+    wanted = None
+    if query.fields:
+        wanted = list(query.fields) + [name for name in ("status", "location") if getattr(query, name)]
+    names = upstream_fields(sources, wanted)
+    return f"{names},Modified_Time" if query.updated_since else names
+
+def criteria_value(value):
+    """Escape a value for Zoho search criteria, where parentheses and commas are syntax."""
+    value = str(value).replace("\\", "\\\\")
+    for char in "(),":
+        value = value.replace(char, "\\" + char)
+    return value
+
+def and_criteria(conditions):
+    """Combine parenthesized criteria conditions with AND."""
+    return conditions[0] if len(conditions) == 1 else "(" + "and".join(conditions) + ")"
+
+def _latest_modified_time(current, records):
+    """Return the newest Modified_Time among `current` and the records (ISO 8601 strings)."""
+    latest, latest_dt = current, _parse_time(current)
+    for record in records:
+        value = record.get("Modified_Time")
+        value_dt = _parse_time(value)
+        if value_dt is not None and (latest_dt is None or value_dt > latest_dt):
+            latest, latest_dt = value, value_dt
+    return latest
+
+def _parse_time(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
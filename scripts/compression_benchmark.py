@@ -0,0 +1,60 @@
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.response import _brotli, encode_json_array
+
+STATUSES = ["Applied", "Screening", "Interview", "Offer", "Rejected", "Hired"]
+
+def sample_applications(count):
+    """Normalized application records shaped like GET /applications output."""
+    return [
+        {
+            "id": f"5{i:017d}",
+            "candidate_name": f"Candidate {i} Example",
+            "email": f"candidate{i}@example.com",
+            "status": STATUSES[i % len(STATUSES)],
+        }
+        for i in range(count)
+    ]
+
+def time_call(func, repeat):
+    """Median wall time of `func()` in milliseconds, plus its last result."""
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+def run(sizes, gzip_levels, brotli_qualities, repeat):
+    brotli = _brotli()
+    print(f"{'records':>8} {'raw KB':>8} {'encoding':>10} {'KB':>8} {'ratio':>6} {'ms':>8}")
+    for count in sizes:
+        body = encode_json_array(sample_applications(count)).encode("utf-8")
+        raw_kb = len(body) / 1024
+        codecs = [(f"gzip-{level}", lambda level=level: gzip.compress(body, compresslevel=level, mtime=0))
+                  for level in gzip_levels]
+        if brotli is not None:
+            codecs += [(f"br-{quality}", lambda quality=quality: brotli.compress(body, quality=quality))
+                       for quality in brotli_qualities]
+        for name, compress in codecs:
+            elapsed_ms, compressed = time_call(compress, repeat)
+            print(f"{count:>8} {raw_kb:>8.1f} {name:>10} {len(compressed) / 1024:>8.1f} "
+                  f"{len(body) / len(compressed):>6.1f} {elapsed_ms:>8.2f}")
+    if brotli is None:
+        print("brotli is not installed; only gzip was measured (pip install brotli).")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure response compression cost on realistic payloads.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000], help="records per payload")
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 5, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[1, 4, 6, 11])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.gzip_levels, args.brotli_qualities, args.repeat)
@@ -0,0 +1,207 @@
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+API_PREFIX = "/recruit/v2"
+TOKEN_PATH = "/oauth/v2/token"
+JOB_CRITERIA = re.compile(r"\$Job_Opening_Id:equals:([^)]+)")
+EMAIL_CRITERIA = re.compile(r"Email:equals:([^)]+)")
+APPLICATION_STATUSES = ["Associated", "Screening", "Interview", "Offer", "Rejected", "Hired"]
+
+class FakeZohoConfig:
+    """Shape and misbehaviour of the fake Zoho Recruit account."""
+
+    def __init__(self, jobs=1000, applications_per_job=20, latency_ms=0.0, jitter_ms=0.0,
+                 rate_429=0.0, rate_5xx=0.0, payload_bytes=0, seed=None):
+        """
+        :param jobs: JobOpenings records in the account (pages follow from per_page).
+        :param applications_per_job: Applications returned per job.
+        :param latency_ms: Delay added to every response.
+        :param jitter_ms: Uniform random extra delay on top of latency_ms.
+        :param rate_429: Fraction of API requests answered 429 (with Retry-After: 0).
+        :param rate_5xx: Fraction of API requests answered 503.
+        :param payload_bytes: Size of a filler field added to each record.
+        """
+        self.jobs = jobs
+        self.applications_per_job = applications_per_job
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.payload_bytes = payload_bytes
+        self.random = random.Random(seed)
+
+class FakeZohoServer(ThreadingHTTPServer):
+    """
+    Local stand-in for Zoho Recruit's token, JobOpenings, Applications search,
+    Candidates (create/search) and associate endpoints.
+
+    Point ZOHO_BASE_URL at `base_url` and ZOHO_TOKEN_URL at `token_url`.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        super().__init__((host, port), FakeZohoHandler)
+        self.config = config or FakeZohoConfig()
+        self.filler = "x" * self.config.payload_bytes
+        self.candidate_ids = itertools.count(1)
+        self.stats = {"requests": 0, "throttled": 0, "failed": 0}
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}{API_PREFIX}"
+
+    @property
+    def token_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}{TOKEN_PATH}"
+
+    def start(self):
+        """Serve on a daemon thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def job(self, index):
+        record = {
+            "id": f"j{index}",
+            "Posting_Title": f"Engineer {index}",
+            "City": ["Berlin", "Remote", "New York", "Pune"][index % 4],
+            "Status": "In-progress" if index % 5 else "Filled",
+            "Modified_Time": "2024-01-31T10:00:00+00:00",
+        }
+        if self.filler:
+            record["Job_Description"] = self.filler
+        return record
+
+    def application(self, job_id, index):
+        record = {
+            "id": f"{job_id}-a{index}",
+            "Full_Name": f"Candidate {index}",
+            "Email": f"candidate{index}.{job_id}@example.com",
+            "Application_Status": APPLICATION_STATUSES[index % len(APPLICATION_STATUSES)],
+            "$Job_Opening_Id": job_id,
+            "Modified_Time": "2024-01-31T10:00:00+00:00",
+        }
+        if self.filler:
+            record["Notes"] = self.filler
+        return record
+
+class FakeZohoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Zoho
+    # Send headers and body in one segment so delayed ACKs don't add latency
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def _dispatch(self, method):
+        server, config = self.server, self.server.config
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        delay = config.latency_ms + (config.random.uniform(0, config.jitter_ms) if config.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if url.path == TOKEN_PATH:
+            return self._send(200, {"access_token": "fake-access-token", "expires_in": 3600})
+
+        with server.lock:
+            server.stats["requests"] += 1
+            roll = config.random.random()
+            if roll < config.rate_429:
+                server.stats["throttled"] += 1
+                return self._send(429, {"code": "TOO_MANY_REQUESTS"}, {"Retry-After": "0"})
+            if roll < config.rate_429 + config.rate_5xx:
+                server.stats["failed"] += 1
+                return self._send(503, {"code": "INTERNAL_ERROR"})
+
+        route = (method, url.path[len(API_PREFIX):])
+        if route in (("GET", "/JobOpenings"), ("GET", "/JobOpenings/search")):
+            return self._send_page(range(config.jobs), server.job, query)
+        if route == ("GET", "/Applications/search"):
+            job_ids = JOB_CRITERIA.findall(query.get("criteria", ""))
+            indexes = [(job_id, i) for job_id in job_ids for i in range(config.applications_per_job)]
+            return self._send_page(indexes, lambda pair: server.application(*pair), query)
+        if route == ("GET", "/Candidates/search"):
+            emails = EMAIL_CRITERIA.findall(query.get("criteria", ""))
+            return self._send(200, {"data": [{"id": f"c-{email}", "Email": email} for email in emails]})
+        if route == ("POST", "/Candidates"):
+            data = [
+                {"code": "SUCCESS", "status": "success", "details": {"id": f"c{next(server.candidate_ids)}"}}
+                for _ in body.get("data", [])
+            ]
+            return self._send(201, {"data": data})
+        if route == ("PUT", "/Candidates/actions/associate"):
+            data = [{"code": "SUCCESS", "status": "success", "details": {}} for _ in body.get("data", [])]
+            return self._send(200, {"data": data})
+        self._send(404, {"code": "INVALID_URL_PATTERN"})
+
+    def _send_page(self, indexes, build, query):
+        page, per_page = int(query.get("page", 1)), int(query.get("per_page", 200))
+        start = (page - 1) * per_page
+        window = indexes[start:start + per_page]
+        if not window:
+            return self._send(204, None)
+        records = [build(index) for index in window]
+        info = {"page": page, "per_page": per_page, "count": len(records), "more_records": start + per_page < len(indexes)}
+        self._send(200, {"data": records, "info": info})
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def config_from_args(args):
+    return FakeZohoConfig(
+        jobs=args.jobs, applications_per_job=args.applications_per_job,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+        payload_bytes=args.payload_bytes, seed=args.seed
+    )
+
+def add_arguments(parser):
+    parser.add_argument("--jobs", type=int, default=1000, help="JobOpenings records (pages = jobs / ZOHO_PER_PAGE)")
+    parser.add_argument("--applications-per-job", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay up to this much")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of API calls answered 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="fraction of API calls answered 503")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="filler bytes added to each record")
+    parser.add_argument("--seed", type=int, default=None)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local fake Zoho Recruit API.")
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = FakeZohoServer(config_from_args(args), port=args.port)
+    print(f"ZOHO_BASE_URL={server.base_url}")
+    print(f"ZOHO_TOKEN_URL={server.token_url}")
+    server.serve_forever()
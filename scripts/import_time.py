@@ -0,0 +1,56 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = [
+    "handler",
+    "services.jobs_service",
+    "providers.greenhouse",
+    "providers.workable",
+    "providers.zoho",
+    "providers.async_zoho",
+]
+
+def measure(module):
+    """
+    Import `module` in a fresh interpreter with `-X importtime`.
+    :return: Dict of imported module name -> (self_us, cumulative_us), in import order.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+def cold_import_us(module, repeat=3):
+    """Best-of-`repeat` cumulative import time of `module` in microseconds."""
+    return min(measure(module)[module][1] for _ in range(repeat))
+
+def report(module, top=10, repeat=3):
+    timings = min((measure(module) for _ in range(repeat)), key=lambda t: t[module][1])
+    print(f"{module}: {timings[module][1] / 1000:.1f} ms cumulative, {len(timings)} modules")
+    slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {self_us / 1000:8.1f} ms self  {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report cold-start import times (python -X importtime).")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list per import")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per module; the fastest is reported")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        report(module, top=args.top, repeat=args.repeat)
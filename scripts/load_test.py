@@ -0,0 +1,166 @@
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scripts.fake_zoho import add_arguments
+
+SCENARIOS = ("get_jobs", "create_candidate", "get_applications")
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "rps", "errors")
+
+def start_fake_zoho(args):
+    """Run the fake Zoho server in its own process so its memory stays out of peak RSS."""
+    command = [
+        sys.executable, os.path.join(ROOT, "scripts", "fake_zoho.py"), "--port", "0",
+        "--jobs", str(args.jobs), "--applications-per-job", str(args.applications_per_job),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--rate-429", str(args.rate_429), "--rate-5xx", str(args.rate_5xx),
+        "--payload-bytes", str(args.payload_bytes),
+    ]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    urls = dict(process.stdout.readline().strip().split("=", 1) for _ in range(2))
+    return process, urls
+
+def configure_environment(urls, args):
+    """Point the service at the fake server before any of its modules are imported."""
+    os.environ.update({
+        "ATS_PROVIDER": "zoho",
+        "ZOHO_CLIENT_ID": "load-test",
+        "ZOHO_CLIENT_SECRET": "load-test",
+        "ZOHO_REFRESH_TOKEN": "load-test",
+        "ZOHO_TOKEN_CACHE_DIR": "",
+        "ZOHO_CONDITIONAL_GET": "false",
+        "CACHE_BACKEND": args.cache_backend,
+        "CANDIDATE_INDEX_BACKEND": "none",
+        "REPLICA_READS": "false",
+        "UPSTREAM_RATE_PER_MINUTE": str(args.upstream_rate_per_minute),
+        "UPSTREAM_BURST": str(args.upstream_rate_per_minute),
+        "UPSTREAM_BACKOFF_BASE": "0.01",
+        **urls,
+    })
+
+def build_events(scenario, count, jobs):
+    if scenario == "get_jobs":
+        return [{"queryStringParameters": None, "headers": {}} for _ in range(count)]
+    if scenario == "get_applications":
+        return [{"queryStringParameters": {"job_id": f"j{i % max(jobs, 1)}"}, "headers": {}} for i in range(count)]
+    run_id = int(time.time())
+    return [
+        {"body": json.dumps({"name": f"Load Test {i}", "email": f"load{run_id}.{i}@example.com",
+                             "job_id": f"j{i % max(jobs, 1)}"}), "headers": {}}
+        for i in range(count)
+    ]
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(round(fraction * len(sorted_values), 9)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def run_scenario(function, events, concurrency):
+    """Invoke `function(event, None)` for every event on `concurrency` threads."""
+    def invoke(event):
+        start = time.perf_counter()
+        response = function(event, None)
+        return (time.perf_counter() - start) * 1000, response["statusCode"]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(invoke, events))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in outcomes)
+    statuses = {}
+    for _, status in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(outcomes),
+        "errors": sum(count for status, count in statuses.items() if int(status) >= 400),
+        "statuses": statuses,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "rps": round(len(outcomes) / elapsed, 1),
+    }
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run(args):
+    process, urls = start_fake_zoho(args)
+    try:
+        configure_environment(urls, args)
+        import handler
+        results = {}
+        for scenario in args.scenarios:
+            events = build_events(scenario, args.requests, args.jobs)
+            function = getattr(handler, scenario)
+            function(events[0], None)  # warm up: token, connection pool, lazy imports
+            results[scenario] = run_scenario(function, events, args.concurrency)
+            results[scenario]["peak_rss_mb"] = peak_rss_mb()
+    finally:
+        process.terminate()
+        process.wait()
+    return {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "results_dir", "scenarios")},
+        "results": results,
+    }
+
+def save(report, results_dir):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{report['timestamp'].replace(':', '')}-{report['label']}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def print_report(report, baseline=None):
+    print(f"{'scenario':>18} {'req':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>8} {'RSS MB':>8}")
+    for scenario, r in report["results"].items():
+        print(f"{scenario:>18} {r['requests']:>6} {r['errors']:>5} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+              f"{r['p99_ms']:>9.2f} {r['rps']:>8.1f} {r['peak_rss_mb']:>8.1f}")
+        previous = (baseline or {}).get("results", {}).get(scenario)
+        if previous:
+            deltas = []
+            for metric in COMPARED_METRICS:
+                before, after = previous.get(metric), r.get(metric)
+                if before:
+                    deltas.append(f"{metric} {(after - before) / before * 100:+.1f}%")
+            print(f"{'vs ' + baseline['label']:>18} " + ", ".join(deltas))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the Lambda handlers against a local fake Zoho.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="handler invocations per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent handler invocations")
+    parser.add_argument("--cache-backend", default="none", help="CACHE_BACKEND for the run (none measures upstream paths)")
+    parser.add_argument("--upstream-rate-per-minute", type=int, default=1000000)
+    parser.add_argument("--label", default="run", help="name stored with the results")
+    parser.add_argument("--results-dir", default=os.path.join(ROOT, "load_test_results"))
+    parser.add_argument("--compare", help="earlier results file to print deltas against")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    report = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"Saved {save(report, args.results_dir)}")
@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from providers.zoho import ZohoProvider
+from utils.response import encode_json_array
+
+STATUSES = ["Associated", "Screening", "Interview", "Offer", "Rejected", "Hired"]
+
+def sample_raw_jobs(count):
+    """Raw Zoho JobOpenings records."""
+    return [
+        {"id": f"4{i:017d}", "Posting_Title": f"Engineer {i}", "City": "Berlin",
+         "Status": "In-progress" if i % 3 else "Filled", "Modified_Time": "2024-01-31T10:00:00+00:00"}
+        for i in range(count)
+    ]
+
+def sample_raw_applications(count):
+    """Raw Zoho Applications records."""
+    return [
+        {"id": f"5{i:017d}", "Full_Name": f"Candidate {i} Example", "Email": f"candidate{i}@example.com",
+         "Application_Status": STATUSES[i % len(STATUSES)]}
+        for i in range(count)
+    ]
+
+def dict_jobs(raw_jobs):
+    """The per-record dict normalization the record types replaced."""
+    return [
+        {
+            "id": str(raw_job.get("id")),
+            "title": raw_job.get("Posting_Title"),
+            "location": raw_job.get("City", "N/A"),
+            "status": "OPEN" if raw_job.get("Status") == "In-progress" else "CLOSED",
+            "external_url": f"https://recruit.zoho.com/recruit/ViewJob.na?digest={raw_job.get('id')}"
+        }
+        for raw_job in raw_jobs
+    ]
+
+def dict_applications(raw_apps):
+    applications = []
+    for raw_app in raw_apps:
+        candidate_name = raw_app.get("Full_Name") or "Unknown"
+        if candidate_name == "Unknown":
+            candidate_name = f"{raw_app.get('First_Name', '')} {raw_app.get('Last_Name', '')}".strip() or "Unknown"
+        applications.append({
+            "id": str(raw_app.get("id")),
+            "candidate_name": candidate_name,
+            "email": raw_app.get("Email", "N/A"),
+            "status": raw_app.get("Application_Status", "APPLIED")
+        })
+    return applications
+
+def time_call(func, repeat):
+    """Median wall time of `func()` in milliseconds, plus its last result."""
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+def retained_kb(func):
+    """KiB still allocated by the value `func()` returns."""
+    tracemalloc.start()
+    result = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size / 1024
+
+def run(count, repeat):
+    provider = ZohoProvider.__new__(ZohoProvider)  # normalization needs no credentials
+    cases = [
+        ("jobs", sample_raw_jobs(count), dict_jobs, provider.normalize_jobs),
+        ("applications", sample_raw_applications(count), dict_applications, provider.normalize_applications),
+    ]
+    print(f"{'resource':>12} {'path':>7} {'normalize ms':>13} {'encode ms':>10} {'KiB held':>10}")
+    for resource, raw, dict_path, record_path in cases:
+        bodies = []
+        for name, normalize in (("dict", dict_path), ("record", record_path)):
+            normalize_ms, records = time_call(lambda: normalize(raw), repeat)
+            encode_ms, body = time_call(lambda: encode_json_array(records), repeat)
+            held_kb = retained_kb(lambda: normalize(raw))
+            bodies.append(body)
+            print(f"{resource:>12} {name:>7} {normalize_ms:>13.1f} {encode_ms:>10.1f} {held_kb:>10.0f}")
+        if json.loads(bodies[0]) != json.loads(bodies[1]) or bodies[0] != bodies[1]:
+            print(f"{resource}: record output differs from the dict path!")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare dict and slotted-record normalization on synthetic Zoho pages.")
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.records, args.repeat)
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from .jobs_service import JobsService
+from config.settings import settings
+from providers.registry import provider_names
+from utils.deadline import Deadline, current_deadline, deadline_scope, within_deadline, mark_partial
+from utils.errors import ATSError, ValidationError, ProviderNotFoundError
+from utils.telemetry import span, submit
+
+class AggregateJobsService:
+    """
+    Jobs from several ATS providers at once (GET /jobs?providers=a,b), for clients
+    that hire through more than one. Providers are queried concurrently, each
+    within its own time budget, so the response takes as long as the slowest
+    budget allows rather than the sum of all providers.
+    """
+
+    def list_jobs(self, names, query=None):
+        """
+        :param names: Provider names, e.g. ["greenhouse", "zoho"].
+        :param query: Optional utils.query.ListQuery applied by every provider.
+        :return: {"jobs": [...], "providers": {name: {...}}, "degraded": bool}; job ids
+                 are prefixed with their provider ("zoho:123"). A provider that runs out
+                 of budget or fails contributes what it had so far and marks the result degraded;
+                 budgets end by the request deadline, which also marks the result "partial".
+        """
+        names = self._validate(names)
+        sinks = {name: [] for name in names}
+        stops = {name: threading.Event() for name in names}
+
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="aggregate")
+        futures = {
+            name: submit(
+                executor, self._collect, name, query, sinks[name], stops[name], within_deadline(provider_budget(name))
+            ) for name in names
+        }
+        reports = {}
+        try:
+            for name, future in futures.items():
+                budget_left = started + provider_budget(name) - time.monotonic()
+                remaining = within_deadline(budget_left)
+                report = {"status": "ok"}
+                finished_at = None
+                try:
+                    finished_at = future.result(timeout=max(remaining, 0))
+                    if finished_at is None:
+                        # The provider's own deadline stopped its paging
+                        report = self._cut_short(name, remaining < budget_left)
+                except FutureTimeoutError:
+                    # Stop at the next record; whatever arrived so far is still returned
+                    stops[name].set()
+                    report = self._cut_short(name, remaining < budget_left)
+                except ATSError as e:
+                    report = {"status": "error", "error": {"message": e.message, "status_code": e.status_code}}
+                except Exception as e:
+                    print(f"Warning: {name} jobs failed in aggregated search: {str(e)}")
+                    report = {"status": "error", "error": {"message": "Internal Server Error", "status_code": 500}}
+                report["count"] = len(sinks[name])
+                report["elapsed_ms"] = round(((finished_at or time.monotonic()) - started) * 1000, 1)
+                reports[name] = report
+        finally:
+            # Providers still running must not hold up the response
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        jobs = [job for name in names for job in list(sinks[name])[:reports[name]["count"]]]
+        result = {
+            "jobs": jobs,
+            "providers": reports,
+            "degraded": any(report["status"] != "ok" for report in reports.values()),
+        }
+        deadline = current_deadline()
+        if deadline is not None and deadline.partial:
+            result["partial"] = True
+        return result
+
+    @staticmethod
+    def _collect(name, query, sink, stop, budget):
+        """
+        Append `name`'s jobs (ids prefixed) to `sink` as they arrive, until done or `stop`
+        is set. The provider runs under a deadline `budget` seconds away, so a thread
+        that is no longer waited for stops paging instead of running on in the background.
+        :return: time.monotonic() when the provider finished, or None when it was cut short.
+        """
+        deadline = Deadline(budget)
+        with settings.override({"ATS_PROVIDER": name}), deadline_scope(deadline), \
+                span("aggregate.provider", provider=name) as timing:
+            for job in JobsService().stream_jobs(query=query):
+                if stop.is_set():
+                    timing.set(stopped=True)
+                    return None
+                sink.append(prefixed_job(name, job))
+            timing.set(records=len(sink), stopped=deadline.partial)
+        return None if deadline.partial else time.monotonic()
+
+    @staticmethod
+    def _cut_short(name, by_request_deadline):
+        if by_request_deadline:
+            mark_partial("aggregate", provider=name)
+            return {"status": "degraded", "reason": "request deadline reached"}
+        return {"status": "degraded", "reason": "time budget exceeded"}
+
+    @staticmethod
+    def _validate(names):
+        names = list(dict.fromkeys(n.strip().lower() for n in names if n and n.strip()))
+        if not names:
+            raise ValidationError("providers must name at least one ATS provider.")
+        known = provider_names()
+        for name in names:
+            if name not in known:
+                raise ProviderNotFoundError(name)
+        return names
+
+def prefixed_job(provider_name, job):
+    """A normalized job as a dict whose id carries its provider, e.g. "greenhouse:gh-1"."""
+    job = dict(job)
+    if job.get("id") is not None:
+        job["id"] = f"{provider_name}:{job['id']}"
+    return job
+
+def provider_budget(name):
+    """Seconds `name` may take: its AGGREGATE_PROVIDER_BUDGETS entry, else AGGREGATE_PROVIDER_BUDGET."""
+    for entry in settings.AGGREGATE_PROVIDER_BUDGETS.split(","):
+        provider, _, seconds = entry.partition("=")
+        if provider.strip().lower() == name and seconds.strip():
+            return float(seconds)
+    return settings.AGGREGATE_PROVIDER_BUDGET
@@ -1,5 +1,12 @@
 from .jobs_service import get_provider
+from config.settings import settings
+from utils.cache import get_cache, cached_list, applications_cache_key
+from providers.base_provider import job_result
 from utils.errors import ValidationError
+from utils.cursor import resolve_window, window_result
+from utils.pagination import PaginatedList, fetch_window, slice_window
+from utils.replica import replica_for
+from utils.single_flight import coalesce, flight_key
 
 class ApplicationService:
     def __init__(self):
@@ -7,7 +14,126 @@ class ApplicationService:
 
     def list_applications(self, job_id):
         """Fetch normalized applications for a job."""
+        self._validate_job_id(job_id)
+        store = replica_for(self.provider)
+        if store is not None:
+            return PaginatedList(self._iter_replica_applications(store, job_id))
+        cache = get_cache()
+        if cache is None:
+            return self._fetch_applications(job_id)
+        key = applications_cache_key(settings.ATS_PROVIDER, job_id)
+        return cached_list(cache, key, lambda: self._fetch_applications(job_id), settings.CACHE_APPLICATIONS_TTL)
+
+    def iter_applications(self, job_id, query=None):
+        """
+        Lazily yield normalized applications; streams straight from the ATS when caching is disabled.
+        :param query: Optional utils.query.ListQuery (filters and field projection).
+        """
+        self._validate_job_id(job_id)
+        if query:
+            return self._query_applications(job_id, query)
+        store = replica_for(self.provider)
+        if store is not None:
+            return self._iter_replica_applications(store, job_id)
+        if get_cache() is not None:
+            return self.list_applications(job_id)
+        return self.provider.iter_applications(job_id)
+
+    def list_applications_window(self, job_id, limit=None, cursor=None, query=None):
+        """
+        Return one window of a job's applications plus an opaque cursor for the next one.
+        :return: {"items": [...], "next_cursor": str or None}
+        """
+        self._validate_job_id(job_id)
+        scope = applications_cache_key(settings.ATS_PROVIDER, job_id)
+        if query:
+            scope = f"{scope}?{query.key()}"
+            position, limit = resolve_window(limit, cursor, scope)
+            return window_result(*slice_window(self._query_applications(job_id, query), position, limit), scope)
+        position, limit = resolve_window(limit, cursor, scope)
+
+        store = replica_for(self.provider)
+        if store is not None:
+            return window_result(*slice_window(self._iter_replica_applications(store, job_id), position, limit), scope)
+        cache = get_cache()
+        cached = cache.peek(scope, settings.CACHE_APPLICATIONS_TTL) if cache is not None else None
+        if cached is not None:
+            return window_result(*slice_window(cached["items"], position, limit), scope)
+        items, next_position = coalesce(
+            flight_key(self.provider, "applications", (job_id, "window", position, limit)),
+            lambda: fetch_window(
+                self.provider.fetch_applications_page, position, limit, page_size=self.provider.page_size, job_id=job_id
+            )
+        )
+        return window_result(items, next_position, scope)
+
+    def list_applications_for_jobs(self, job_ids):
+        """
+        Fetch normalized applications for several jobs in one call.
+        :return: Dict of job_id -> {"applications": [...], "error": None or {...}}, in request order.
+        """
+        job_ids = self._validate_job_ids(job_ids)
+
+        store = replica_for(self.provider)
+        if store is not None:
+            return {job_id: job_result(self._iter_replica_applications(store, job_id)) for job_id in job_ids}
+
+        cache = get_cache()
+        results = {}
+        if cache is not None:
+            for job_id in job_ids:
+                cached = cache.peek(applications_cache_key(settings.ATS_PROVIDER, job_id), settings.CACHE_APPLICATIONS_TTL)
+                if cached is not None:
+                    results[job_id] = job_result(cached["items"])
+
+        missing = [job_id for job_id in job_ids if job_id not in results]
+        if missing:
+            fetched = self.provider.get_applications_for_jobs(missing)
+            for job_id in missing:
+                results[job_id] = fetched.get(job_id) or job_result()
+                if cache is not None and results[job_id]["error"] is None:
+                    cache.store(
+                        applications_cache_key(settings.ATS_PROVIDER, job_id),
+                        {"items": results[job_id]["applications"], "truncated": False}
+                    )
+
+        return {job_id: results[job_id] for job_id in job_ids}
+
+    def _query_applications(self, job_id, query):
+        """Filtered applications from the replica, a fresh cached listing, or the provider's pushed-down query."""
+        store = replica_for(self.provider)
+        if store is not None:
+            return query.apply(
+                store.iter_applications(job_id),
+                normalize=self.provider.normalize_application, updated_at=self.provider.record_updated_at
+            )
+        cache = get_cache()
+        if cache is not None and not query.updated_since:
+            cached = cache.peek(applications_cache_key(settings.ATS_PROVIDER, job_id), settings.CACHE_APPLICATIONS_TTL)
+            if cached is not None:
+                return query.apply(cached["items"])
+        return self.provider.query_applications(job_id, query)
+
+    def _fetch_applications(self, job_id):
+        # Concurrent misses for the same job share one upstream fetch
+        return coalesce(flight_key(self.provider, "applications", job_id), lambda: self.provider.get_applications(job_id))
+
+    def _iter_replica_applications(self, store, job_id):
+        return (self.provider.normalize_application(raw) for raw in store.iter_applications(job_id))
+
+    @staticmethod
+    def _validate_job_id(job_id):
         if not job_id:
             raise ValidationError("job_id query parameter is required.")
-            
-        return self.provider.get_applications(job_id)
+
+    @staticmethod
+    def _validate_job_ids(job_ids):
+        if not isinstance(job_ids, list):
+            raise ValidationError("job_ids must be a list of job ids.")
+        # Drop blanks and duplicates while keeping request order
+        job_ids = list(dict.fromkeys(str(job_id).strip() for job_id in job_ids if str(job_id).strip()))
+        if not job_ids:
+            raise ValidationError("At least one job_id is required.")
+        if len(job_ids) > settings.APPLICATIONS_MAX_JOB_IDS:
+            raise ValidationError(f"At most {settings.APPLICATIONS_MAX_JOB_IDS} job ids may be requested at once.")
+        return job_ids
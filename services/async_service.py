@@ -0,0 +1,43 @@
+from .jobs_service import get_async_provider
+from .application_service import ApplicationService
+from .candidate_service import REQUIRED_FIELDS, invalidate_applications
+from utils.errors import ValidationError, CandidateNotFoundError
+from utils.single_flight import coalesce_async, flight_key
+
+class AsyncATSService:
+    """
+    Async entry point to the active provider for the *_async handlers.
+    Validation and cache invalidation match the sync services.
+    """
+
+    def __init__(self):
+        self.provider = get_async_provider()
+
+    async def list_jobs(self):
+        return await coalesce_async(flight_key(self.provider, "jobs"), self.provider.get_jobs)
+
+    async def list_applications(self, job_id):
+        ApplicationService._validate_job_id(job_id)
+        return await coalesce_async(
+            flight_key(self.provider, "applications", job_id), lambda: self.provider.get_applications(job_id)
+        )
+
+    async def list_applications_for_jobs(self, job_ids):
+        job_ids = ApplicationService._validate_job_ids(job_ids)
+        return await self.provider.get_applications_for_jobs(job_ids)
+
+    async def apply_to_job(self, data):
+        for field in REQUIRED_FIELDS:
+            if field not in data:
+                raise ValidationError(f"Missing required field: {field}")
+
+        candidate_id = await self.provider.create_candidate(data)
+        try:
+            application_id = await self.provider.attach_candidate_to_job(candidate_id, data["job_id"])
+        except CandidateNotFoundError:
+            # The remembered id was deleted upstream; forget it and create the candidate again
+            self.provider.forget_candidate(data["email"])
+            candidate_id = await self.provider.create_candidate(data)
+            application_id = await self.provider.attach_candidate_to_job(candidate_id, data["job_id"])
+        invalidate_applications([data["job_id"]])
+        return application_id
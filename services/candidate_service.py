@@ -1,5 +1,40 @@
 from .jobs_service import get_provider
-from utils.errors import ValidationError
+from config.settings import settings
+from utils.cache import get_cache, applications_cache_key
+from utils.errors import ATSError, ValidationError, ResourceNotFoundError, CandidateNotFoundError
+from utils.submission_queue import get_submission_queue, submission_queue_ready, QUEUED
+
+REQUIRED_FIELDS = ["name", "email", "job_id"]
+
+def invalidate_applications(job_ids):
+    """Drop cached application listings for jobs that just gained candidates."""
+    cache = get_cache()
+    if cache is None:
+        return
+    for job_id in job_ids:
+        cache.invalidate(applications_cache_key(settings.ATS_PROVIDER, job_id))
+
+def is_retryable(status_code):
+    """Whether a failed submission may succeed later (throttling or an ATS outage)."""
+    return status_code == 429 or (status_code or 0) >= 500
+
+def _email_key(candidate):
+    return candidate["email"].strip().lower()
+
+def _field_problems(candidate):
+    """Problems with a candidate's required fields: missing, or not a non-empty string."""
+    missing = [field for field in REQUIRED_FIELDS if not candidate.get(field)]
+    invalid = [
+        field for field in REQUIRED_FIELDS
+        if field not in missing and (not isinstance(candidate[field], str) or not candidate[field].strip())
+    ]
+    problems = [f"missing {', '.join(missing)}"] if missing else []
+    if invalid:
+        problems.append(f"{', '.join(invalid)} must be {'a non-empty string' if len(invalid) == 1 else 'non-empty strings'}")
+    return problems
+
+def _record_error(result, batch_result):
+    result.update(status="error", message=batch_result["message"], status_code=batch_result.get("status_code"))
 
 class CandidateService:
     def __init__(self):
@@ -11,15 +46,171 @@ class CandidateService:
         1. Create candidate
         2. Attach to job
         """
-        required_fields = ["name", "email", "job_id"]
-        for field in required_fields:
+        for field in REQUIRED_FIELDS:
             if field not in data:
                 raise ValidationError(f"Missing required field: {field}")
 
-        # 1. Create candidate in ATS
+        # 1. Create candidate in ATS (or reuse the id remembered for this email)
         candidate_id = self.provider.create_candidate(data)
         
         # 2. Attach candidate to job (creates application)
-        application_id = self.provider.attach_candidate_to_job(candidate_id, data["job_id"])
+        try:
+            application_id = self.provider.attach_candidate_to_job(candidate_id, data["job_id"])
+        except CandidateNotFoundError:
+            # The remembered id was deleted upstream; forget it and create the candidate again
+            self.provider.forget_candidate(data["email"])
+            candidate_id = self.provider.create_candidate(data)
+            application_id = self.provider.attach_candidate_to_job(candidate_id, data["job_id"])
+
+        # 3. The job's cached application list no longer reflects the ATS
+        invalidate_applications([data["job_id"]])
         
         return application_id
+
+    def apply_batch(self, data):
+        """
+        Create and attach many candidates with the provider's batch API.
+        1. Validate the whole payload before any upstream call
+        2. Create each distinct email once
+        3. Attach the created candidates to their jobs
+        :return: Per-record results in input order.
+        """
+        candidates = self._validate_batch(data)
+
+        results = [
+            {"index": index, "email": candidate["email"], "job_id": candidate["job_id"]}
+            for index, candidate in enumerate(candidates)
+        ]
+        attach = self._create_batch(candidates, results, range(len(candidates)))
+        stale = self._attach_batch(candidates, results, attach)
+        if stale:
+            # Remembered ids deleted upstream: forget them, create those candidates again
+            # and retry the association once, like apply_to_job
+            for index in {_email_key(candidates[i]): i for i in stale}.values():
+                self.provider.forget_candidate(candidates[index]["email"])
+            self._attach_batch(candidates, results, self._create_batch(candidates, results, stale))
+
+        invalidate_applications({candidates[i]["job_id"] for i in attach})
+        return results
+
+    def _create_batch(self, candidates, results, indexes):
+        """
+        Create each distinct email among `indexes` once (even if it applies to several
+        jobs) and record failures in `results`.
+        :return: Indexes whose candidate was created, to be attached.
+        """
+        unique_indexes = {}
+        for index in indexes:
+            unique_indexes.setdefault(_email_key(candidates[index]), index)
+        unique = list(unique_indexes.values())
+        created = self.provider.create_candidates([candidates[i] for i in unique])
+        created_by_email = {_email_key(candidates[i]): result for i, result in zip(unique, created)}
+
+        attach = []
+        for index in indexes:
+            created_result = created_by_email[_email_key(candidates[index])]
+            if created_result["status"] == "success":
+                results[index]["candidate_id"] = created_result["id"]
+                attach.append(index)
+            else:
+                _record_error(results[index], created_result)
+        return attach
+
+    def _attach_batch(self, candidates, results, indexes):
+        """
+        Attach the created candidates at `indexes` to their jobs and record the outcome.
+        :return: Indexes whose candidate id the ATS no longer knows (404).
+        """
+        pairs = [(results[i]["candidate_id"], candidates[i]["job_id"]) for i in indexes]
+        stale = []
+        for index, attached in zip(indexes, self.provider.attach_candidates(pairs) if pairs else []):
+            if attached["status"] == "success":
+                results[index].pop("message", None)
+                results[index].pop("status_code", None)
+                results[index].update(status="success", application_id=attached["id"])
+            else:
+                _record_error(results[index], attached)
+                if attached.get("status_code") == 404:
+                    stale.append(index)
+        return stale
+
+    def submit(self, data):
+        """
+        Validate a candidate and queue it for the submission worker (async mode).
+        :return: Tracking id for GET /candidates/status/{id}.
+        """
+        if not isinstance(data, dict):
+            raise ValidationError("Request body must be an object.")
+        problems = _field_problems(data)
+        if problems:
+            # Checked like apply_batch does, so one bad submission can't fail the worker's whole batch
+            raise ValidationError(f"Invalid candidate: {'; '.join(problems)}")
+        return get_submission_queue().enqueue(data)
+
+    def accepts_async(self, prefer=None):
+        """
+        Whether to queue a submission instead of applying it now: always in async mode,
+        and on a client's Prefer: respond-async only when the queue and worker are set
+        up (otherwise the request is served synchronously).
+        """
+        if settings.CANDIDATE_SUBMIT_MODE == "async":
+            return True
+        return "respond-async" in (prefer or "") and submission_queue_ready()
+
+    def submission_status(self, submission_id):
+        status = get_submission_queue().status(submission_id) if submission_id else None
+        if status is None:
+            raise ResourceNotFoundError(f"Submission {submission_id} not found.")
+        return status
+
+    def process_submissions(self, batch_size=None, max_batches=None):
+        """
+        Drain queued submissions through apply_batch, so each batch creates every
+        distinct email once and associates them in as few upstream calls as the
+        provider allows. Throttled or failed (5xx) submissions are queued again.
+        :return: Counts of what happened to the drained submissions.
+        """
+        queue = get_submission_queue()
+        batch_size = min(batch_size or settings.SUBMISSION_BATCH_SIZE, settings.BATCH_MAX_CANDIDATES)
+        summary = {"batches": 0, "succeeded": 0, "failed": 0, "requeued": 0}
+        for _ in range(max_batches or settings.SUBMISSION_MAX_BATCHES):
+            claimed = queue.claim(batch_size, settings.SUBMISSION_LEASE_SECONDS)
+            if not claimed:
+                break
+            summary["batches"] += 1
+            try:
+                results = self.apply_batch({"candidates": [payload for _, payload in claimed]})
+            except ATSError as e:
+                # Nothing in the batch reached the ATS (e.g. the circuit is open)
+                results = [{"status": "error", "message": e.message, "status_code": e.status_code}] * len(claimed)
+
+            for (submission_id, _), result in zip(claimed, results):
+                if result["status"] == "success":
+                    queue.complete(submission_id, {
+                        "candidate_id": result["candidate_id"], "application_id": result["application_id"]
+                    })
+                    summary["succeeded"] += 1
+                    continue
+                # Stale remembered candidate ids were already retried by apply_batch
+                retry = is_retryable(result.get("status_code"))
+                status = queue.fail(submission_id, result["message"], result.get("status_code"), retry=retry)
+                summary["requeued" if status == QUEUED else "failed"] += 1
+        return summary
+
+    def _validate_batch(self, data):
+        candidates = data.get("candidates") if isinstance(data, dict) else None
+        if not isinstance(candidates, list) or not candidates:
+            raise ValidationError("Request body must contain a non-empty 'candidates' list.")
+        if len(candidates) > settings.BATCH_MAX_CANDIDATES:
+            raise ValidationError(f"A batch may contain at most {settings.BATCH_MAX_CANDIDATES} candidates.")
+
+        problems = []
+        for index, candidate in enumerate(candidates):
+            if not isinstance(candidate, dict):
+                problems.append(f"candidates[{index}]: must be an object")
+                continue
+            problems.extend(f"candidates[{index}]: {problem}" for problem in _field_problems(candidate))
+        if problems:
+            raise ValidationError("Invalid batch: " + "; ".join(problems[:20]))
+        return candidates
+
@@ -1,25 +1,221 @@
+import asyncio
+import threading
+from collections import OrderedDict
 from config.settings import settings
-from providers.greenhouse import GreenhouseProvider
-from providers.workable import WorkableProvider
-from utils.errors import ProviderNotFoundError
+from providers.registry import load_provider_class, load_async_provider_class
+from utils.cache import get_cache, cached_list, jobs_cache_key
+from utils.cursor import resolve_window, window_result
+from utils.pagination import PaginatedList, fetch_window, iter_items, slice_window
+from utils.replica import replica_for
+from utils.single_flight import coalesce, flight_key
+
+# Process-wide provider instances, kept alive across warm Lambda invocations so
+# each provider's HTTP session (and its open connections) is reused. Keyed by
+# (tenant, provider name); the least recently used instance is evicted beyond
+# PROVIDER_POOL_SIZE.
+_providers = OrderedDict()
+_providers_lock = threading.Lock()
+_pool_stats = {"hits": 0, "misses": 0, "evictions": 0}
 
 def get_provider():
-    """Factory to get the active ATS provider."""
+    """Return the active (tenant's) ATS provider, reusing the warm instance when one exists."""
+    key = (settings.TENANT_ID, settings.ATS_PROVIDER)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is not None:
+            _providers.move_to_end(key)
+            _pool_stats["hits"] += 1
+            return provider
+
+    # Built outside the lock, so a slow constructor doesn't hold up other tenants;
+    # if two threads race, the first instance stored wins
+    provider = _create_provider(key[1])
+    with _providers_lock:
+        pooled = _providers.get(key)
+        if pooled is not None:
+            _providers.move_to_end(key)
+            _pool_stats["hits"] += 1
+            return pooled
+        _providers[key] = provider
+        _pool_stats["misses"] += 1
+        while len(_providers) > max(settings.PROVIDER_POOL_SIZE, 1):
+            # Not closed here: another thread may still be using it. Its session's
+            # connections are released once the last reference is dropped.
+            _providers.popitem(last=False)
+            _pool_stats["evictions"] += 1
+        return provider
+
+def _close(provider):
+    session = getattr(provider, "session", None)
+    if session is not None:
+        session.close()
+
+def reset_providers():
+    """Drop all cached provider instances (used by tests and config reloads)."""
+    with _providers_lock:
+        for provider in _providers.values():
+            _close(provider)
+        _providers.clear()
+        _async_providers.clear()
+        _pool_stats.update(hits=0, misses=0, evictions=0)
+
+def provider_pool_stats():
+    """Size and hit/miss/eviction counts of the warm provider pool."""
+    with _providers_lock:
+        return {
+            **_pool_stats,
+            "size": len(_providers),
+            "max_size": settings.PROVIDER_POOL_SIZE,
+            "pooled": [{"tenant": tenant or None, "provider": name} for tenant, name in _providers],
+        }
+
+# Async providers are bound to the container's event loop (see utils.async_runtime).
+# Evicted ones are dropped without aclose(): that needs the loop, which is idle here.
+_async_providers = OrderedDict()
+_closing = set()  # aclose() tasks scheduled on a running loop, kept referenced until done
+
+def get_async_provider():
+    """Return the active (tenant's) ATS provider behind the async interface, reusing warm instances."""
     provider_name = settings.ATS_PROVIDER
-    if provider_name == "greenhouse":
-        return GreenhouseProvider()
-    elif provider_name == "workable":
-        return WorkableProvider()
-    elif provider_name == "zoho":
-        from providers.zoho import ZohoProvider
-        return ZohoProvider()
+    key = (settings.TENANT_ID, provider_name)
+    with _providers_lock:
+        provider = _async_providers.get(key)
+        if provider is not None:
+            _async_providers.move_to_end(key)
+    if provider is not None:
+        return provider
+
+    provider_class = load_async_provider_class(provider_name)
+    if provider_class is not None:
+        provider = provider_class()
     else:
-        raise ProviderNotFoundError(provider_name)
+        # No native async client: run the sync provider's calls in worker threads
+        from providers.async_base_provider import AsyncProviderAdapter
+        provider = AsyncProviderAdapter(get_provider())
+
+    with _providers_lock:
+        pooled = _async_providers.setdefault(key, provider)
+        while len(_async_providers) > max(settings.PROVIDER_POOL_SIZE, 1):
+            _async_providers.popitem(last=False)
+    if pooled is not provider:
+        # Another thread stored one first; this instance was never used, so its
+        # client can be closed right away
+        _discard_async_provider(provider)
+    return pooled
+
+def _discard_async_provider(provider):
+    """Close an unused async provider (and its connection pool) on whatever loop is at hand."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        task = loop.create_task(provider.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+        return
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(provider.aclose())
+    finally:
+        loop.close()
+
+def _create_provider(provider_name):
+    """Instantiate a provider by name (see providers.registry)."""
+    return load_provider_class(provider_name)()
 
 class JobsService:
     def __init__(self):
         self.provider = get_provider()
 
     def list_jobs(self):
-        """Fetch and return normalized jobs from the active ATS."""
-        return self.provider.get_jobs()
+        """Fetch and return normalized jobs from the local replica, the read cache, or the active ATS."""
+        store = replica_for(self.provider)
+        if store is not None:
+            return PaginatedList(self._iter_replica_jobs(store))
+        cache = get_cache()
+        if cache is None:
+            return self._fetch_jobs()
+        key = jobs_cache_key(settings.ATS_PROVIDER)
+        return cached_list(cache, key, self._fetch_jobs, settings.CACHE_JOBS_TTL)
+
+    def iter_jobs(self, query=None):
+        """
+        Lazily yield normalized jobs; streams straight from the ATS when caching is disabled.
+        :param query: Optional utils.query.ListQuery (filters and field projection).
+        """
+        if query:
+            return self._query_jobs(query)
+        store = replica_for(self.provider)
+        if store is not None:
+            return self._iter_replica_jobs(store)
+        if get_cache() is not None:
+            return self.list_jobs()
+        return self.provider.iter_jobs()
+
+    def stream_jobs(self, query=None):
+        """
+        Like iter_jobs, but jobs arrive as the ATS returns them even with the read cache
+        or conditional GET enabled: a listing that is not already cached is read page by
+        page (and not cached) instead of loaded whole first. For callers that may stop
+        early and keep what arrived, e.g. aggregated searches.
+        """
+        if query:
+            return self._query_jobs(query)
+        store = replica_for(self.provider)
+        if store is not None:
+            return self._iter_replica_jobs(store)
+        cache = get_cache()
+        cached = cache.peek(jobs_cache_key(settings.ATS_PROVIDER), settings.CACHE_JOBS_TTL) if cache is not None else None
+        if cached is not None:
+            return iter(cached["items"])
+        if self.provider.page_size:
+            return iter_items(self.provider.fetch_jobs_page)
+        return self.provider.iter_jobs()
+
+    def list_jobs_window(self, limit=None, cursor=None, query=None):
+        """
+        Return one window of jobs plus an opaque cursor for the next one. Only the
+        upstream pages covering the window are fetched (unless a cached copy exists).
+        :return: {"items": [...], "next_cursor": str or None}
+        """
+        scope = jobs_cache_key(settings.ATS_PROVIDER)
+        if query:
+            scope = f"{scope}?{query.key()}"
+            position, limit = resolve_window(limit, cursor, scope)
+            # Positions count matching records, so the filtered stream is read up to the window
+            return window_result(*slice_window(self._query_jobs(query), position, limit), scope)
+        position, limit = resolve_window(limit, cursor, scope)
+
+        store = replica_for(self.provider)
+        if store is not None:
+            return window_result(*slice_window(self._iter_replica_jobs(store), position, limit), scope)
+        cache = get_cache()
+        cached = cache.peek(scope, settings.CACHE_JOBS_TTL) if cache is not None else None
+        if cached is not None:
+            return window_result(*slice_window(cached["items"], position, limit), scope)
+        items, next_position = coalesce(
+            flight_key(self.provider, "jobs", ("window", position, limit)),
+            lambda: fetch_window(self.provider.fetch_jobs_page, position, limit, page_size=self.provider.page_size)
+        )
+        return window_result(items, next_position, scope)
+
+    def _query_jobs(self, query):
+        """Filtered jobs from the replica, a fresh cached listing, or the provider's pushed-down query."""
+        store = replica_for(self.provider)
+        if store is not None:
+            return query.apply(store.iter_jobs(), normalize=self.provider.normalize_job, updated_at=self.provider.record_updated_at)
+        cache = get_cache()
+        # Cached listings are normalized, so updated_since can only be answered upstream
+        if cache is not None and not query.updated_since:
+            cached = cache.peek(jobs_cache_key(settings.ATS_PROVIDER), settings.CACHE_JOBS_TTL)
+            if cached is not None:
+                return query.apply(cached["items"])
+        return self.provider.query_jobs(query)
+
+    def _fetch_jobs(self):
+        # Concurrent misses (e.g. when the cached listing expires) share one upstream fetch
+        return coalesce(flight_key(self.provider, "jobs"), self.provider.get_jobs)
+
+    def _iter_replica_jobs(self, store):
+        return (self.provider.normalize_job(raw) for raw in store.iter_jobs())
@@ -0,0 +1,18 @@
+from .jobs_service import get_provider
+from config.settings import settings
+from utils.errors import ATSError
+from utils.replica import get_replica, sync_lock
+
+class SyncService:
+    def __init__(self):
+        self.provider = get_provider()
+
+    def sync(self):
+        """Run a delta sync of the local replica against the active ATS."""
+        store = get_replica()
+        if store is None:
+            raise ATSError("Local replica is disabled (set REPLICA_ENABLED=true).", 400)
+        if not self.provider.supports_replica:
+            raise ATSError(f"ATS provider '{settings.ATS_PROVIDER}' does not support replica sync.", 400)
+        with sync_lock:
+            return self.provider.sync_replica(store)
@@ -0,0 +1,175 @@
+import hmac
+import json
+import time
+from urllib.parse import parse_qs
+from .jobs_service import get_provider
+from config.settings import settings
+from utils.cache import get_cache, jobs_cache_key, applications_cache_key
+from utils.errors import AuthenticationError, ValidationError
+from utils.replica import get_replica, application_job_id
+
+# Zoho module -> replica resource (Candidates only feed the candidate index)
+MODULE_RESOURCES = {"JobOpenings": "jobs", "Applications": "applications", "Candidates": None}
+OPERATIONS = ("insert", "update", "delete")
+
+class ZohoNotification:
+    """
+    A Zoho Recruit change notification.
+
+    Notification channels (Notifications API) send `module`, `operation`, `ids`,
+    `server_time` and the channel `token`. Workflow webhooks may send the same
+    fields form-encoded and/or the changed records themselves under `data`.
+    """
+
+    def __init__(self, module, operation, ids, records=None, server_time=None, token=None):
+        self.module = module
+        self.operation = operation
+        self.ids = ids
+        self.records = records or []
+        self.server_time = server_time
+        self.token = token
+
+    @classmethod
+    def parse(cls, body, content_type=None, query_params=None, headers_token=None):
+        """Parse a JSON or form-encoded delivery, raising ValidationError on malformed payloads."""
+        if content_type and "application/x-www-form-urlencoded" in content_type:
+            payload = {k: v[-1] for k, v in parse_qs(body or "").items()}
+        else:
+            try:
+                payload = json.loads(body or "{}")
+            except json.JSONDecodeError:
+                raise ValidationError("Webhook body must be JSON or form-encoded.")
+        if not isinstance(payload, dict):
+            raise ValidationError("Webhook body must be an object.")
+
+        module = payload.get("module")
+        if isinstance(module, dict):  # some payloads nest it as {"api_name": ...}
+            module = module.get("api_name")
+        if module not in MODULE_RESOURCES:
+            raise ValidationError(f"Unsupported webhook module: {module}.")
+        operation = str(payload.get("operation") or "").lower()
+        if operation not in OPERATIONS:
+            raise ValidationError(f"Unsupported webhook operation: {operation or 'missing'}.")
+
+        records = payload.get("data") or []
+        if isinstance(records, str):
+            try:
+                records = json.loads(records)
+            except json.JSONDecodeError:
+                raise ValidationError("Webhook data must be a JSON list of records.")
+        if not isinstance(records, list) or not all(isinstance(r, dict) and r.get("id") for r in records):
+            raise ValidationError("Webhook data must be a list of records with ids.")
+        ids = payload.get("ids") or [r["id"] for r in records]
+        if isinstance(ids, str):
+            ids = [i for i in ids.split(",") if i]
+        if not ids:
+            raise ValidationError("Webhook carries no record ids.")
+
+        server_time = payload.get("server_time")
+        token = payload.get("token") or (query_params or {}).get("token") or headers_token
+        return cls(module, operation, [str(i) for i in ids], records, server_time, token)
+
+    @property
+    def changed_at(self):
+        """Unix time Zoho reports for the change (server_time is in milliseconds), else now."""
+        try:
+            return int(self.server_time) / 1000
+        except (TypeError, ValueError):
+            return time.time()
+
+def delivery_token(body, content_type=None, query_params=None, headers_token=None):
+    """
+    The channel token of a delivery, read without validating the payload, so
+    unauthenticated requests are rejected before anything else looks at them.
+    """
+    token = (query_params or {}).get("token") or headers_token
+    if token:
+        return token
+    if content_type and "application/x-www-form-urlencoded" in content_type:
+        return (parse_qs(body or "").get("token") or [None])[-1]
+    try:
+        payload = json.loads(body or "{}")
+    except json.JSONDecodeError:
+        return None
+    return payload.get("token") if isinstance(payload, dict) else None
+
+def verify_token(token):
+    """Reject deliveries that don't carry the channel token configured in ZOHO_WEBHOOK_TOKEN."""
+    expected = settings.ZOHO_WEBHOOK_TOKEN
+    if not expected or not token or not hmac.compare_digest(str(token).encode(), expected.encode()):
+        raise AuthenticationError("Invalid webhook token.")
+
+class WebhookService:
+    def __init__(self):
+        self.provider = get_provider()
+
+    def handle_zoho(self, notification):
+        """
+        Apply a Zoho notification to the replica, read cache and provider copies.
+        Callers verify the delivery's token first (see delivery_token, verify_token).
+        Deliveries may repeat or arrive out of order: records older than the stored
+        version, or than a later delete, are skipped.
+        :return: Summary of what was applied.
+        """
+        if settings.ATS_PROVIDER != "zoho":
+            raise ValidationError("Zoho webhooks require ATS_PROVIDER=zoho.")
+
+        resource = MODULE_RESOURCES[notification.module]
+        summary = {"module": notification.module, "operation": notification.operation, "ids": len(notification.ids)}
+        if resource is None:
+            summary["forgotten"] = self._apply_candidates(notification)
+        elif notification.operation == "delete":
+            summary.update(self._apply_deletes(resource, notification))
+        else:
+            summary.update(self._apply_upserts(resource, notification))
+        return summary
+
+    def _apply_upserts(self, resource, notification):
+        store = get_replica()
+        records = notification.records
+        # Jobs listings are just invalidated when there is no replica; applications
+        # need their records to know which job listings changed
+        if not records and (store is not None or resource == "applications"):
+            records = self.provider.fetch_records(notification.module, notification.ids)
+
+        stale = 0
+        if store is not None:
+            records, stale = store.apply_changes(resource, records)
+        if records or store is None:
+            self._invalidate(resource, records)
+        return {"applied": len(records), "stale": stale}
+
+    def _apply_deletes(self, resource, notification):
+        store = get_replica()
+        removed = notification.records
+        if store is not None:
+            removed = store.apply_deletes(resource, notification.ids, deleted_at=notification.changed_at) or removed
+        self._invalidate(resource, removed)
+        return {"deleted": len(removed)}
+
+    def _apply_candidates(self, notification):
+        # Forgetting is always safe: the next application re-resolves the email.
+        # Notification channels send ids only, so ids are forgotten too.
+        emails = [r.get("Email") for r in notification.records if r.get("Email")]
+        for email in emails:
+            self.provider.forget_candidate(email)
+        return len(emails) + sum(1 for candidate_id in notification.ids if self.provider.forget_candidate_id(candidate_id))
+
+    def _invalidate(self, resource, records):
+        cache = get_cache()
+        if resource == "jobs":
+            keys = [(jobs_cache_key(settings.ATS_PROVIDER), None)]
+        else:
+            job_ids = [application_job_id(r) for r in records]
+            if not job_ids or None in job_ids:
+                # Some changed application's job is unknown (e.g. an id-only delete without
+                # a replica), so every application listing of the account may be affected
+                if cache is not None:
+                    cache.invalidate_prefix(applications_cache_key(settings.ATS_PROVIDER, ""))
+                self.provider.forget_listing(resource, None)
+                return
+            keys = [(applications_cache_key(settings.ATS_PROVIDER, job_id), job_id) for job_id in sorted(set(job_ids))]
+        for key, job_id in keys:
+            if cache is not None:
+                cache.invalidate(key)
+            self.provider.forget_listing(resource, job_id)
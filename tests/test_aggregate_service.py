@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from config.settings import settings
+from providers import registry
+from providers.base_provider import BaseATSProvider
+from services.aggregate_service import AggregateJobsService, provider_budget
+from services.jobs_service import reset_providers
+from utils.cache import MemoryCacheBackend, ReadCache, jobs_cache_key
+from utils.errors import ATSError, ProviderNotFoundError
+from utils.pagination import paginate_all
+from utils.query import ListQuery
+
+release = threading.Event()
+
+class SlowProvider(BaseATSProvider):
+    """Yields one job, then stalls until the test releases it."""
+
+    def get_jobs(self):
+        return list(self.iter_jobs())
+
+    def iter_jobs(self):
+        yield {"id": "s1", "title": "First", "location": "Remote", "status": "OPEN", "external_url": None}
+        release.wait(5)
+        yield {"id": "s2", "title": "Late", "location": "Remote", "status": "OPEN", "external_url": None}
+
+    def create_candidate(self, candidate_data):
+        raise NotImplementedError
+
+    def attach_candidate_to_job(self, candidate_id, job_id):
+        raise NotImplementedError
+
+    def get_applications(self, job_id):
+        return []
+
+class FailingProvider(SlowProvider):
+
+    def iter_jobs(self):
+        raise ATSError("Upstream unavailable", 503)
+
+class PagedSlowProvider(SlowProvider):
+    """Pages of ten jobs taking 30 ms each, counting the pages requested."""
+
+    page_size = 10
+    pages = []
+
+    def get_jobs(self):
+        return paginate_all(self.fetch_jobs_page)
+
+    def iter_jobs(self):
+        return self.get_jobs()
+
+    def fetch_jobs_page(self, page=1):
+        self.pages.append(page)
+        time.sleep(0.03)
+        return [{"id": f"p{page}-{i}", "title": "Job", "location": None, "status": "OPEN", "external_url": None}
+                for i in range(10)], page < 100
+
+class TestAggregateJobs(unittest.TestCase):
+
+    def setUp(self):
+        release.clear()
+        self.addCleanup(release.set)
+        self.addCleanup(reset_providers)
+        for patcher in (
+            patch.dict(registry._providers, {"slowats": SlowProvider, "failats": FailingProvider}),
+            patch("services.jobs_service.get_cache", return_value=None),
+            patch("services.jobs_service.replica_for", return_value=None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_merges_providers_with_prefixed_ids(self):
+        result = AggregateJobsService().list_jobs(["greenhouse", "workable", "greenhouse"])
+        ids = [job["id"] for job in result["jobs"]]
+        self.assertTrue(all(i.startswith("greenhouse:gh-") for i in ids[:-1]))
+        self.assertEqual(ids[-1], "workable:wk-1")
+        self.assertFalse(result["degraded"])
+        self.assertEqual(list(result["providers"]), ["greenhouse", "workable"])
+        self.assertEqual(result["providers"]["workable"]["count"], 1)
+
+    def test_slow_provider_is_cut_off_at_its_budget(self):
+        with settings.override({"AGGREGATE_PROVIDER_BUDGETS": "slowats=0.1", "AGGREGATE_PROVIDER_BUDGET": 5.0}):
+            started = time.monotonic()
+            result = AggregateJobsService().list_jobs(["slowats", "workable"])
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertTrue(result["degraded"])
+        self.assertEqual(result["providers"]["slowats"]["status"], "degraded")
+        self.assertEqual([job["id"] for job in result["jobs"]], ["slowats:s1", "workable:wk-1"])
+        self.assertEqual(result["providers"]["workable"]["status"], "ok")
+
+    def test_cached_listing_streams_until_the_budget_and_stops_paging(self):
+        PagedSlowProvider.pages = []
+        cache = ReadCache(MemoryCacheBackend())
+        with patch.dict(registry._providers, {"pagedats": PagedSlowProvider}), \
+                patch("services.jobs_service.get_cache", return_value=cache), \
+                settings.override({"AGGREGATE_PROVIDER_BUDGETS": "pagedats=0.2"}):
+            result = AggregateJobsService().list_jobs(["pagedats", "workable"])
+        report = result["providers"]["pagedats"]
+        self.assertEqual(report["status"], "degraded")
+        self.assertGreater(report["count"], 0)
+        self.assertNotIn("partial", result)
+        self.assertIsNone(cache.peek(jobs_cache_key("pagedats"), 60))
+        time.sleep(0.1)
+        pages_fetched = len(PagedSlowProvider.pages)
+        time.sleep(0.1)
+        self.assertEqual(len(PagedSlowProvider.pages), pages_fetched)
+        self.assertLess(pages_fetched, 100)
+
+    def test_failed_provider_is_reported_not_raised(self):
+        result = AggregateJobsService().list_jobs(["failats", "workable"], query=ListQuery(fields=["title"]))
+        self.assertEqual(result["providers"]["failats"]["error"], {"message": "Upstream unavailable", "status_code": 503})
+        self.assertEqual(result["jobs"], [{"id": "workable:wk-1", "title": "Backend Developer"}])
+        self.assertTrue(result["degraded"])
+
+    def test_unknown_provider_is_rejected(self):
+        with self.assertRaises(ProviderNotFoundError):
+            AggregateJobsService().list_jobs(["greenhouse", "nope"])
+
+    def test_budget_overrides(self):
+        with settings.override({"AGGREGATE_PROVIDER_BUDGETS": "zoho=12, greenhouse=4", "AGGREGATE_PROVIDER_BUDGET": 8.0}):
+            self.assertEqual((provider_budget("greenhouse"), provider_budget("workable")), (4.0, 8.0))
+
+    def test_handler_rejects_cursor_with_providers(self):
+        import handler
+        response = handler.get_jobs({"queryStringParameters": {"providers": "greenhouse", "limit": "5"}, "headers": {}}, None)
+        self.assertEqual(response["statusCode"], 400)
+        response = handler.get_jobs({"queryStringParameters": {"providers": "workable"}, "headers": {}}, None)
+        self.assertEqual(json.loads(response["body"])["jobs"][0]["id"], "workable:wk-1")
+
+if __name__ == '__main__':
+    unittest.main()
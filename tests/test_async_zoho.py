@@ -0,0 +1,93 @@
+import asyncio
+import json
+import unittest
+import httpx
+from providers.async_zoho import AsyncZohoProvider
+from utils.candidate_index import CandidateIndex
+from utils.pagination import apaginate_all
+from utils.resilience import reset_guards
+from utils.token_cache import clear_tokens
+
+class TestAsyncPagination(unittest.TestCase):
+
+    def test_apaginate_all_keeps_page_order(self):
+        async def fetch(page):
+            await asyncio.sleep(0.01 * (4 - page))  # later pages finish first
+            return [page], page < 3
+
+        result = asyncio.run(apaginate_all(fetch, concurrency=3))
+        self.assertEqual(list(result), [1, 2, 3])
+        self.assertFalse(result.truncated)
+
+    def test_apaginate_all_reports_truncation(self):
+        async def fetch(page):
+            return [page], True
+
+        result = asyncio.run(apaginate_all(fetch, concurrency=2, max_pages=2))
+        self.assertEqual(list(result), [1, 2])
+        self.assertTrue(result.truncated)
+
+class TestAsyncZohoProvider(unittest.TestCase):
+
+    def setUp(self):
+        clear_tokens()
+        reset_guards()
+        self.requests = []
+
+    def _provider(self, handler):
+        provider = AsyncZohoProvider()
+        provider.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        provider.candidate_index = CandidateIndex("test")
+        return provider
+
+    def test_get_jobs_pages_and_retries_on_401(self):
+        tokens = iter(["expired", "fresh"])
+
+        def handler(request):
+            self.requests.append(request)
+            if "oauth" in request.url.path:
+                return httpx.Response(200, json={"access_token": next(tokens), "expires_in": 3600})
+            if request.headers["Authorization"] == "Zoho-oauthtoken expired":
+                return httpx.Response(401)
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={
+                "data": [{"id": str(page), "Posting_Title": f"Job {page}", "Status": "In-progress"}],
+                "info": {"more_records": page < 2}
+            })
+
+        async def scenario():
+            provider = self._provider(handler)
+            try:
+                return await provider.get_jobs()
+            finally:
+                await provider.aclose()
+
+        jobs = asyncio.run(scenario())
+        self.assertEqual([j["id"] for j in jobs], ["1", "2"])
+        self.assertEqual(jobs[0]["status"], "OPEN")
+        self.assertEqual(self.requests[-1].url.params["fields"], "Posting_Title,City,Status")
+        token_calls = [r for r in self.requests if "oauth" in r.url.path]
+        self.assertEqual(len(token_calls), 2)
+
+    def test_create_candidate_and_attach(self):
+        def handler(request):
+            if "oauth" in request.url.path:
+                return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+            if request.url.path.endswith("/Candidates"):
+                body = json.loads(request.content)
+                self.assertEqual(body["data"][0]["Last_Name"], "Doe")
+                return httpx.Response(200, json={"data": [{"status": "success", "details": {"id": "c1"}}]})
+            return httpx.Response(200, json={"data": [{"status": "success"}]})
+
+        async def scenario():
+            provider = self._provider(handler)
+            try:
+                candidate_id = await provider.create_candidate({"name": "Jane Doe", "email": "jane@example.com"})
+                return await provider.attach_candidate_to_job(candidate_id, "j1")
+            finally:
+                await provider.aclose()
+
+        self.assertEqual(asyncio.run(scenario()), "c1_j1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from utils.cache import (
+    MemoryCacheBackend, FileCacheBackend, SQLiteCacheBackend, ReadCache,
+    cached_list, applications_cache_key
+)
+from utils.pagination import PaginatedList
+
+class BackendContract:
+    """Behaviour shared by every cache backend."""
+
+    def make_backend(self, max_entries):
+        raise NotImplementedError
+
+    def test_round_trip_and_delete(self):
+        backend = self.make_backend(10)
+        backend.set("jobs:zoho", {"value": [{"id": "1"}], "stored_at": 123.0})
+        self.assertEqual(backend.get("jobs:zoho"), {"value": [{"id": "1"}], "stored_at": 123.0})
+        backend.delete("jobs:zoho")
+        self.assertIsNone(backend.get("jobs:zoho"))
+
+    def test_delete_prefix(self):
+        backend = self.make_backend(10)
+        for key in ("applications:zoho:j1", "applications:zoho:j2", "applications:zoho2:j1", "jobs:zoho"):
+            backend.set(key, {"value": [], "stored_at": 1.0})
+        backend.delete_prefix("applications:zoho:")
+        self.assertEqual([k for k in ("applications:zoho:j1", "applications:zoho:j2") if backend.get(k)], [])
+        self.assertIsNotNone(backend.get("applications:zoho2:j1"))
+        self.assertIsNotNone(backend.get("jobs:zoho"))
+
+    def test_evicts_least_recently_used(self):
+        backend = self.make_backend(2)
+        backend.set("a", {"value": 1, "stored_at": 1.0})
+        time.sleep(0.01)
+        backend.set("b", {"value": 2, "stored_at": 1.0})
+        time.sleep(0.01)
+        backend.get("a")
+        time.sleep(0.01)
+        backend.set("c", {"value": 3, "stored_at": 1.0})
+        self.assertIsNotNone(backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertIsNotNone(backend.get("c"))
+
+class TestMemoryCacheBackend(BackendContract, unittest.TestCase):
+    def make_backend(self, max_entries):
+        return MemoryCacheBackend(max_entries)
+
+class TestFileCacheBackend(BackendContract, unittest.TestCase):
+    def make_backend(self, max_entries):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        return FileCacheBackend(self._dir.name, max_entries)
+
+class TestSQLiteCacheBackend(BackendContract, unittest.TestCase):
+    def make_backend(self, max_entries):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        return SQLiteCacheBackend(os.path.join(self._dir.name, "cache.sqlite3"), max_entries)
+
+class TestReadCache(unittest.TestCase):
+
+    def test_fresh_hit_skips_loader(self):
+        cache = ReadCache(MemoryCacheBackend(), stale_ttl=0)
+        loader = MagicMock(return_value=["job"])
+        self.assertEqual(cache.get_or_load("k", loader, ttl=60), ["job"])
+        self.assertEqual(cache.get_or_load("k", loader, ttl=60), ["job"])
+        loader.assert_called_once()
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_stale_entry_served_while_revalidating(self):
+        backend = MemoryCacheBackend()
+        backend.set("k", {"value": "old", "stored_at": time.time() - 120})
+        cache = ReadCache(backend, stale_ttl=300)
+        loader = MagicMock(return_value="new")
+
+        self.assertEqual(cache.get_or_load("k", loader, ttl=60), "old")
+        for _ in range(50):
+            if backend.get("k")["value"] == "new":
+                break
+            time.sleep(0.01)
+        self.assertEqual(backend.get("k")["value"], "new")
+        self.assertEqual(cache.stats()["stale_hits"], 1)
+
+    def test_expired_beyond_stale_window_loads_synchronously(self):
+        backend = MemoryCacheBackend()
+        backend.set("k", {"value": "old", "stored_at": time.time() - 1000})
+        cache = ReadCache(backend, stale_ttl=300)
+        self.assertEqual(cache.get_or_load("k", lambda: "new", ttl=60), "new")
+
+    def test_cached_list_keeps_truncation(self):
+        cache = ReadCache(MemoryCacheBackend())
+        loader = lambda: PaginatedList(["a"], truncated=True)
+        cached_list(cache, "k", loader, ttl=60)
+        result = cached_list(cache, "k", loader, ttl=60)
+        self.assertEqual(result, ["a"])
+        self.assertTrue(result.truncated)
+
+class TestCandidateInvalidation(unittest.TestCase):
+
+    @patch('services.candidate_service.get_provider')
+    @patch('services.candidate_service.get_cache')
+    def test_apply_to_job_invalidates_job_applications(self, mock_get_cache, mock_get_provider):
+        from services.candidate_service import CandidateService
+        cache = ReadCache(MemoryCacheBackend())
+        mock_get_cache.return_value = cache
+        provider = mock_get_provider.return_value
+        provider.create_candidate.return_value = "cand_1"
+        provider.attach_candidate_to_job.return_value = "cand_1_job_1"
+
+        key = applications_cache_key("greenhouse", "job_1")
+        cache.backend.set(key, {"value": [], "stored_at": time.time()})
+        with patch('services.candidate_service.settings') as mock_settings:
+            mock_settings.ATS_PROVIDER = "greenhouse"
+            CandidateService().apply_to_job({"name": "Jane Doe", "email": "jane@example.com", "job_id": "job_1"})
+
+        self.assertIsNone(cache.backend.get(key))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from utils.cache import SQLiteCacheBackend
+from utils.candidate_index import CandidateIndex, normalize_email
+
+class TestCandidateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "index.sqlite3")
+
+    def test_normalizes_emails(self):
+        self.assertEqual(normalize_email("  Jane@Example.COM "), "jane@example.com")
+        self.assertIsNone(normalize_email(""))
+        self.assertIsNone(normalize_email(None))
+
+    def test_persists_across_instances_and_namespaces_are_separate(self):
+        CandidateIndex("zoho:a", backend=SQLiteCacheBackend(self.path)).put("Jane@Example.com", "c1")
+
+        index = CandidateIndex("zoho:a", backend=SQLiteCacheBackend(self.path))
+        self.assertEqual(index.get("jane@example.com"), "c1")
+        self.assertIsNone(CandidateIndex("zoho:b", backend=SQLiteCacheBackend(self.path)).get("jane@example.com"))
+
+    def test_discard_removes_from_memory_and_backend(self):
+        backend = SQLiteCacheBackend(self.path)
+        index = CandidateIndex("zoho:a", backend=backend)
+        index.put("jane@example.com", "c1")
+        index.discard("JANE@example.com")
+        self.assertIsNone(index.get("jane@example.com"))
+        self.assertIsNone(backend.get("zoho:a:jane@example.com"))
+
+    def test_discard_id_forgets_the_email_it_was_stored_for(self):
+        index = CandidateIndex("zoho:a", backend=SQLiteCacheBackend(self.path))
+        index.put("Jane@example.com", "c1")
+        fresh = CandidateIndex("zoho:a", backend=SQLiteCacheBackend(self.path))
+        self.assertEqual(fresh.discard_id("c1"), "jane@example.com")
+        self.assertIsNone(fresh.get("jane@example.com"))
+        self.assertIsNone(fresh.discard_id("c1"))
+
+    def test_discard_id_keeps_an_email_re_pointed_at_another_id(self):
+        index = CandidateIndex("zoho:a")
+        index.put("jane@example.com", "c1")
+        index.put("jane@example.com", "c2")
+        index.discard_id("c1")
+        self.assertEqual(index.get("jane@example.com"), "c2")
+
+    def test_memory_front_is_bounded(self):
+        index = CandidateIndex("zoho:a", memory_entries=2)
+        for n in range(3):
+            index.put(f"user{n}@example.com", f"c{n}")
+        self.assertIsNone(index.get("user0@example.com"))
+        self.assertEqual(index.get("user2@example.com"), "c2")
+
+if __name__ == "__main__":
+    unittest.main()
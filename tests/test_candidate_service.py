@@ -0,0 +1,156 @@
+import json
+import unittest
+from unittest.mock import patch
+from config.settings import settings
+from providers import registry
+from providers.base_provider import BaseATSProvider, batch_success, batch_error
+from services.candidate_service import CandidateService
+from services.jobs_service import get_provider, reset_providers
+from utils.candidate_index import CandidateIndex
+from utils.errors import ValidationError, CandidateNotFoundError
+
+class TestApplyBatch(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('services.candidate_service.get_provider')
+        self.provider = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        cache_patcher = patch('services.candidate_service.get_cache', return_value=None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def test_rejects_invalid_payload_before_upstream_calls(self):
+        with self.assertRaises(ValidationError) as ctx:
+            CandidateService().apply_batch({"candidates": [
+                {"name": "A", "email": "a@example.com", "job_id": "j1"},
+                {"name": "B", "job_id": "j1"},
+            ]})
+        self.assertIn("candidates[1]: missing email", ctx.exception.message)
+        self.provider.create_candidates.assert_not_called()
+
+    def test_rejects_non_string_emails_and_job_ids(self):
+        import handler
+        body = {"candidates": [
+            {"name": "A", "email": 42, "job_id": "j1"},
+            {"name": "B", "email": ["b@example.com"], "job_id": {"id": "j1"}},
+            {"name": "C", "email": "  ", "job_id": "j1"},
+        ]}
+        response = handler.create_candidates_batch({"body": json.dumps(body), "headers": {}}, None)
+        self.assertEqual(response["statusCode"], 400)
+        message = json.loads(response["body"])["message"]
+        self.assertIn("candidates[0]: email must be a non-empty string", message)
+        self.assertIn("candidates[1]: email, job_id must be non-empty strings", message)
+        self.assertIn("candidates[2]: email must be a non-empty string", message)
+        self.provider.create_candidates.assert_not_called()
+
+    def test_creates_each_email_once_and_reports_per_record(self):
+        self.provider.create_candidates.return_value = [
+            batch_success("c1"),
+            batch_error("Zoho Candidate Creation Error: invalid", 400),
+        ]
+        self.provider.attach_candidates.return_value = [batch_success("c1_j1"), batch_success("c1_j2")]
+
+        results = CandidateService().apply_batch({"candidates": [
+            {"name": "A", "email": "a@example.com", "job_id": "j1"},
+            {"name": "A", "email": "A@example.com ", "job_id": "j2"},
+            {"name": "B", "email": "b@example.com", "job_id": "j1"},
+        ]})
+
+        created = self.provider.create_candidates.call_args.args[0]
+        self.assertEqual([c["email"] for c in created], ["a@example.com", "b@example.com"])
+        self.provider.attach_candidates.assert_called_once_with([("c1", "j1"), ("c1", "j2")])
+        self.assertEqual([r["status"] for r in results], ["success", "success", "error"])
+        self.assertEqual(results[1]["application_id"], "c1_j2")
+
+class IndexedProvider(BaseATSProvider):
+    """Reuses ids from a CandidateIndex like ZohoProvider; only `live` ids can be associated."""
+
+    def __init__(self):
+        self.candidate_index = CandidateIndex("indexed")
+        self.live = set()
+
+    def create_candidates(self, candidates):
+        results = []
+        for candidate in candidates:
+            candidate_id = self.candidate_index.get(candidate["email"])
+            if candidate_id is None:
+                candidate_id = f"c{len(self.live) + 1}"
+                self.live.add(candidate_id)
+                self.candidate_index.put(candidate["email"], candidate_id)
+            results.append(batch_success(candidate_id))
+        return results
+
+    def attach_candidates(self, pairs):
+        return [
+            batch_success(f"{candidate_id}_{job_id}") if candidate_id in self.live
+            else batch_error(f"candidate {candidate_id} not found", 404)
+            for candidate_id, job_id in pairs
+        ]
+
+    def forget_candidate(self, email):
+        self.candidate_index.discard(email)
+
+    def get_jobs(self):
+        return []
+
+    def create_candidate(self, candidate_data):
+        raise NotImplementedError
+
+    def attach_candidate_to_job(self, candidate_id, job_id):
+        raise NotImplementedError
+
+    def get_applications(self, job_id):
+        return []
+
+class TestBatchWithStaleIndex(unittest.TestCase):
+
+    def setUp(self):
+        reset_providers()
+        self.addCleanup(reset_providers)
+        for patcher in (
+            patch.dict(registry._providers, {"indexedats": IndexedProvider}),
+            patch("services.candidate_service.get_cache", return_value=None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_stale_indexed_id_is_recreated_and_retried(self):
+        import handler
+        body = {"candidates": [
+            {"name": "Ann", "email": "ann@example.com", "job_id": "j1"},
+            {"name": "Ann", "email": "Ann@example.com", "job_id": "j2"},
+        ]}
+        with settings.override({"ATS_PROVIDER": "indexedats"}):
+            index = get_provider().candidate_index
+            index.put("ann@example.com", "deleted")
+            for _ in range(2):
+                response = handler.create_candidates_batch({"body": json.dumps(body), "headers": {}}, None)
+                self.assertEqual(response["statusCode"], 201)
+
+        results = json.loads(response["body"])["results"]
+        self.assertEqual([r["application_id"] for r in results], ["c1_j1", "c1_j2"])
+        self.assertNotIn("status_code", results[0])
+        self.assertEqual(index.get("ann@example.com"), "c1")
+
+class TestApplyToJob(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('services.candidate_service.get_provider')
+        self.provider = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        cache_patcher = patch('services.candidate_service.get_cache', return_value=None)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    def test_recreates_candidate_once_when_remembered_id_is_gone(self):
+        self.provider.create_candidate.side_effect = ["stale", "fresh"]
+        self.provider.attach_candidate_to_job.side_effect = [CandidateNotFoundError("stale"), "fresh_j1"]
+
+        application_id = CandidateService().apply_to_job({"name": "A", "email": "a@example.com", "job_id": "j1"})
+
+        self.assertEqual(application_id, "fresh_j1")
+        self.provider.forget_candidate.assert_called_once_with("a@example.com")
+        self.provider.attach_candidate_to_job.assert_called_with("fresh", "j1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import base64
+import hashlib
+import hmac
+import unittest
+from unittest.mock import patch
+from utils.cursor import encode_cursor, decode_cursor, resolve_window, window_result
+from utils.errors import ValidationError
+
+class TestCursor(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('utils.cursor.settings')
+        self.settings = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.settings.CURSOR_SECRET = "test-secret"
+        self.settings.LIST_DEFAULT_LIMIT = 100
+        self.settings.LIST_MAX_LIMIT = 500
+
+    def test_round_trip_is_opaque(self):
+        cursor = encode_cursor(400, "jobs:zoho")
+        self.assertNotIn("400", cursor)
+        self.assertEqual(decode_cursor(cursor, "jobs:zoho"), 400)
+
+    def test_rejects_tampering_and_other_scopes(self):
+        cursor = encode_cursor(400, "applications:zoho:1")
+        forged = encode_cursor(0, "applications:zoho:1").split(".")[0] + "." + cursor.split(".")[1]
+        for bad, scope in [(forged, "applications:zoho:1"), (cursor, "applications:zoho:2"), ("garbage", "jobs:zoho")]:
+            with self.assertRaises(ValidationError):
+                decode_cursor(bad, scope)
+
+    def test_secret_change_invalidates_cursors(self):
+        cursor = encode_cursor(5, "jobs:zoho")
+        self.settings.CURSOR_SECRET = "rotated"
+        with self.assertRaises(ValidationError):
+            decode_cursor(cursor, "jobs:zoho")
+
+    def test_no_secret_and_no_credentials_is_not_forgeable(self):
+        self.settings.CURSOR_SECRET = ""
+        self.settings.ATS_API_KEY = self.settings.ZOHO_CLIENT_SECRET = self.settings.ZOHO_REFRESH_TOKEN = ""
+        # The key anyone could compute if it were derived from empty credentials
+        public_key = hashlib.sha256(b"ats-cursor|||").digest()
+        payload = encode_cursor(400, "jobs:zoho").split(".")[0]
+        signature = hmac.new(public_key, f"jobs:zoho|{payload}".encode("utf-8"), hashlib.sha256).digest()[:16]
+        forged = payload + "." + base64.urlsafe_b64encode(signature).decode("ascii").rstrip("=")
+        with patch('utils.cursor._random_secret', None), patch('builtins.print') as warn:
+            cursor = encode_cursor(400, "jobs:zoho")
+            self.assertEqual(decode_cursor(cursor, "jobs:zoho"), 400)
+            with self.assertRaises(ValidationError):
+                decode_cursor(forged, "jobs:zoho")
+        warn.assert_called_once()
+
+    def test_resolve_window(self):
+        self.assertEqual(resolve_window(None, None, "jobs:zoho"), (0, 100))
+        self.assertEqual(resolve_window("25", encode_cursor(50, "jobs:zoho"), "jobs:zoho"), (50, 25))
+        for limit in ["0", "501", "ten"]:
+            with self.assertRaises(ValidationError):
+                resolve_window(limit, None, "jobs:zoho")
+
+    def test_window_result(self):
+        self.assertEqual(window_result([1], None, "jobs:zoho"), {"items": [1], "next_cursor": None})
+        self.assertEqual(decode_cursor(window_result([1], 7, "jobs:zoho")["next_cursor"], "jobs:zoho"), 7)
+
+if __name__ == "__main__":
+    unittest.main()
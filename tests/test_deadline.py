@@ -0,0 +1,147 @@
+import json
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from config.settings import settings
+from providers import registry
+from providers.base_provider import BaseATSProvider
+from services.jobs_service import reset_providers
+from utils.cache import ReadCache, MemoryCacheBackend, cached_list
+from utils.deadline import Deadline, deadline_scope, request_timeout, start_deadline
+from utils.errors import UpstreamTimeoutError
+from utils.pagination import paginate_all, fetch_window
+from utils.resilience import UpstreamGuard
+
+PAGE_SECONDS = 0.03
+
+def slow_page(page):
+    """Ten records per page, 100 pages, each taking PAGE_SECONDS."""
+    time.sleep(PAGE_SECONDS)
+    return list(range((page - 1) * 10, page * 10)), page < 100
+
+class LambdaContext:
+
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+class PagedProvider(BaseATSProvider):
+    """Slow paged jobs, standing in for an ATS that cannot be listed within the deadline."""
+
+    page_size = 10
+
+    def get_jobs(self):
+        return paginate_all(self.fetch_jobs_page)
+
+    def iter_jobs(self):
+        return paginate_all(self.fetch_jobs_page)
+
+    def fetch_jobs_page(self, page=1):
+        ids, more_records = slow_page(page)
+        return [{"id": f"p-{i}", "title": "Job", "location": None, "status": "OPEN", "external_url": None} for i in ids], more_records
+
+    def create_candidate(self, candidate_data):
+        raise NotImplementedError
+
+    def attach_candidate_to_job(self, candidate_id, job_id):
+        raise NotImplementedError
+
+    def get_applications(self, job_id):
+        return []
+
+class TestDeadline(unittest.TestCase):
+
+    def test_starts_from_the_lambda_context_less_the_margin(self):
+        with settings.override({"DEADLINE_MARGIN_MS": 1500}):
+            deadline = start_deadline(LambdaContext(10000))
+        self.assertAlmostEqual(deadline.remaining(), 8.5, places=1)
+        self.assertIsNone(start_deadline(None))
+
+    def test_request_timeouts_end_by_the_deadline(self):
+        with settings.override({"HTTP_CONNECT_TIMEOUT": 3.0, "HTTP_READ_TIMEOUT": 20.0}):
+            self.assertEqual(request_timeout(), (3.0, 20.0))
+            with deadline_scope(Deadline(5)):
+                connect, read = request_timeout()
+            self.assertEqual(connect, 3.0)
+            self.assertLessEqual(read, 5.0)
+            with deadline_scope(Deadline(0)), self.assertRaises(UpstreamTimeoutError):
+                request_timeout()
+
+class TestDeadlinePagination(unittest.TestCase):
+
+    def test_no_new_pages_start_after_the_deadline(self):
+        with deadline_scope(Deadline(PAGE_SECONDS * 2.5)) as deadline:
+            result = paginate_all(slow_page, concurrency=1)
+        self.assertTrue(result.partial and deadline.partial)
+        self.assertFalse(result.truncated)
+        self.assertLess(result.pages, 5)
+        self.assertEqual(list(result), list(range(result.pages * 10)))
+
+    def test_window_resumes_after_what_was_fetched(self):
+        with deadline_scope(Deadline(PAGE_SECONDS * 1.5)) as deadline:
+            items, next_position = fetch_window(slow_page, 5, 50, page_size=10)
+        self.assertTrue(deadline.partial)
+        self.assertEqual(next_position, 5 + len(items))
+        self.assertEqual(items, list(range(5, 5 + len(items))))
+        self.assertLess(len(items), 50)
+
+    def test_partial_listings_are_not_cached(self):
+        cache = ReadCache(MemoryCacheBackend(4))
+        with deadline_scope(Deadline(PAGE_SECONDS * 1.5)):
+            partial = cached_list(cache, "jobs", lambda: paginate_all(slow_page), 60)
+        self.assertTrue(partial.partial)
+        self.assertIsNone(cache.peek("jobs", 60))
+
+class TestDeadlineRetries(unittest.TestCase):
+
+    def test_retry_wait_past_the_deadline_returns_the_last_response(self):
+        guard = UpstreamGuard(
+            name="test", rate_per_minute=6000, burst=100, max_retries=3, backoff_base=0.5,
+            backoff_max=10, failure_threshold=5, reset_timeout=60
+        )
+        send = MagicMock(return_value=MagicMock(status_code=503, headers={"Retry-After": "5"}))
+        started = time.monotonic()
+        with deadline_scope(Deadline(1)):
+            response = guard.call(send)
+        self.assertEqual(response.status_code, 503)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(guard.snapshot()["deadline_stops"], 1)
+
+class TestDeadlineHandlers(unittest.TestCase):
+
+    def setUp(self):
+        reset_providers()
+        self.addCleanup(reset_providers)
+        for patcher in (
+            patch.dict(registry._providers, {"pagedats": PagedProvider}),
+            patch("services.jobs_service.get_cache", return_value=None),
+            patch("services.jobs_service.replica_for", return_value=None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _get_jobs(self, params=None):
+        import handler
+        event = {"queryStringParameters": params, "headers": {}}
+        with settings.override({"ATS_PROVIDER": "pagedats", "DEADLINE_MARGIN_MS": 0}):
+            return handler.get_jobs(event, LambdaContext(PAGE_SECONDS * 3000))
+
+    def test_listing_returns_what_was_fetched_before_the_deadline(self):
+        response = self._get_jobs()
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(response["headers"]["X-Result-Partial"], "true")
+        jobs = json.loads(response["body"])
+        self.assertTrue(0 < len(jobs) < 1000)
+
+    def test_window_is_marked_partial(self):
+        response = self._get_jobs({"limit": "500"})
+        body = json.loads(response["body"])
+        self.assertTrue(body["partial"])
+        self.assertTrue(0 < len(body["items"]) < 500)
+        self.assertIsNotNone(body["next_cursor"])
+
+if __name__ == '__main__':
+    unittest.main()
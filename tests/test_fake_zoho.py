@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+from providers.zoho import ZohoProvider
+from scripts.fake_zoho import FakeZohoServer, FakeZohoConfig
+from scripts.load_test import percentile
+from utils.resilience import reset_guards
+from utils.token_cache import clear_tokens
+
+class TestFakeZoho(unittest.TestCase):
+    """End-to-end ZohoProvider calls against the local fake server used by scripts/load_test.py."""
+
+    def setUp(self):
+        clear_tokens()
+        reset_guards()
+        self.server = FakeZohoServer(FakeZohoConfig(jobs=450, applications_per_job=3, rate_429=0.3, seed=7)).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        with patch('providers.zoho.settings') as mock_settings:
+            mock_settings.ZOHO_CLIENT_ID = "fake"
+            mock_settings.ZOHO_CLIENT_SECRET = "fake"
+            mock_settings.ZOHO_REFRESH_TOKEN = "fake"
+            mock_settings.ZOHO_BASE_URL = self.server.base_url
+            mock_settings.ZOHO_TOKEN_URL = self.server.token_url
+            mock_settings.ZOHO_PER_PAGE = 200
+            mock_settings.ZOHO_PAGE_CONCURRENCY = 2
+            mock_settings.ZOHO_CONDITIONAL_GET = False
+            mock_settings.ZOHO_BATCH_SIZE = 100
+            mock_settings.ZOHO_SEARCH_CRITERIA_MAX = 10
+            mock_settings.ZOHO_CRITERIA_MAX_LENGTH = 1000
+            mock_settings.ZOHO_SNAPSHOT_MAX_AGE = 900
+            mock_settings.ZOHO_SNAPSHOT_MAX_ENTRIES = 8
+            self.provider = ZohoProvider()
+        self.provider.candidate_index = None
+        self.provider.guard.backoff_base = 0
+        self.provider.guard.max_retries = 20
+
+    def test_pages_through_throttled_listings(self):
+        jobs = self.provider.get_jobs()
+        self.assertEqual(len(jobs), 450)
+        self.assertEqual(jobs[-1]["id"], "j449")
+        self.assertEqual([a["id"] for a in self.provider.get_applications("j3")], ["j3-a0", "j3-a1", "j3-a2"])
+
+    def test_candidate_round_trip(self):
+        self.server.config.rate_429 = 0
+        candidate_id = self.provider.create_candidate({"name": "Ann Lee", "email": "ann@example.com"})
+        self.assertEqual(self.provider.attach_candidate_to_job(candidate_id, "j1"), f"{candidate_id}_j1")
+
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertIsNone(percentile([], 0.5))
+
+if __name__ == '__main__':
+    unittest.main()
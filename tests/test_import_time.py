@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import unittest
+from scripts.import_time import ROOT, measure, cold_import_us
+
+# Cold-start budget for `import handler` (best of 3). Wall-clock timings vary too
+# much between machines to gate every run on, so the check only runs with
+# IMPORT_TIME_BUDGET=true; the module checks below always run.
+HANDLER_IMPORT_BUDGET_US = 150_000
+
+# Loaded by providers/services on first use, never by importing the handler module
+DEFERRED_MODULES = ["requests", "httpx", "dotenv", "sqlite3", "asyncio", "concurrent.futures", "services", "providers"]
+
+class TestColdImport(unittest.TestCase):
+
+    def test_handler_import_defers_heavy_modules(self):
+        loaded = measure("handler")
+        for module in DEFERRED_MODULES:
+            self.assertNotIn(module, loaded, f"`import handler` should not import {module}")
+
+    @unittest.skipUnless(os.getenv("IMPORT_TIME_BUDGET", "").lower() == "true", "set IMPORT_TIME_BUDGET=true to time imports")
+    def test_handler_import_within_budget(self):
+        self.assertLess(cold_import_us("handler"), HANDLER_IMPORT_BUDGET_US)
+
+    def test_settings_resolve_on_first_use(self):
+        env = dict(os.environ, PYTHONPATH=ROOT, ATS_PROVIDER="zoho", ATS_API_KEY="")
+        code = (
+            "import sys; from config.settings import settings; "
+            "assert 'dotenv' not in sys.modules; print('imported'); print(settings.ATS_PROVIDER)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines(), ["imported", "Warning: ATS_API_KEY is not set.", "zoho"])
+
+if __name__ == "__main__":
+    unittest.main()
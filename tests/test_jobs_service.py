@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch
+from services import jobs_service
+from services.jobs_service import get_provider, get_async_provider, reset_providers
+from providers.greenhouse import GreenhouseProvider
+
+class TestProviderRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        reset_providers()
+
+    @patch('services.jobs_service.settings')
+    def test_get_provider_reuses_instance(self, mock_settings):
+        mock_settings.ATS_PROVIDER = "greenhouse"
+        mock_settings.TENANT_ID = ""
+        mock_settings.PROVIDER_POOL_SIZE = 32
+        first = get_provider()
+        second = get_provider()
+        self.assertIsInstance(first, GreenhouseProvider)
+        self.assertIs(first, second)
+
+    @patch('services.jobs_service.settings')
+    def test_reset_providers_drops_instances(self, mock_settings):
+        mock_settings.ATS_PROVIDER = "workable"
+        mock_settings.TENANT_ID = ""
+        mock_settings.PROVIDER_POOL_SIZE = 32
+        first = get_provider()
+        reset_providers()
+        self.assertEqual(jobs_service._providers, {})
+        self.assertIsNot(first, get_provider())
+
+    @patch('services.jobs_service.settings')
+    def test_async_provider_losing_the_race_is_closed(self, mock_settings):
+        mock_settings.ATS_PROVIDER = "racyats"
+        mock_settings.TENANT_ID = ""
+        mock_settings.PROVIDER_POOL_SIZE = 32
+        closed = []
+
+        class RacyProvider:
+            def __init__(self):
+                # Another thread pools its instance while this one is being built
+                jobs_service._async_providers.setdefault(("", "racyats"), winner)
+
+            async def aclose(self):
+                closed.append(self)
+
+        winner = object()
+        with patch('services.jobs_service.load_async_provider_class', return_value=RacyProvider):
+            self.assertIs(get_async_provider(), winner)
+        self.assertEqual(len(closed), 1)
+        self.assertIsInstance(closed[0], RacyProvider)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import threading
+import time
+import unittest
+from utils.pagination import paginate_all, PaginatedList, iter_items, iter_pages, fetch_window, slice_window
+
+class TestPaginateAll(unittest.TestCase):
+
+    def _pages(self, total_pages, delays=None):
+        calls = []
+        lock = threading.Lock()
+
+        def fetch(page):
+            with lock:
+                calls.append(page)
+            if delays:
+                time.sleep(delays.get(page, 0))
+            if page > total_pages:
+                return [], False
+            return [f"p{page}-a", f"p{page}-b"], page < total_pages
+        return fetch, calls
+
+    def test_single_page(self):
+        fetch, calls = self._pages(1)
+        result = paginate_all(fetch, concurrency=4)
+        self.assertIsInstance(result, PaginatedList)
+        self.assertEqual(result, ["p1-a", "p1-b"])
+        self.assertFalse(result.truncated)
+        self.assertEqual(calls, [1])
+
+    def test_parallel_pages_keep_order(self):
+        # Later pages finish first; output must still be in page order
+        fetch, _ = self._pages(5, delays={2: 0.05, 3: 0.02})
+        result = paginate_all(fetch, concurrency=3)
+        expected = [f"p{p}-{s}" for p in range(1, 6) for s in "ab"]
+        self.assertEqual(list(result), expected)
+        self.assertEqual(result.pages, 5)
+        self.assertFalse(result.truncated)
+
+    def test_reports_truncation(self):
+        fetch, _ = self._pages(10)
+        result = paginate_all(fetch, concurrency=2, max_pages=3)
+        self.assertEqual(len(result), 6)
+        self.assertTrue(result.truncated)
+
+    def test_errors_propagate(self):
+        def fetch(page):
+            if page == 2:
+                raise RuntimeError("boom")
+            return [page], True
+
+        with self.assertRaises(RuntimeError):
+            paginate_all(fetch, concurrency=2, max_pages=5)
+
+class TestPageStream(unittest.TestCase):
+
+    def test_iter_pages_yields_page_lists(self):
+        fetch = lambda page: ([page], page < 3)
+        self.assertEqual(list(iter_pages(fetch, concurrency=2)), [[1], [2], [3]])
+
+    def test_iter_items_is_lazy(self):
+        calls = []
+
+        def fetch(page):
+            calls.append(page)
+            return [page], True
+
+        stream = iter_items(fetch, concurrency=1, max_pages=50)
+        iterator = iter(stream)
+        self.assertEqual(next(iterator), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(next(iterator), 2)
+        iterator.close()
+        self.assertLess(len(calls), 50)
+
+    def test_stream_reports_truncation(self):
+        stream = iter_items(lambda page: ([page], True), max_pages=2)
+        self.assertEqual(list(stream), [1, 2])
+        self.assertTrue(stream.truncated)
+
+class TestFetchWindow(unittest.TestCase):
+
+    def _upstream(self, total, page_size):
+        calls = []
+
+        def fetch(page):
+            calls.append(page)
+            start = (page - 1) * page_size
+            return list(range(start, min(start + page_size, total))), start + page_size < total
+        return fetch, calls
+
+    def test_fetches_only_the_pages_covering_the_window(self):
+        fetch, calls = self._upstream(total=1000, page_size=200)
+        items, next_position = fetch_window(fetch, 390, 20, page_size=200)
+        self.assertEqual(items, list(range(390, 410)))
+        self.assertEqual(next_position, 410)
+        self.assertEqual(calls, [2, 3])
+
+    def test_first_window_is_one_page(self):
+        fetch, calls = self._upstream(total=1000, page_size=200)
+        items, next_position = fetch_window(fetch, 0, 50, page_size=200)
+        self.assertEqual((len(items), next_position, calls), (50, 50, [1]))
+
+    def test_last_window_has_no_next_position(self):
+        fetch, _ = self._upstream(total=450, page_size=200)
+        items, next_position = fetch_window(fetch, 400, 100, page_size=200)
+        self.assertEqual(items, list(range(400, 450)))
+        self.assertIsNone(next_position)
+
+    def test_unpaged_upstream_uses_offsets(self):
+        fetch, _ = self._upstream(total=30, page_size=1000)
+        self.assertEqual(fetch_window(fetch, 10, 5), ([10, 11, 12, 13, 14], 15))
+
+    def test_slice_window(self):
+        self.assertEqual(slice_window(iter(range(10)), 4, 3), ([4, 5, 6], 7))
+        self.assertEqual(slice_window(range(10), 8, 3), ([8, 9], None))
+
+if __name__ == '__main__':
+    unittest.main()
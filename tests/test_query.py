@@ -0,0 +1,57 @@
+import unittest
+from datetime import datetime, timezone
+from utils.errors import ValidationError
+from utils.query import ListQuery, parse_timestamp
+
+JOBS = [
+    {"id": "1", "title": "Engineer", "location": "Berlin", "status": "OPEN", "external_url": "u1"},
+    {"id": "2", "title": "Designer", "location": "Paris", "status": "CLOSED", "external_url": "u2"},
+    {"id": "3", "title": "Manager", "location": "berlin", "status": "OPEN", "external_url": "u3"},
+]
+
+class TestListQuery(unittest.TestCase):
+
+    def test_empty_params_build_an_empty_query(self):
+        query = ListQuery.from_params({}, "jobs")
+        self.assertFalse(query)
+        self.assertEqual(list(query.apply(JOBS)), JOBS)
+
+    def test_filters_and_projects_jobs(self):
+        query = ListQuery.from_params({"status": "open", "location": "Berlin", "fields": "title"}, "jobs")
+        self.assertEqual(list(query.apply(JOBS)), [
+            {"id": "1", "title": "Engineer"},
+            {"id": "3", "title": "Manager"},
+        ])
+
+    def test_rejects_bad_params(self):
+        for params, resource in (
+            ({"fields": "title,salary"}, "jobs"),
+            ({"status": "DRAFT"}, "jobs"),
+            ({"location": "Berlin"}, "applications"),
+            ({"updated_since": "yesterday"}, "jobs"),
+        ):
+            with self.assertRaises(ValidationError):
+                ListQuery.from_params(params, resource)
+
+    def test_updated_since_uses_raw_timestamps(self):
+        query = ListQuery.from_params({"updated_since": "2024-01-02T00:00:00Z"}, "jobs")
+        raw = [{"id": "1", "at": "2024-01-01T00:00:00+00:00"}, {"id": "2", "at": "2024-01-03T00:00:00+00:00"}]
+        matched = query.apply(
+            raw, normalize=lambda r: {"id": r["id"]}, updated_at=lambda r: parse_timestamp(r["at"])
+        )
+        self.assertEqual(list(matched), [{"id": "2"}])
+
+    def test_updated_since_needs_a_timestamp_hook(self):
+        query = ListQuery(updated_since=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        with self.assertRaises(ValidationError):
+            query.apply(JOBS)
+
+    def test_key_is_stable_and_distinguishes_queries(self):
+        self.assertEqual(ListQuery(status="open").key(), ListQuery(status="OPEN").key())
+        self.assertNotEqual(ListQuery(status="OPEN").key(), ListQuery(status="OPEN", fields=["title"]).key())
+
+    def test_naive_timestamps_are_utc(self):
+        self.assertEqual(parse_timestamp("2024-01-31T00:00:00"), datetime(2024, 1, 31, tzinfo=timezone.utc))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import unittest
+from providers.greenhouse import GreenhouseProvider
+from utils.records import Job, Application
+from utils.response import encode_json_array, success_response
+
+class TestRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.job = Job("1", "Ingénieur \"Senior\"", None, "OPEN", "https://example.com/1")
+        self.application = Application("a1", "Ann Lee", "ann@example.com", "APPLIED")
+
+    def test_reads_like_a_dict(self):
+        self.assertEqual(self.job["title"], "Ingénieur \"Senior\"")
+        self.assertIsNone(self.job.get("location", "N/A"))
+        self.assertEqual(self.job.get("salary", "N/A"), "N/A")
+        with self.assertRaises(KeyError):
+            self.job["salary"]
+        self.assertEqual(dict(self.application), {
+            "id": "a1", "candidate_name": "Ann Lee", "email": "ann@example.com", "status": "APPLIED"
+        })
+        self.assertEqual(self.application, dict(self.application))
+        self.assertNotEqual(self.application, {"id": "a1"})
+
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.job, "__dict__"))
+
+    def test_to_json_matches_json_dumps(self):
+        for record in (self.job, self.application, Job(7, "T", "L", "CLOSED", "u")):
+            self.assertEqual(record.to_json(), json.dumps(record.to_dict()))
+
+    def test_encodes_in_arrays_and_nested_responses(self):
+        self.assertEqual(
+            encode_json_array([self.job, {"id": "2"}]),
+            json.dumps([self.job.to_dict(), {"id": "2"}])
+        )
+        body = json.loads(success_response({"items": [self.application]})["body"])
+        self.assertEqual(body["items"], [dict(self.application)])
+
+    def test_page_normalization_uses_status_table(self):
+        provider = GreenhouseProvider()
+        applications = provider.normalize_applications([
+            {"id": 1, "candidate": {"first_name": "A", "last_name": "B", "email": "a@b.c"}, "status": "hired"},
+            {"id": 2, "candidate": {"first_name": "C", "last_name": "D", "email": "c@d.e"}, "status": "new"},
+        ])
+        self.assertEqual([a.status for a in applications], ["HIRED", "APPLIED"])
+        self.assertIsInstance(applications[0], Application)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import tempfile
+import time
+import unittest
+import requests
+from unittest.mock import MagicMock, patch
+from providers.zoho import ZohoProvider
+from utils.deadline import Deadline, deadline_scope
+from utils.errors import ATSError
+from utils.replica import ReplicaStore
+from utils.token_cache import clear_tokens
+
+class TestReplicaStore(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.store = ReplicaStore(os.path.join(self._dir.name, "replica.sqlite3"))
+
+    def test_upsert_and_delete_jobs(self):
+        self.store.upsert_jobs([{"id": "1", "Status": "In-progress", "Modified_Time": "2026-01-01T00:00:00+00:00"}])
+        self.store.upsert_jobs([{"id": "1", "Status": "Filled", "Modified_Time": "2026-01-02T00:00:00+00:00"}])
+        self.assertEqual([j["Status"] for j in self.store.iter_jobs()], ["Filled"])
+        self.store.delete("jobs", ["1"])
+        self.assertEqual(list(self.store.iter_jobs()), [])
+
+    def test_applications_indexed_by_job(self):
+        self.store.upsert_applications([
+            {"id": "a1", "Job_Opening_Name": {"id": "j1"}},
+            {"id": "a2", "$Job_Opening_Id": "j2"},
+        ])
+        self.assertEqual([a["id"] for a in self.store.iter_applications("j1")], ["a1"])
+        self.assertEqual([a["id"] for a in self.store.iter_applications("j2")], ["a2"])
+
+class TestZohoReplicaSync(unittest.TestCase):
+
+    @patch('providers.zoho.settings')
+    def setUp(self, mock_settings):
+        clear_tokens()
+        mock_settings.ZOHO_BASE_URL = "https://recruit.zoho.com/recruit/v2"
+        mock_settings.ZOHO_PER_PAGE = 200
+        mock_settings.ZOHO_PAGE_CONCURRENCY = 1
+        mock_settings.ZOHO_CONDITIONAL_GET = False
+        mock_settings.ZOHO_SNAPSHOT_MAX_AGE = 900
+        mock_settings.ZOHO_SNAPSHOT_MAX_ENTRIES = 8
+        self.provider = ZohoProvider()
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.store = ReplicaStore(os.path.join(self._dir.name, "replica.sqlite3"))
+
+    def _response(self, records, status_code=200):
+        response = MagicMock(status_code=status_code, text="{}" if records is not None else "")
+        response.json.return_value = {"data": records or [], "info": {"more_records": False}}
+        return response
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token', return_value="token")
+    def test_delta_sync_uses_watermark_and_applies_deletes(self, _, mock_get):
+        def route(url, headers=None, params=None, timeout=None):
+            if url.endswith("/JobOpenings") and "If-Modified-Since" not in headers:
+                return self._response([{"id": "1", "Modified_Time": "2026-01-01T00:00:00+00:00"},
+                                       {"id": "2", "Modified_Time": "2026-01-02T00:00:00+00:00"}])
+            if url.endswith("/JobOpenings"):
+                return self._response([{"id": "1", "Status": "Filled", "Modified_Time": "2026-01-03T00:00:00+00:00"}])
+            if url.endswith("/JobOpenings/deleted"):
+                return self._response([{"id": "2"}])
+            return self._response(None, status_code=304)
+        mock_get.side_effect = route
+
+        first = self.provider.sync_replica(self.store)
+        self.assertEqual(first["jobs"]["upserted"], 2)
+        self.assertEqual(self.store.get_watermark("jobs"), "2026-01-02T00:00:00+00:00")
+
+        second = self.provider.sync_replica(self.store)
+        self.assertEqual(second["jobs"], {"upserted": 1, "deleted": 1, "watermark": "2026-01-03T00:00:00+00:00", "complete": True})
+        delta_call = [c for c in mock_get.call_args_list if c.args[0].endswith("/JobOpenings")][-1]
+        self.assertEqual(delta_call.kwargs["headers"]["If-Modified-Since"], "2026-01-02T00:00:00+00:00")
+        self.assertEqual([j["id"] for j in self.store.iter_jobs()], ["1"])
+
+    def _paged_route(self, fail_page=None):
+        """Two JobOpenings pages; `fail_page` answers 500 once."""
+        failures = {fail_page}
+
+        def route(url, headers=None, params=None, timeout=None):
+            if url.endswith("/JobOpenings"):
+                page = params["page"]
+                if page in failures:
+                    failures.discard(page)
+                    response = MagicMock(status_code=500, text="{}")
+                    response.raise_for_status.side_effect = requests.exceptions.HTTPError("500", response=response)
+                    return response
+                response = self._response([{"id": str(page), "Modified_Time": f"2026-01-0{page}T00:00:00+00:00"}])
+                response.json.return_value["info"]["more_records"] = page < 2
+                return response
+            return self._response(None, status_code=304)
+        return route
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token', return_value="token")
+    def test_interrupted_sync_keeps_progress_but_is_not_marked_synced(self, _, mock_get):
+        mock_get.side_effect = self._paged_route(fail_page=2)
+        self.provider.guard.max_retries = 0
+        with self.assertRaises(ATSError):
+            self.provider.sync_replica(self.store)
+        self.assertIsNone(self.store.last_synced("jobs"))
+        self.assertEqual(self.store.get_watermark("jobs"), "2026-01-01T00:00:00+00:00")
+        self.assertIsNone(self.store.get_watermark("jobs", completed=True))
+
+        summary = self.provider.sync_replica(self.store)
+        self.assertTrue(summary["jobs"]["complete"])
+        resumed = [c for c in mock_get.call_args_list if c.args[0].endswith("/JobOpenings")][-1]
+        self.assertEqual(resumed.kwargs["headers"]["If-Modified-Since"], "2026-01-01T00:00:00+00:00")
+        self.assertIsNotNone(self.store.last_synced("jobs"))
+        self.assertEqual(self.store.get_watermark("jobs", completed=True), "2026-01-02T00:00:00+00:00")
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token', return_value="token")
+    def test_sync_cut_short_by_the_deadline_is_not_marked_synced(self, _, mock_get):
+        route = self._paged_route()
+
+        def slow_route(url, **kwargs):
+            time.sleep(0.05)
+            return route(url, **kwargs)
+        mock_get.side_effect = slow_route
+
+        with deadline_scope(Deadline(0.07)):
+            summary = self.provider.sync_replica(self.store)
+        self.assertFalse(summary["jobs"]["complete"])
+        self.assertIsNone(self.store.last_synced("jobs"))
+
+if __name__ == '__main__':
+    unittest.main()
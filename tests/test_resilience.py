@@ -0,0 +1,121 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from utils.errors import ATSError, CircuitOpenError
+from utils.resilience import TokenBucket, CircuitBreaker, UpstreamGuard, get_guard, reset_guards, guard_snapshots
+
+def make_guard(**overrides):
+    options = dict(
+        name="test", rate_per_minute=6000, burst=100, max_retries=2, backoff_base=0.01,
+        backoff_max=0.05, failure_threshold=3, reset_timeout=60
+    )
+    options.update(overrides)
+    return UpstreamGuard(**options)
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate_per_second=10, capacity=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        # Third caller waits roughly one token interval, the fourth two
+        self.assertAlmostEqual(bucket.reserve(), 0.1, delta=0.02)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, delta=0.02)
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold_and_half_opens_after_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        breaker.record_failure()
+        self.assertEqual(breaker.retry_in(), 0)
+        breaker.record_failure()
+        self.assertGreater(breaker.retry_in(), 0)
+
+        with patch("utils.resilience.time.monotonic", return_value=breaker._opened_at + 31):
+            self.assertEqual(breaker.retry_in(), 0)  # the single trial call
+            self.assertGreater(breaker.retry_in(), 0)  # others still fail fast
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+class TestUpstreamGuard(unittest.TestCase):
+
+    def test_retries_on_5xx_then_returns_last_response(self):
+        guard = make_guard()
+        send = MagicMock(return_value=MagicMock(status_code=502, headers={}))
+        response = guard.call(send)
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(guard.snapshot()["retries"], 2)
+
+    def test_honours_retry_after_capped_at_backoff_max(self):
+        guard = make_guard(backoff_max=0.01)
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "120"})
+        with patch("utils.resilience.time.sleep") as mock_sleep:
+            guard.call(MagicMock(side_effect=[throttled, MagicMock(status_code=200)]))
+        mock_sleep.assert_called_once_with(0.01)
+
+    def test_non_idempotent_calls_are_not_retried(self):
+        guard = make_guard()
+        send = MagicMock(return_value=MagicMock(status_code=503, headers={}))
+        guard.call(send, idempotent=False)
+        self.assertEqual(send.call_count, 1)
+
+    def test_connection_errors_are_retried_then_raised(self):
+        guard = make_guard(failure_threshold=10)
+        send = MagicMock(side_effect=ConnectionError("reset"))
+        with self.assertRaises(ConnectionError):
+            guard.call(send, retry_exceptions=(ConnectionError,))
+        self.assertEqual(send.call_count, 3)
+
+    def test_open_breaker_fails_fast(self):
+        guard = make_guard(max_retries=0, failure_threshold=2)
+        send = MagicMock(return_value=MagicMock(status_code=500, headers={}))
+        guard.call(send)
+        guard.call(send)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            guard.call(send)
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(send.call_count, 2)
+        snapshot = guard.snapshot()
+        self.assertEqual(snapshot["breaker_state"], "open")
+        self.assertEqual(snapshot["short_circuited"], 1)
+
+    def test_non_http_error_in_half_open_trial_releases_it(self):
+        guard = make_guard(max_retries=0, failure_threshold=2, reset_timeout=0.01)
+        failing = MagicMock(return_value=MagicMock(status_code=503, headers={}))
+        guard.call(failing)
+        guard.call(failing)
+        time.sleep(0.02)
+        with self.assertRaises(ATSError):
+            guard.call(MagicMock(side_effect=ATSError("token refresh failed", 401)))
+        response = guard.call(MagicMock(return_value=MagicMock(status_code=200, headers={})))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(guard.snapshot()["breaker_state"], "closed")
+
+    def test_acall_retries(self):
+        guard = make_guard()
+        responses = [MagicMock(status_code=503, headers={}), MagicMock(status_code=200)]
+
+        async def send():
+            return responses.pop(0)
+
+        response = asyncio.run(guard.acall(send))
+        self.assertEqual(response.status_code, 200)
+
+class TestGuardRegistry(unittest.TestCase):
+
+    def setUp(self):
+        reset_guards()
+
+    def test_guards_are_shared_per_account(self):
+        self.assertIs(get_guard("zoho", "a"), get_guard("zoho", "a"))
+        self.assertIsNot(get_guard("zoho", "a"), get_guard("zoho", "b"))
+        snapshots = guard_snapshots()
+        self.assertEqual([snapshot["name"] for snapshot in snapshots], ["zoho", "zoho"])
+        labels = {snapshot["account"] for snapshot in snapshots}
+        self.assertEqual(len(labels), 2)
+        self.assertNotIn("a", labels)
+
+if __name__ == "__main__":
+    unittest.main()
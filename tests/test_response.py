@@ -0,0 +1,101 @@
+import base64
+import gzip
+import json
+import unittest
+from unittest.mock import patch
+from utils.pagination import iter_items
+from utils.response import (
+    encode_json_array, stream_response, success_response, conditional_response,
+    compress_response, negotiate_response, choose_encoding, get_body
+)
+
+class TestResponses(unittest.TestCase):
+
+    def test_encode_json_array_matches_json_dumps(self):
+        records = [{"id": "1", "title": "Engineer"}, {"id": "2", "title": "Designer – UX"}]
+        self.assertEqual(json.loads(encode_json_array(iter(records))), records)
+        self.assertEqual(encode_json_array([]), "[]")
+
+    def test_stream_response_consumes_generator(self):
+        stream = iter_items(lambda page: ([{"page": page}], page < 2))
+        response = stream_response(stream)
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(json.loads(response["body"]), [{"page": 1}, {"page": 2}])
+        self.assertNotIn("X-Result-Truncated", response["headers"])
+
+    def test_stream_response_flags_truncation(self):
+        stream = iter_items(lambda page: ([page], True), max_pages=1)
+        response = stream_response(stream)
+        self.assertEqual(response["headers"]["X-Result-Truncated"], "true")
+
+    def test_success_response_extra_headers(self):
+        response = success_response({"ok": True}, headers={"X-Test": "1"})
+        self.assertEqual(response["headers"]["X-Test"], "1")
+        self.assertEqual(response["headers"]["Content-Type"], "application/json")
+
+    def test_conditional_response_sets_etag(self):
+        response = conditional_response(success_response([{"id": "1"}]), {"headers": {}})
+        self.assertEqual(response["statusCode"], 200)
+        self.assertTrue(response["headers"]["ETag"].startswith('"'))
+
+    def test_conditional_response_not_modified(self):
+        etag = conditional_response(success_response([{"id": "1"}]), {})["headers"]["ETag"]
+        event = {"headers": {"if-none-match": f'W/"other", {etag}'}}
+        response = conditional_response(success_response([{"id": "1"}]), event)
+        self.assertEqual(response["statusCode"], 304)
+        self.assertEqual(response["body"], "")
+        self.assertEqual(response["headers"]["ETag"], etag)
+
+    def test_conditional_response_changed_body(self):
+        event = {"headers": {"If-None-Match": '"stale"'}}
+        response = conditional_response(success_response([{"id": "2"}]), event)
+        self.assertEqual(response["statusCode"], 200)
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [{"id": str(i), "title": "Engineer", "status": "OPEN"} for i in range(200)]
+
+    def test_gzip_when_accepted_and_large(self):
+        event = {"headers": {"Accept-Encoding": "gzip, deflate"}}
+        response = negotiate_response(success_response(self.records), event)
+        self.assertTrue(response["isBase64Encoded"])
+        self.assertEqual(response["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(response["headers"]["Vary"], "Accept-Encoding")
+        self.assertTrue(response["headers"]["ETag"].startswith('W/"'))
+        self.assertEqual(json.loads(gzip.decompress(base64.b64decode(response["body"]))), self.records)
+
+    def test_small_bodies_and_unaccepted_encodings_are_left_alone(self):
+        small = compress_response(success_response({"ok": True}), {"headers": {"Accept-Encoding": "gzip"}})
+        self.assertNotIn("Content-Encoding", small["headers"])
+        plain = compress_response(success_response(self.records), {"headers": {"Accept-Encoding": "gzip;q=0"}})
+        self.assertNotIn("Content-Encoding", plain["headers"])
+        self.assertEqual(plain["headers"]["Vary"], "Accept-Encoding")
+        self.assertEqual(json.loads(plain["body"]), self.records)
+
+    def test_choose_encoding_honours_q_values(self):
+        self.assertIsNone(choose_encoding(None))
+        self.assertEqual(choose_encoding("*"), choose_encoding("br, gzip"))
+        with patch("utils.response._brotli", return_value=object()):
+            self.assertEqual(choose_encoding("gzip, br"), "br")
+            self.assertEqual(choose_encoding("br;q=0.5, gzip"), "gzip")
+        with patch("utils.response._brotli", return_value=None):
+            self.assertEqual(choose_encoding("br"), None)
+            self.assertEqual(choose_encoding("br, gzip;q=0.8"), "gzip")
+
+    def test_not_modified_is_not_compressed(self):
+        etag = negotiate_response(success_response(self.records), {})["headers"]["ETag"]
+        event = {"headers": {"Accept-Encoding": "gzip", "If-None-Match": f"W/{etag}"}}
+        response = negotiate_response(success_response(self.records), event)
+        self.assertEqual(response["statusCode"], 304)
+        self.assertNotIn("isBase64Encoded", response)
+        self.assertEqual(response["headers"]["Vary"], "Accept-Encoding")
+
+    def test_get_body_decodes_base64(self):
+        event = {"body": base64.b64encode(b'{"a": 1}').decode(), "isBase64Encoded": True}
+        self.assertEqual(get_body(event), '{"a": 1}')
+        self.assertEqual(get_body({"body": "{}"}), "{}")
+        self.assertEqual(get_body({}), "")
+
+if __name__ == '__main__':
+    unittest.main()
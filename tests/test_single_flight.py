@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from utils.cache import ReadCache, MemoryCacheBackend
+from utils.errors import ATSError, UpstreamTimeoutError
+from utils.single_flight import SingleFlight
+
+class GatedFetch:
+    """A fetch that blocks until released, counting how often it ran."""
+
+    def __init__(self, result="jobs", error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+def _wait_for_waiters(flight, count):
+    deadline = time.time() + 5
+    while flight.stats()["shared"] < count and time.time() < deadline:
+        time.sleep(0.001)
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_callers_share_one_fetch(self):
+        flight, fetch = SingleFlight(), GatedFetch(result=["j1"])
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(flight.do, "jobs", fetch, 5) for _ in range(10)]
+            fetch.started.wait(5)
+            _wait_for_waiters(flight, 9)
+            fetch.release.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(flight.stats(), {"leaders": 1, "shared": 9, "timeouts": 0, "in_flight": 0})
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        flight, fetch = SingleFlight(), GatedFetch(error=ATSError("Zoho API Error", 502))
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(flight.do, "jobs", fetch, 5) for _ in range(3)]
+            fetch.started.wait(5)
+            _wait_for_waiters(flight, 2)
+            fetch.release.set()
+            for future in futures:
+                with self.assertRaises(ATSError):
+                    future.result()
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(flight.do("jobs", lambda: "fresh"), "fresh")
+
+    def test_waiter_times_out_without_cancelling_the_fetch(self):
+        flight, fetch = SingleFlight(), GatedFetch()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(flight.do, "jobs", fetch)
+            fetch.started.wait(5)
+            with self.assertRaises(UpstreamTimeoutError):
+                flight.do("jobs", fetch, timeout=0.01)
+            fetch.release.set()
+            self.assertEqual(leader.result(), "jobs")
+        self.assertEqual(flight.stats()["timeouts"], 1)
+
+    def test_different_keys_fetch_independently(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do(("zoho", "a", "jobs", None), lambda: 1), 1)
+        self.assertEqual(flight.do(("zoho", "b", "jobs", None), lambda: 2), 2)
+
+class TestSingleFlightAsync(unittest.TestCase):
+
+    def test_coroutines_share_one_fetch(self):
+        flight, calls = SingleFlight(), []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ["j1"]
+
+        async def main():
+            return await asyncio.gather(*(flight.do_async("jobs", fetch, 5) for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["j1"]] * 5)
+
+    def test_coroutine_waits_for_thread_fetch(self):
+        flight, fetch = SingleFlight(), GatedFetch(result=["j1"])
+
+        async def main():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                leader = executor.submit(flight.do, "jobs", fetch)
+                await asyncio.to_thread(fetch.started.wait, 5)
+                asyncio.get_running_loop().call_later(0.01, fetch.release.set)
+                shared = await flight.do_async("jobs", fetch, 5)
+                return shared, leader.result()
+
+        shared, led = asyncio.run(main())
+        self.assertIs(shared, led)
+        self.assertEqual(fetch.calls, 1)
+
+    def test_coroutine_timeout(self):
+        flight, fetch = SingleFlight(), GatedFetch()
+
+        async def main():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(flight.do, "jobs", fetch)
+                await asyncio.to_thread(fetch.started.wait, 5)
+                try:
+                    with self.assertRaises(UpstreamTimeoutError):
+                        await flight.do_async("jobs", fetch, 0.01)
+                finally:
+                    fetch.release.set()
+
+        asyncio.run(main())
+
+class TestCacheExpiryHerd(unittest.TestCase):
+
+    def test_concurrent_cache_misses_hit_the_ats_once(self):
+        from services.jobs_service import JobsService
+        fetch = GatedFetch(result=[{"id": "j1"}])
+        cache = ReadCache(MemoryCacheBackend(16))
+        with patch("services.jobs_service.get_provider") as get_provider, \
+                patch("services.jobs_service.get_cache", return_value=cache), \
+                patch("services.jobs_service.replica_for", return_value=None), \
+                patch("utils.single_flight._flight", SingleFlight()):
+            get_provider.return_value.get_jobs.side_effect = fetch
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(lambda: JobsService().list_jobs()) for _ in range(8)]
+                fetch.started.wait(5)
+                time.sleep(0.05)
+                fetch.release.set()
+                results = [f.result() for f in futures]
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual([list(r) for r in results], [[{"id": "j1"}]] * 8)
+
+if __name__ == '__main__':
+    unittest.main()
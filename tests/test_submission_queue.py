@@ -0,0 +1,180 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from config.settings import settings
+from providers.base_provider import batch_success, batch_error
+from services.candidate_service import CandidateService
+from utils.errors import ResourceNotFoundError, ValidationError
+from utils.submission_queue import SQLiteSubmissionQueue, reset_submission_queue
+
+def _candidate(index, job_id="j1"):
+    return {"name": f"Candidate {index}", "email": f"c{index}@example.com", "job_id": job_id}
+
+class TestSQLiteSubmissionQueue(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.queue = SQLiteSubmissionQueue(os.path.join(self._dir.name, "queue.sqlite3"), max_attempts=2)
+
+    def test_claims_oldest_first_and_only_once(self):
+        ids = [self.queue.enqueue(_candidate(i)) for i in range(3)]
+        first = self.queue.claim(2, lease_seconds=60)
+        self.assertEqual([submission_id for submission_id, _ in first], ids[:2])
+        self.assertEqual(first[0][1], _candidate(0))
+        self.assertEqual([submission_id for submission_id, _ in self.queue.claim(5, 60)], ids[2:])
+        self.assertEqual(self.queue.claim(5, 60), [])
+        self.assertEqual(self.queue.status(ids[0])["status"], "processing")
+
+    def test_records_final_status(self):
+        submission_id = self.queue.enqueue(_candidate(0))
+        self.queue.claim(1, 60)
+        self.queue.complete(submission_id, {"candidate_id": "c1", "application_id": "a1"})
+        status = self.queue.status(submission_id)
+        self.assertEqual((status["status"], status["application_id"], status["attempts"]), ("succeeded", "a1", 1))
+        self.assertIsNone(self.queue.status("unknown"))
+
+    def test_retryable_failures_requeue_until_out_of_attempts(self):
+        submission_id = self.queue.enqueue(_candidate(0))
+        self.queue.claim(1, 60)
+        self.assertEqual(self.queue.fail(submission_id, "throttled", 429, retry=True), "queued")
+        self.queue.claim(1, 60)
+        self.assertEqual(self.queue.fail(submission_id, "throttled", 429, retry=True), "failed")
+        self.assertEqual(self.queue.status(submission_id)["error"], {"message": "throttled", "status_code": 429})
+
+    def test_expired_leases_are_claimed_again(self):
+        submission_id = self.queue.enqueue(_candidate(0))
+        self.queue.claim(1, lease_seconds=-1)  # the worker died
+        self.assertEqual([i for i, _ in self.queue.claim(1, lease_seconds=-1)], [submission_id])
+        # Out of attempts: the next claim gives up on it
+        self.assertEqual(self.queue.claim(1, 60), [])
+        self.assertEqual(self.queue.status(submission_id)["status"], "failed")
+
+class TestProcessSubmissions(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.queue = SQLiteSubmissionQueue(os.path.join(self._dir.name, "queue.sqlite3"))
+        for target, value in (("get_submission_queue", self.queue), ("get_cache", None)):
+            patcher = patch(f"services.candidate_service.{target}", return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("services.candidate_service.get_provider")
+        self.provider = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def test_submit_validates_before_queueing(self):
+        with self.assertRaises(ValidationError):
+            CandidateService().submit({"name": "A", "job_id": "j1"})
+        with self.assertRaises(ValidationError):
+            CandidateService().submit({"name": "A", "email": ["a@example.com"], "job_id": "j1"})
+        self.assertEqual(self.queue.counts(), {})
+
+    def test_drains_queue_in_coalesced_batches(self):
+        service = CandidateService()
+        ids = [service.submit(_candidate(i, job_id=f"j{i % 2}")) for i in range(3)]
+        self.provider.create_candidates.return_value = [batch_success("c0"), batch_success("c1"), batch_success("c2")]
+        self.provider.attach_candidates.return_value = [batch_success("a0"), batch_success("a1"), batch_success("a2")]
+
+        summary = service.process_submissions(batch_size=10)
+
+        self.assertEqual(summary, {"batches": 1, "succeeded": 3, "failed": 0, "requeued": 0})
+        self.provider.create_candidates.assert_called_once()
+        self.provider.attach_candidates.assert_called_once_with([("c0", "j0"), ("c1", "j1"), ("c2", "j0")])
+        status = service.submission_status(ids[1])
+        self.assertEqual((status["status"], status["application_id"]), ("succeeded", "a1"))
+
+    def test_retries_throttled_and_fails_rejected_submissions(self):
+        service = CandidateService()
+        throttled, rejected = service.submit(_candidate(0)), service.submit(_candidate(1))
+        self.provider.create_candidates.return_value = [
+            batch_error("Too many requests", 429), batch_error("Invalid email", 400)
+        ]
+
+        summary = service.process_submissions(max_batches=1)
+
+        self.assertEqual((summary["requeued"], summary["failed"]), (1, 1))
+        self.assertEqual(service.submission_status(throttled)["status"], "queued")
+        self.assertEqual(service.submission_status(rejected)["status"], "failed")
+
+    def test_stale_candidate_id_is_forgotten_and_retried(self):
+        service = CandidateService()
+        submission_id = service.submit(_candidate(0))
+        self.provider.create_candidates.side_effect = [[batch_success("stale")], [batch_success("c0")]]
+        self.provider.attach_candidates.side_effect = [[batch_error("candidate stale not found", 404)], [batch_success("a0")]]
+
+        summary = service.process_submissions(max_batches=1)
+        self.provider.forget_candidate.assert_called_once_with("c0@example.com")
+        self.assertEqual(summary["succeeded"], 1)
+        status = service.submission_status(submission_id)
+        self.assertEqual((status["status"], status["candidate_id"]), ("succeeded", "c0"))
+
+    def test_unknown_submission_is_not_found(self):
+        with self.assertRaises(ResourceNotFoundError):
+            CandidateService().submission_status("missing")
+
+class TestSharedQueueLocation(unittest.TestCase):
+
+    def setUp(self):
+        reset_submission_queue()
+        self.addCleanup(reset_submission_queue)
+
+    def test_container_local_queue_is_refused_on_lambda(self):
+        import handler
+        env = {"AWS_LAMBDA_FUNCTION_NAME": "createCandidate", "IS_OFFLINE": ""}
+        for path in ("/tmp/ats_submissions.sqlite3", ""):
+            with patch.dict(os.environ, env), \
+                    settings.override({"SUBMISSION_QUEUE_PATH": path, "CANDIDATE_SUBMIT_MODE": "async"}):
+                response = handler.create_candidate({"body": json.dumps(_candidate(0)), "headers": {}}, None)
+                status = handler.get_submission_status({"pathParameters": {"id": "s1"}}, None)
+            self.assertEqual((response["statusCode"], status["statusCode"]), (503, 503))
+
+    @patch("services.candidate_service.get_provider")
+    def test_prefer_is_ignored_without_a_usable_queue_and_worker(self, get_provider):
+        import handler
+        get_provider.return_value.attach_candidate_to_job.return_value = "c0_j1"
+        env = {"AWS_LAMBDA_FUNCTION_NAME": "createCandidate", "IS_OFFLINE": ""}
+        for overrides in ({"SUBMISSION_WORKER_ENABLED": False}, {"SUBMISSION_WORKER_ENABLED": True, "SUBMISSION_QUEUE_PATH": ""}):
+            with patch.dict(os.environ, env), settings.override(overrides):
+                response = handler.create_candidate(
+                    {"body": json.dumps(_candidate(0)), "headers": {"Prefer": "respond-async"}}, None
+                )
+            self.assertEqual(response["statusCode"], 201)
+            self.assertNotIn("Preference-Applied", response["headers"])
+
+class TestSubmissionHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.queue = SQLiteSubmissionQueue(os.path.join(self._dir.name, "queue.sqlite3"))
+        patcher = patch("services.candidate_service.get_submission_queue", return_value=self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.candidate_service.get_provider")
+        self.provider = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.candidate_service.submission_queue_ready", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_prefer_respond_async_returns_202_with_tracking_id(self):
+        import handler
+        response = handler.create_candidate(
+            {"body": json.dumps(_candidate(0)), "headers": {"prefer": "respond-async"}}, None
+        )
+        self.assertEqual(response["statusCode"], 202)
+        body = json.loads(response["body"])
+        self.assertEqual(response["headers"]["Location"], body["status_url"])
+        self.assertEqual(response["headers"]["Preference-Applied"], "respond-async")
+        self.provider.create_candidate.assert_not_called()
+
+        status = handler.get_submission_status({"pathParameters": {"id": body["submission_id"]}}, None)
+        self.assertEqual(json.loads(status["body"])["status"], "queued")
+        self.assertEqual(handler.get_submission_status({"pathParameters": {"id": "nope"}}, None)["statusCode"], 404)
+
+if __name__ == '__main__':
+    unittest.main()
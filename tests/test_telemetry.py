@@ -0,0 +1,105 @@
+import io
+import json
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from utils import telemetry
+from utils.response import encode_json_array, success_response
+
+def _settings(mock_settings, enabled=True, sample_rate=1.0):
+    mock_settings.METRICS_ENABLED = enabled
+    mock_settings.METRICS_SAMPLE_RATE = sample_rate
+    mock_settings.METRICS_NAMESPACE = "Test"
+    mock_settings.METRICS_MAX_SPANS = 3
+    mock_settings.ATS_PROVIDER = "zoho"
+
+class TestTelemetry(unittest.TestCase):
+
+    def _invoke(self, handler):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            response = handler({}, None)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        return response, lines
+
+    def test_untraced_spans_are_noops(self):
+        self.assertIs(telemetry.span("anything", page=1), telemetry.NOOP_SPAN)
+        with telemetry.span("anything") as timing:
+            timing.set(status=200)
+        self.assertFalse(telemetry.tracing())
+
+    @patch('utils.telemetry.settings')
+    def test_disabled_handlers_emit_nothing(self, mock_settings):
+        _settings(mock_settings, enabled=False)
+        response, lines = self._invoke(telemetry.traced(lambda event, context: {"statusCode": 200, "body": "[]"}))
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(lines, [])
+
+    @patch('utils.telemetry.settings')
+    def test_unsampled_invocations_emit_nothing(self, mock_settings):
+        _settings(mock_settings, sample_rate=0.0)
+        _, lines = self._invoke(telemetry.traced(lambda event, context: {"statusCode": 200, "body": "[]"}))
+        self.assertEqual(lines, [])
+
+    @patch('utils.telemetry.settings')
+    def test_traced_handler_emits_one_emf_line(self, mock_settings):
+        _settings(mock_settings)
+
+        def fetch(page):
+            with telemetry.span("upstream.http", page=page) as timing:
+                timing.set(status=200)
+            telemetry.metric("records", 10)
+
+        @telemetry.traced
+        def get_jobs(event, context):
+            # Spans from worker threads land in the invocation's trace
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                for future in [telemetry.submit(executor, fetch, page) for page in (1, 2, 3)]:
+                    future.result()
+            telemetry.event("zoho.candidate_duplicate")
+            return success_response({"items": []})
+
+        response, lines = self._invoke(get_jobs)
+
+        self.assertEqual(len(lines), 1)
+        document = lines[0]
+        directive = document["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(directive["Namespace"], "Test")
+        self.assertEqual(directive["Dimensions"], [["Function"]])
+        names = {metric["Name"]: metric["Unit"] for metric in directive["Metrics"]}
+        self.assertEqual(names["upstream.http.duration"], "Milliseconds")
+        self.assertEqual(names["response.bytes"], "Bytes")
+        self.assertEqual(document["Function"], "get_jobs")
+        self.assertEqual(document["Provider"], "zoho")
+        self.assertEqual(document["StatusCode"], 200)
+        self.assertEqual(len(document["upstream.http.duration"]), 3)
+        self.assertEqual(document["records"], [10, 10, 10])
+        self.assertEqual(document["response.bytes"], len(response["body"]))
+        self.assertEqual(sorted(s["page"] for s in document["spans"] if s["name"] == "upstream.http"), [1, 2, 3])
+        # METRICS_MAX_SPANS bounds the detail kept; metrics still count every span
+        self.assertEqual(len(document["spans"]), 3)
+        self.assertEqual(document["dropped_spans"], 2)
+        self.assertEqual(document["events"], [{"name": "zoho.candidate_duplicate"}])
+
+    @patch('utils.telemetry.settings')
+    def test_serialize_span_excludes_upstream_waits(self, mock_settings):
+        _settings(mock_settings)
+
+        def slow_items():
+            for i in range(3):
+                time.sleep(0.02)
+                yield {"id": str(i)}
+
+        @telemetry.traced
+        def get_jobs(event, context):
+            return {"statusCode": 200, "body": encode_json_array(slow_items())}
+
+        _, lines = self._invoke(get_jobs)
+        serialize = next(s for s in lines[0]["spans"] if s["name"] == "serialize")
+        self.assertEqual(serialize["records"], 3)
+        self.assertLess(serialize["ms"], 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from config.settings import settings
+from services import jobs_service
+from services.jobs_service import get_provider, reset_providers, provider_pool_stats
+from utils.cache import jobs_cache_key, reset_cache
+from utils.errors import TenantNotFoundError, ValidationError
+from utils.telemetry import submit
+from utils.tenants import TenantRegistry, resolve_tenant, tenant_scope, for_each_tenant
+
+TENANTS = {
+    "acme": {"ATS_PROVIDER": "greenhouse", "ATS_API_KEY": "acme-key", "UPSTREAM_RATE_PER_MINUTE": "50"},
+    "globex": {"ATS_PROVIDER": "workable", "ATS_API_KEY": "globex-key"},
+}
+
+class TenantTestCase(unittest.TestCase):
+
+    def setUp(self):
+        reset_providers()
+        self.registry = TenantRegistry.from_config(TENANTS)
+        patcher = patch.multiple("utils.tenants", _registry=self.registry, _registry_loaded=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(reset_providers)
+
+class TestTenantRegistry(unittest.TestCase):
+
+    def test_rejects_unknown_settings_and_unsafe_ids(self):
+        with self.assertRaises(ValueError):
+            TenantRegistry.from_config({"acme": {"NOT_A_SETTING": "x"}})
+        with self.assertRaises(ValueError):
+            TenantRegistry.from_config({"../acme": {}})
+
+    def test_coerces_values_and_gives_each_tenant_its_own_files(self):
+        acme = TenantRegistry.from_config(TENANTS).get("acme")
+        self.assertEqual(acme.overrides["UPSTREAM_RATE_PER_MINUTE"], 50.0)
+        self.assertTrue(acme.overrides["REPLICA_PATH"].endswith(".acme.sqlite3"))
+        self.assertEqual(acme.overrides["TENANT_ID"], "acme")
+
+class TestTenantResolution(TenantTestCase):
+
+    def test_path_parameter_wins_over_header(self):
+        event = {"pathParameters": {"tenant": "globex"}, "headers": {"x-tenant-id": "acme"}}
+        self.assertEqual(resolve_tenant(event).id, "globex")
+        self.assertEqual(resolve_tenant({"headers": {"X-Tenant-Id": "acme"}}).id, "acme")
+
+    def test_unknown_or_missing_tenant(self):
+        with self.assertRaises(TenantNotFoundError):
+            resolve_tenant({"headers": {"X-Tenant-Id": "initech"}})
+        with self.assertRaises(ValidationError):
+            resolve_tenant({"headers": {}})
+
+    def test_single_account_deployment_has_no_tenant(self):
+        with patch.multiple("utils.tenants", _registry=None, _registry_loaded=True):
+            self.assertIsNone(resolve_tenant({"headers": {"X-Tenant-Id": "acme"}}))
+
+class TestTenantScope(TenantTestCase):
+
+    def test_settings_and_cache_keys_follow_the_tenant(self):
+        default_provider = settings.ATS_PROVIDER
+        with tenant_scope(self.registry.get("globex")):
+            self.assertEqual(settings.ATS_PROVIDER, "workable")
+            self.assertEqual(jobs_cache_key(settings.ATS_PROVIDER), "jobs:globex/workable")
+            # Worker threads started through telemetry.submit see the same tenant
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                self.assertEqual(submit(executor, lambda: settings.ATS_API_KEY).result(), "globex-key")
+        self.assertEqual(settings.ATS_PROVIDER, default_provider)
+
+    def test_for_each_tenant_runs_in_every_scope(self):
+        self.assertEqual(for_each_tenant(lambda: settings.ATS_PROVIDER), {"acme": "greenhouse", "globex": "workable"})
+
+class TestProviderPool(TenantTestCase):
+
+    def test_each_tenant_gets_its_own_warm_provider(self):
+        with tenant_scope(self.registry.get("acme")):
+            acme = get_provider()
+            self.assertIs(get_provider(), acme)
+        with tenant_scope(self.registry.get("globex")):
+            globex = get_provider()
+        self.assertIsNot(acme, globex)
+        self.assertEqual(type(globex).__name__, "WorkableProvider")
+
+    def test_least_recently_used_provider_is_evicted(self):
+        evicted = MagicMock()
+        with patch.object(jobs_service, "_create_provider", side_effect=[evicted, MagicMock(), MagicMock()]):
+            with settings.override({"PROVIDER_POOL_SIZE": 2}):
+                for tenant_id in ("acme", "globex"):
+                    with tenant_scope(self.registry.get(tenant_id)):
+                        get_provider()
+                with settings.override({"TENANT_ID": "initech"}):
+                    get_provider()
+                stats = provider_pool_stats()
+        self.assertEqual((stats["size"], stats["evictions"]), (2, 1))
+        self.assertEqual([entry["tenant"] for entry in stats["pooled"]], ["globex", "initech"])
+        # Another thread may still be using it, so its session is left to close when unreferenced
+        evicted.session.close.assert_not_called()
+
+    def test_providers_are_built_outside_the_pool_lock(self):
+        building, release, released = threading.Event(), threading.Event(), []
+
+        def create(provider_name):
+            if provider_name == "greenhouse":
+                building.set()
+                released.append(release.wait(2))
+            return MagicMock()
+
+        with patch.object(jobs_service, "_create_provider", side_effect=create), ThreadPoolExecutor(1) as executor:
+            with tenant_scope(self.registry.get("acme")):
+                slow = submit(executor, get_provider)
+            self.assertTrue(building.wait(5))
+            with tenant_scope(self.registry.get("globex")):
+                self.assertIsNotNone(get_provider())
+            release.set()
+            self.assertIsNotNone(slow.result(5))
+        # The other tenant's provider was built while the slow one was still being constructed
+        self.assertEqual(released, [True])
+        self.assertEqual(provider_pool_stats()["size"], 2)
+
+class TestTenantHandlers(TenantTestCase):
+
+    def setUp(self):
+        super().setUp()
+        reset_cache()
+        self.addCleanup(reset_cache)
+
+    def test_requests_are_served_and_counted_per_tenant(self):
+        import handler
+        acme = handler.get_jobs({"headers": {"X-Tenant-Id": "acme"}}, None)
+        globex = handler.get_jobs({"pathParameters": {"tenant": "globex"}, "headers": {}}, None)
+
+        self.assertTrue(json.loads(acme["body"])[0]["id"].startswith("gh-"))
+        self.assertEqual(json.loads(globex["body"])[0]["id"], "wk-1")
+        self.assertEqual(handler.get_jobs({"headers": {"X-Tenant-Id": "initech"}}, None)["statusCode"], 404)
+
+        usage = {entry["tenant"]: entry for entry in json.loads(handler.get_tenant_usage({}, None)["body"])["tenants"]}
+        self.assertEqual(usage["acme"]["functions"], {"get_jobs": 1})
+        self.assertEqual((usage["globex"]["requests"], usage["globex"]["errors"]), (1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
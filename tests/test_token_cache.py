@@ -0,0 +1,106 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from utils.errors import ATSError
+from utils.token_cache import AsyncTokenManager, TokenManager, clear_tokens
+
+class TestTokenManager(unittest.TestCase):
+
+    def setUp(self):
+        clear_tokens()
+
+    def _manager(self, fetch, **kwargs):
+        kwargs.setdefault("refresh_margin", 60)
+        kwargs.setdefault("cache_dir", "")
+        kwargs.setdefault("retry_backoff", 30)
+        return TokenManager(("client", "refresh"), fetch, **kwargs)
+
+    def test_refreshes_ahead_of_expiry(self):
+        fetch = MagicMock(side_effect=[("first", 30), ("second", 3600)])
+        manager = self._manager(fetch)
+
+        self.assertEqual(manager.get_token(), "first")
+        # 30s lifetime is inside the 60s margin, so the next call refreshes
+        self.assertEqual(manager.get_token(), "second")
+        self.assertEqual(manager.get_token(), "second")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_stale_token_forces_single_refresh(self):
+        fetch = MagicMock(side_effect=[("first", 3600), ("second", 3600)])
+        manager = self._manager(fetch)
+
+        self.assertEqual(manager.get_token(), "first")
+        self.assertEqual(manager.get_token(stale_token="first"), "second")
+        # A second caller reporting the same stale token reuses the new one
+        self.assertEqual(manager.get_token(stale_token="first"), "second")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_failed_refresh_keeps_valid_token(self):
+        fetch = MagicMock(side_effect=[("first", 30), ATSError("throttled", 401)])
+        manager = self._manager(fetch)
+
+        self.assertEqual(manager.get_token(), "first")
+        self.assertEqual(manager.get_token(), "first")
+        # Backoff prevents hammering the token endpoint again
+        self.assertEqual(manager.get_token(), "first")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_failed_refresh_without_token_raises(self):
+        manager = self._manager(MagicMock(side_effect=ATSError("throttled", 401)))
+        with self.assertRaises(ATSError):
+            manager.get_token()
+
+    def test_failed_refresh_without_token_fails_fast_for_waiters(self):
+        def fetch():
+            time.sleep(0.05)  # callers queue on the lock meanwhile
+            raise ATSError("throttled", 429)
+        fetch = MagicMock(side_effect=fetch)
+        manager = self._manager(fetch, failure_backoff=30)
+
+        def call():
+            try:
+                return manager.get_token()
+            except ATSError as e:
+                return e.status_code
+
+        with ThreadPoolExecutor(5) as executor:
+            results = list(executor.map(lambda _: call(), range(5)))
+        self.assertEqual(results, [429] * 5)
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_async_failed_refresh_without_token_fails_fast(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            raise ATSError("throttled", 429)
+        manager = AsyncTokenManager(("client", "refresh"), fetch, refresh_margin=60, cache_dir="", failure_backoff=30)
+
+        async def burst():
+            return await asyncio.gather(*(manager.get_token() for _ in range(5)), return_exceptions=True)
+
+        results = asyncio.run(burst())
+        self.assertEqual([e.status_code for e in results], [429] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_failure_backoff_expires(self):
+        fetch = MagicMock(side_effect=[ATSError("throttled", 429), ("fresh", 3600)])
+        manager = self._manager(fetch, failure_backoff=0)
+        with self.assertRaises(ATSError):
+            manager.get_token()
+        self.assertEqual(manager.get_token(), "fresh")
+
+    def test_persisted_token_is_reused(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self._manager(MagicMock(return_value=("persisted", 3600)), cache_dir=cache_dir).get_token()
+            clear_tokens()
+            fetch = MagicMock()
+            self.assertEqual(self._manager(fetch, cache_dir=cache_dir).get_token(), "persisted")
+            fetch.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+from services.webhook_service import WebhookService, ZohoNotification, delivery_token, verify_token
+from utils.candidate_index import CandidateIndex
+from utils.cache import ReadCache, MemoryCacheBackend, jobs_cache_key, applications_cache_key
+from utils.errors import AuthenticationError, ValidationError
+from utils.replica import ReplicaStore
+
+def _job(job_id, status, modified):
+    return {"id": job_id, "Status": status, "Modified_Time": modified}
+
+def _iso(unix_time):
+    return datetime.fromtimestamp(unix_time, timezone.utc).isoformat(timespec="seconds")
+
+class TestReplicaChanges(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.store = ReplicaStore(os.path.join(self._dir.name, "replica.sqlite3"))
+
+    def test_out_of_order_updates_keep_the_newest(self):
+        applied, stale = self.store.apply_changes("jobs", [_job("1", "Filled", "2026-01-02T10:00:00+05:30")])
+        self.assertEqual((len(applied), stale), (1, 0))
+        # Older delivery (same instant in another offset is not older) arrives late
+        applied, stale = self.store.apply_changes("jobs", [_job("1", "In-progress", "2026-01-02T04:00:00+00:00")])
+        self.assertEqual((len(applied), stale), (0, 1))
+        self.assertEqual(self.store.get("jobs", "1")["Status"], "Filled")
+        # Repeated delivery is harmless
+        self.store.apply_changes("jobs", [_job("1", "Filled", "2026-01-02T10:00:00+05:30")])
+        self.assertEqual([j["Status"] for j in self.store.iter_jobs()], ["Filled"])
+
+    def test_deletes_win_over_late_updates(self):
+        deleted_at = int(time.time()) - 3600
+        self.store.apply_changes("jobs", [_job("1", "In-progress", _iso(deleted_at - 600))])
+        removed = self.store.apply_deletes("jobs", ["1"], deleted_at=deleted_at)
+        self.assertEqual([r["id"] for r in removed], ["1"])
+
+        applied, stale = self.store.apply_changes("jobs", [_job("1", "Filled", _iso(deleted_at - 60))])
+        self.assertEqual((applied, stale), ([], 1))
+        self.assertIsNone(self.store.get("jobs", "1"))
+
+        # A change after the delete (restored record) comes back
+        applied, _ = self.store.apply_changes("jobs", [_job("1", "In-progress", _iso(deleted_at + 60))])
+        self.assertEqual(len(applied), 1)
+        self.assertIsNotNone(self.store.get("jobs", "1"))
+
+    def test_late_delete_keeps_newer_record(self):
+        deleted_at = int(time.time()) - 3600
+        self.store.apply_changes("jobs", [_job("1", "In-progress", _iso(deleted_at + 60))])
+        self.assertEqual(self.store.apply_deletes("jobs", ["1"], deleted_at=deleted_at), [])
+        self.assertIsNotNone(self.store.get("jobs", "1"))
+
+class TestZohoNotification(unittest.TestCase):
+
+    def test_parses_notification_channel_payload(self):
+        notification = ZohoNotification.parse(json.dumps({
+            "module": "JobOpenings", "operation": "update", "ids": ["1", "2"],
+            "server_time": 1767312000000, "token": "secret", "channel_id": "100"
+        }))
+        self.assertEqual((notification.module, notification.operation, notification.ids), ("JobOpenings", "update", ["1", "2"]))
+        self.assertEqual(notification.changed_at, 1767312000)
+        self.assertEqual(notification.token, "secret")
+
+    def test_parses_form_encoded_workflow_payload(self):
+        notification = ZohoNotification.parse(
+            "module=Applications&operation=insert&ids=a1,a2", "application/x-www-form-urlencoded",
+            query_params={"token": "secret"}
+        )
+        self.assertEqual(notification.ids, ["a1", "a2"])
+        self.assertEqual(notification.token, "secret")
+
+    def test_rejects_unknown_modules_and_operations(self):
+        for payload in ({"module": "Contacts", "operation": "update", "ids": ["1"]},
+                        {"module": "JobOpenings", "operation": "merge", "ids": ["1"]},
+                        {"module": "JobOpenings", "operation": "update"}):
+            with self.assertRaises(ValidationError):
+                ZohoNotification.parse(json.dumps(payload))
+
+class TestWebhookService(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.store = ReplicaStore(os.path.join(self._dir.name, "replica.sqlite3"))
+        self.cache = ReadCache(MemoryCacheBackend())
+        self.provider = MagicMock()
+        self.provider.forget_candidate_id.return_value = False
+
+        for target, value in (
+            ('services.webhook_service.get_provider', MagicMock(return_value=self.provider)),
+            ('services.webhook_service.get_replica', MagicMock(return_value=self.store)),
+            ('services.webhook_service.get_cache', MagicMock(return_value=self.cache)),
+        ):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        settings_patcher = patch('services.webhook_service.settings')
+        mock_settings = settings_patcher.start()
+        self.addCleanup(settings_patcher.stop)
+        mock_settings.ZOHO_WEBHOOK_TOKEN = "secret"
+        mock_settings.ATS_PROVIDER = "zoho"
+        self.service = WebhookService()
+
+    def _notify(self, **payload):
+        return self.service.handle_zoho(ZohoNotification.parse(json.dumps({"token": "secret", **payload})))
+
+    def test_rejects_bad_tokens_before_validating_the_payload(self):
+        import handler
+        for body in ({"module": "JobOpenings", "operation": "delete", "ids": ["1"], "token": "guess"},
+                     {"module": "Contacts", "token": "guess"}):
+            response = handler.zoho_webhook({"body": json.dumps(body), "headers": {}}, None)
+            self.assertEqual(response["statusCode"], 401)
+        self.assertEqual(delivery_token("token=secret&module=Applications", "application/x-www-form-urlencoded"), "secret")
+        with self.assertRaises(AuthenticationError):
+            verify_token(None)
+
+    def test_update_fetches_records_and_invalidates_listing(self):
+        self.cache.store(jobs_cache_key("zoho"), {"items": []})
+        self.provider.fetch_records.return_value = [_job("1", "Filled", "2026-01-02T00:00:00+00:00")]
+
+        summary = self._notify(module="JobOpenings", operation="update", ids=["1"])
+
+        self.provider.fetch_records.assert_called_once_with("JobOpenings", ["1"])
+        self.assertEqual(summary["applied"], 1)
+        self.assertEqual(self.store.get("jobs", "1")["Status"], "Filled")
+        self.assertIsNone(self.cache.peek(jobs_cache_key("zoho"), 60))
+        self.provider.forget_listing.assert_called_once_with("jobs", None)
+
+    def test_application_delete_invalidates_its_job(self):
+        self.store.apply_changes("applications", [{"id": "a1", "$Job_Opening_Id": "j1"}])
+        self.cache.store(applications_cache_key("zoho", "j1"), {"items": []})
+
+        summary = self._notify(module="Applications", operation="delete", ids=["a1"])
+
+        self.assertEqual(summary["deleted"], 1)
+        self.assertIsNone(self.cache.peek(applications_cache_key("zoho", "j1"), 60))
+        self.provider.forget_listing.assert_called_once_with("applications", "j1")
+        self.provider.fetch_records.assert_not_called()
+
+    def test_id_only_application_delete_without_replica_invalidates_every_listing(self):
+        self.cache.store(applications_cache_key("zoho", "j1"), {"items": []})
+        self.cache.store(jobs_cache_key("zoho"), {"items": []})
+        with patch('services.webhook_service.get_replica', return_value=None):
+            self._notify(module="Applications", operation="delete", ids=["a1"])
+        self.assertIsNone(self.cache.peek(applications_cache_key("zoho", "j1"), 60))
+        self.assertIsNotNone(self.cache.peek(jobs_cache_key("zoho"), 60))
+        self.provider.forget_listing.assert_called_once_with("applications", None)
+
+    def test_id_only_candidate_delete_forgets_the_id(self):
+        index = CandidateIndex("zoho:test")
+        index.put("ann@example.com", "c1")
+        self.provider.forget_candidate_id.side_effect = lambda candidate_id: index.discard_id(candidate_id) is not None
+        summary = self._notify(module="Candidates", operation="delete", ids=["c1"])
+        self.assertEqual(summary["forgotten"], 1)
+        self.assertIsNone(index.get("ann@example.com"))
+
+    def test_candidate_changes_forget_remembered_emails(self):
+        summary = self._notify(module="Candidates", operation="update", data=[{"id": "c1", "Email": "ann@example.com"}])
+        self.assertEqual(summary["forgotten"], 1)
+        self.provider.forget_candidate.assert_called_once_with("ann@example.com")
+
+if __name__ == '__main__':
+    unittest.main()
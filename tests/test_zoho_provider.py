@@ -1,20 +1,37 @@
+import json
 import unittest
+import requests
 from unittest.mock import patch, MagicMock
 from providers.zoho import ZohoProvider
-from utils.errors import ATSError
+from utils.candidate_index import CandidateIndex
+from utils.errors import ATSError, CandidateNotFoundError
+from utils.query import ListQuery
+from utils.resilience import reset_guards
+from utils.token_cache import clear_tokens
 
 class TestZohoProvider(unittest.TestCase):
 
     @patch('providers.zoho.settings')
     def setUp(self, mock_settings):
+        clear_tokens()
+        reset_guards()
         mock_settings.ZOHO_CLIENT_ID = "test_id"
         mock_settings.ZOHO_CLIENT_SECRET = "test_secret"
         mock_settings.ZOHO_REFRESH_TOKEN = "test_refresh"
         mock_settings.ZOHO_BASE_URL = "https://recruit.zoho.com/recruit/v2"
         mock_settings.ZOHO_TOKEN_URL = "https://accounts.zoho.com/oauth/v2/token"
+        mock_settings.ZOHO_PER_PAGE = 200
+        mock_settings.ZOHO_PAGE_CONCURRENCY = 2
+        mock_settings.ZOHO_CONDITIONAL_GET = True
+        mock_settings.ZOHO_BATCH_SIZE = 2
+        mock_settings.ZOHO_SEARCH_CRITERIA_MAX = 2
+        mock_settings.ZOHO_CRITERIA_MAX_LENGTH = 1000
+        mock_settings.ZOHO_SNAPSHOT_MAX_AGE = 900
+        mock_settings.ZOHO_SNAPSHOT_MAX_ENTRIES = 8
         self.provider = ZohoProvider()
+        self.provider.candidate_index = CandidateIndex("test")
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_get_access_token_success(self, mock_post):
         mock_response = MagicMock()
         mock_response.json.return_value = {"access_token": "mock_access_token"}
@@ -25,7 +42,7 @@ class TestZohoProvider(unittest.TestCase):
         self.assertEqual(token, "mock_access_token")
         mock_post.assert_called_once()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     @patch('providers.zoho.ZohoProvider._get_access_token')
     def test_get_jobs_success(self, mock_token, mock_get):
         mock_token.return_value = "mock_access_token"
@@ -48,7 +65,59 @@ class TestZohoProvider(unittest.TestCase):
         self.assertEqual(jobs[0]['title'], "Software Engineer")
         self.assertEqual(jobs[0]['status'], "OPEN")
 
-    @patch('requests.post')
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_get_jobs_follows_more_records(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+
+        def page_response(url, headers=None, params=None, timeout=None):
+            page = params["page"]
+            response = MagicMock(status_code=200, text="{}")
+            response.json.return_value = {
+                "data": [{"id": str(page), "Posting_Title": f"Job {page}", "Status": "In-progress"}],
+                "info": {"more_records": page < 3}
+            }
+            return response
+        mock_get.side_effect = page_response
+
+        jobs = self.provider.get_jobs()
+        self.assertEqual([j["id"] for j in jobs], ["1", "2", "3"])
+        self.assertFalse(jobs.truncated)
+        self.assertEqual(mock_get.call_args_list[0].kwargs["params"]["per_page"], 200)
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_get_jobs_reuses_snapshot_on_304(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+        listing = MagicMock(status_code=200, text="{}")
+        listing.json.return_value = {"data": [{"id": "1", "Posting_Title": "Job", "Status": "In-progress"}]}
+        not_modified = MagicMock(status_code=304, text="")
+        mock_get.side_effect = [listing, not_modified]
+
+        first = self.provider.get_jobs()
+        second = self.provider.get_jobs()
+
+        self.assertEqual(second, first)
+        probe = mock_get.call_args_list[1]
+        self.assertIn("If-Modified-Since", probe.kwargs["headers"])
+        self.assertEqual(probe.kwargs["params"]["per_page"], 1)
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_get_jobs_refetches_when_modified(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+        old = MagicMock(status_code=200, text="{}")
+        old.json.return_value = {"data": [{"id": "1", "Posting_Title": "Old"}]}
+        changed = MagicMock(status_code=200, text="{}")
+        changed.json.return_value = {"data": [{"id": "1", "Posting_Title": "New"}]}
+        mock_get.side_effect = [old, changed, changed]
+
+        self.provider.get_jobs()
+        jobs = self.provider.get_jobs()
+        self.assertEqual(jobs[0]["title"], "New")
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('requests.Session.post')
     @patch('providers.zoho.ZohoProvider._get_access_token')
     def test_create_candidate_success(self, mock_token, mock_post):
         mock_token.return_value = "mock_access_token"
@@ -68,5 +137,273 @@ class TestZohoProvider(unittest.TestCase):
         candidate_id = self.provider.create_candidate(candidate_data)
         self.assertEqual(candidate_id, "cand_123")
 
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_create_candidate_remembers_resolved_duplicate(self, mock_token, mock_post, mock_get):
+        mock_token.return_value = "mock_access_token"
+        duplicate = MagicMock(status_code=200)
+        duplicate.json.return_value = {"data": [{"status": "error", "code": "DUPLICATE_DATA", "message": "Duplicate values"}]}
+        mock_post.return_value = duplicate
+        found = MagicMock(status_code=200)
+        found.json.return_value = {"data": [{"id": "cand_9", "Email": "john@example.com"}]}
+        mock_get.return_value = found
+
+        first = self.provider.create_candidate({"name": "John Doe", "email": "John@Example.com"})
+        second = self.provider.create_candidate({"name": "John Doe", "email": " john@example.com"})
+
+        self.assertEqual((first, second), ("cand_9", "cand_9"))
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.Session.put')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_attach_reports_missing_candidate(self, mock_token, mock_put):
+        mock_token.return_value = "mock_access_token"
+        rejected = MagicMock(status_code=200)
+        rejected.json.return_value = {"data": [{
+            "status": "error", "code": "INVALID_DATA", "message": "the id given seems to be invalid",
+            "details": {"api_name": "ids"}
+        }]}
+        mock_put.return_value = rejected
+
+        with self.assertRaises(CandidateNotFoundError):
+            self.provider.attach_candidate_to_job("gone_1", "job_1")
+
+    @patch('requests.Session.post')
+    def test_access_token_is_cached_across_instances(self, mock_post):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"access_token": "shared_token", "expires_in": 3600}
+        mock_response.status_code = 200
+        mock_post.return_value = mock_response
+
+        self.assertEqual(self.provider._get_access_token(), "shared_token")
+        self.assertEqual(self.provider._get_access_token(), "shared_token")
+        mock_post.assert_called_once()
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_request_retries_once_on_401(self, mock_token, mock_get):
+        mock_token.side_effect = ["expired_token", "fresh_token"]
+        unauthorized = MagicMock(status_code=401)
+        ok = MagicMock(status_code=200)
+        mock_get.side_effect = [unauthorized, ok]
+
+        response = self.provider._request("get", "https://recruit.zoho.com/recruit/v2/JobOpenings")
+        self.assertIs(response, ok)
+        mock_token.assert_called_with(stale_token="expired_token")
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"]["Authorization"],
+            "Zoho-oauthtoken fresh_token"
+        )
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_request_retries_idempotent_calls_on_429(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "0"})
+        ok = MagicMock(status_code=200)
+        mock_get.side_effect = [throttled, ok]
+
+        response = self.provider._request("get", "https://recruit.zoho.com/recruit/v2/JobOpenings")
+        self.assertIs(response, ok)
+        self.assertEqual(self.provider.guard.snapshot()["retries"], 1)
+
+    @patch('requests.Session.post')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_request_does_not_retry_post(self, mock_token, mock_post):
+        mock_token.return_value = "mock_access_token"
+        mock_post.return_value = MagicMock(status_code=503, headers={})
+
+        response = self.provider._request("post", "https://recruit.zoho.com/recruit/v2/Candidates", data="{}")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_create_candidates_chunks_and_resolves_duplicates(self, mock_token, mock_post, mock_get):
+        mock_token.return_value = "mock_access_token"
+        first_chunk = MagicMock(status_code=200)
+        first_chunk.json.return_value = {"data": [
+            {"status": "success", "details": {"id": "c1"}},
+            {"status": "error", "code": "DUPLICATE_DATA", "message": "Duplicate values"}
+        ]}
+        second_chunk = MagicMock(status_code=200)
+        second_chunk.json.return_value = {"data": [
+            {"status": "error", "code": "DUPLICATE_DATA", "message": "Duplicate values"}
+        ]}
+        mock_post.side_effect = [first_chunk, second_chunk]
+        search = MagicMock(status_code=200, text="{}")
+        search.json.return_value = {"data": [{"id": "c2", "Email": "B@example.com"}]}
+        mock_get.return_value = search
+
+        results = self.provider.create_candidates([
+            {"name": "A A", "email": "a@example.com"},
+            {"name": "B B", "email": "b@example.com"},
+            {"name": "C C", "email": "c@example.com"},
+        ])
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(mock_get.call_count, 1)
+        criteria = mock_get.call_args.kwargs["params"]["criteria"]
+        self.assertEqual(criteria, "((Email:equals:b@example.com)or(Email:equals:c@example.com))")
+        self.assertEqual(results[0], {"status": "success", "id": "c1"})
+        self.assertEqual(results[1], {"status": "success", "id": "c2"})
+        self.assertEqual(results[2]["status"], "error")
+        self.assertEqual(results[2]["status_code"], 404)
+
+    @patch('requests.Session.get')
+    @patch('requests.Session.post')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_failed_duplicate_search_reports_the_upstream_status(self, mock_token, mock_post, mock_get):
+        mock_token.return_value = "mock_access_token"
+        duplicates = MagicMock(status_code=200)
+        duplicates.json.return_value = {"data": [
+            {"status": "error", "code": "DUPLICATE_DATA", "message": "Duplicate values"}
+        ] * 2}
+        mock_post.return_value = duplicates
+        throttled = MagicMock(status_code=429, headers={}, text="{}")
+        throttled.raise_for_status.side_effect = requests.exceptions.HTTPError("429", response=throttled)
+        mock_get.return_value = throttled
+        self.provider.guard.max_retries = 0
+
+        results = self.provider.create_candidates([
+            {"name": "A A", "email": "a(1)@example.com"},
+            {"name": "B B", "email": "b,2@example.com"},
+        ])
+
+        criteria = mock_get.call_args.kwargs["params"]["criteria"]
+        self.assertEqual(criteria, r"((Email:equals:a\(1\)@example.com)or(Email:equals:b\,2@example.com))")
+        self.assertEqual([r["status_code"] for r in results], [429, 429])
+        self.assertTrue(all("Zoho Search Error" in r["message"] for r in results))
+
+    @patch('requests.Session.put')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_attach_candidates_groups_by_job(self, mock_token, mock_put):
+        mock_token.return_value = "mock_access_token"
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"data": [{"status": "success"}]}
+        mock_put.return_value = ok
+
+        results = self.provider.attach_candidates([("c1", "j1"), ("c2", "j2"), ("c3", "j1")])
+
+        self.assertEqual(mock_put.call_count, 2)
+        payload = json.loads(mock_put.call_args_list[0].kwargs["data"])
+        self.assertEqual(payload["data"][0]["ids"], ["c1", "c3"])
+        self.assertEqual(payload["data"][0]["jobids"], ["j1"])
+        self.assertEqual([r["id"] for r in results], ["c1_j1", "c2_j2", "c3_j1"])
+
+    @patch('requests.Session.put')
+    @patch('requests.Session.post')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_batch_reuses_indexed_ids_and_reports_stale_ones_as_missing(self, mock_token, mock_post, mock_put):
+        mock_token.return_value = "mock_access_token"
+        self.provider.candidate_index.put("a@example.com", "stale")
+        self.assertEqual(self.provider.create_candidates([{"name": "A A", "email": "a@example.com"}]), [{"status": "success", "id": "stale"}])
+        mock_post.assert_not_called()
+
+        rejected = MagicMock(status_code=200)
+        rejected.json.return_value = {"data": [
+            {"status": "error", "code": "INVALID_DATA", "message": "the id given seems to be invalid", "details": {"api_name": "ids"}}
+        ]}
+        mock_put.return_value = rejected
+        self.assertEqual(self.provider.attach_candidates([("stale", "j1")])[0]["status_code"], 404)
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_get_applications_for_jobs_combines_criteria(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+
+        def search(url, headers=None, params=None, timeout=None):
+            if "j3" in params["criteria"]:
+                raise requests.exceptions.ConnectionError("connection reset")
+            response = MagicMock(status_code=200, text="{}")
+            response.json.return_value = {"data": [
+                {"id": "a1", "Full_Name": "Ann", "$Job_Opening_Id": "j1"},
+                {"id": "a2", "Full_Name": "Bob", "Job_Opening_Name": {"id": "j2"}},
+            ]}
+            return response
+        mock_get.side_effect = search
+
+        results = self.provider.get_applications_for_jobs(["j1", "j2", "j3"])
+
+        criteria = [c.kwargs["params"]["criteria"] for c in mock_get.call_args_list]
+        self.assertIn("(($Job_Opening_Id:equals:j1)or($Job_Opening_Id:equals:j2))", criteria)
+        self.assertIn("($Job_Opening_Id:equals:j3)", criteria)
+        self.assertEqual([a["id"] for a in results["j1"]["applications"]], ["a1"])
+        self.assertEqual([a["id"] for a in results["j2"]["applications"]], ["a2"])
+        self.assertIsNone(results["j1"]["error"])
+        self.assertEqual(results["j3"]["applications"], [])
+        self.assertEqual(results["j3"]["error"]["status_code"], 500)
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_query_jobs_pushes_filters_into_search(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+        response = MagicMock(status_code=200, text="{}")
+        response.json.return_value = {"data": [
+            {"id": "1", "Posting_Title": "Engineer", "City": "Berlin", "Status": "In-progress",
+             "Modified_Time": "2024-02-01T10:00:00+00:00"},
+            {"id": "2", "Posting_Title": "Designer", "City": "Berlin", "Status": "In-progress",
+             "Modified_Time": "2023-12-01T10:00:00+00:00"},
+        ]}
+        mock_get.return_value = response
+
+        query = ListQuery.from_params(
+            {"status": "OPEN", "location": "Berlin", "updated_since": "2024-01-01T00:00:00Z", "fields": "title"}, "jobs"
+        )
+        jobs = list(self.provider.query_jobs(query))
+
+        url = mock_get.call_args.args[0]
+        params = mock_get.call_args.kwargs["params"]
+        self.assertTrue(url.endswith("/JobOpenings/search"))
+        self.assertEqual(params["criteria"], "((Status:equals:In-progress)and(City:equals:Berlin)"
+                                             "and(Modified_Time:greater_equal:2024-01-01T00:00:00+00:00))")
+        # The projection keeps what the filters are re-evaluated on
+        self.assertEqual(params["fields"], "Posting_Title,Status,City,Modified_Time")
+        # Records Zoho matched loosely are still filtered locally
+        self.assertEqual(jobs, [{"id": "1", "title": "Engineer"}])
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_query_jobs_projects_fields_upstream(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+        response = MagicMock(status_code=200, text="{}")
+        response.json.return_value = {"data": [{"id": "1", "Posting_Title": "Engineer"}]}
+        mock_get.return_value = response
+
+        jobs = list(self.provider.query_jobs(ListQuery(fields=["title"])))
+
+        self.assertTrue(mock_get.call_args.args[0].endswith("/JobOpenings"))
+        self.assertEqual(mock_get.call_args.kwargs["params"]["fields"], "Posting_Title")
+        self.assertEqual(jobs, [{"id": "1", "title": "Engineer"}])
+
+    @patch('requests.Session.get')
+    @patch('providers.zoho.ZohoProvider._get_access_token')
+    def test_searches_of_both_modules_project_fields(self, mock_token, mock_get):
+        mock_token.return_value = "mock_access_token"
+        response = MagicMock(status_code=200, text="{}")
+        response.json.return_value = {"data": [{"id": "a1", "Email": "ann@example.com", "Application_Status": "Hired"}]}
+        mock_get.return_value = response
+
+        query = ListQuery(fields=["email"], status="Hired")
+        applications = list(self.provider.query_applications("j1", query))
+        url, params = mock_get.call_args.args[0], mock_get.call_args.kwargs["params"]
+        self.assertTrue(url.endswith("/Applications/search"))
+        self.assertEqual(params["fields"], "Email,Application_Status")
+        self.assertEqual(applications, [{"id": "a1", "email": "ann@example.com"}])
+
+        list(self.provider.query_jobs(ListQuery(fields=["title"], status="OPEN")))
+        url, params = mock_get.call_args.args[0], mock_get.call_args.kwargs["params"]
+        self.assertTrue(url.endswith("/JobOpenings/search"))
+        self.assertEqual(params["fields"], "Posting_Title,Status")
+
+    def test_criteria_values_are_escaped(self):
+        from providers.zoho import criteria_value
+        self.assertEqual(criteria_value("Paris (FR), HQ"), "Paris \\(FR\\)\\, HQ")
+        groups = self.provider._group_job_criteria(["j(1)", "j,2"])
+        self.assertEqual(groups, [("(($Job_Opening_Id:equals:j\\(1\\))or($Job_Opening_Id:equals:j\\,2))", ["j(1)", "j,2"])])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,16 @@
+import asyncio
+
+# One event loop per container, reused across warm invocations so pooled async
+# clients (which are bound to the loop they were first used on) stay valid.
+_loop = None
+
+def get_event_loop():
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+def run(coro):
+    """Run a coroutine to completion on the container's event loop."""
+    return get_event_loop().run_until_complete(coro)
@@ -0,0 +1,338 @@
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config.settings import settings
+from utils.deadline import detach_deadline
+from utils.pagination import PaginatedList
+from utils.records import json_default
+
+class MemoryCacheBackend:
+    """In-process LRU store. Entries live as long as the warm container."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class FileCacheBackend:
+    """
+    One JSON file per key under a directory (e.g. /tmp), shared by every
+    invocation in the container. Recency is tracked with file mtimes.
+    """
+
+    def __init__(self, directory, max_entries=256):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:40]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        if data.get("key") != key:
+            return None
+        return {"value": data["value"], "stored_at": data["stored_at"]}
+
+    def set(self, key, entry):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"key": key, "value": entry["value"], "stored_at": entry["stored_at"]}, f, default=json_default)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def delete_prefix(self, prefix):
+        # File names are hashed, so each entry's stored key is read back
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as f:
+                    key = json.load(f).get("key")
+                if isinstance(key, str) and key.startswith(prefix):
+                    os.remove(path)
+            except (OSError, ValueError):
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+            if len(files) <= self.max_entries:
+                return
+            files.sort()
+            for _, path in files[:len(files) - self.max_entries]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+class SQLiteCacheBackend:
+    """Single SQLite file store with LRU eviction on last access time."""
+
+    def __init__(self, path, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed_at ON cache (accessed_at)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return {"value": json.loads(row[0]), "stored_at": row[1]}
+
+    def set(self, key, entry):
+        value = json.dumps(entry["value"], default=json_default)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, entry["stored_at"], time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+class ReadCache:
+    """
+    TTL cache with stale-while-revalidate for provider reads.
+
+    - Fresh entries (younger than `ttl`) are served directly.
+    - Stale entries (within `stale_ttl` after expiry) are served immediately while
+      a single background refresh reloads them.
+    - Anything older, or missing, is loaded synchronously.
+    """
+
+    def __init__(self, backend, stale_ttl=0):
+        self.backend = backend
+        self.stale_ttl = stale_ttl
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0, "invalidations": 0}
+
+    def get_or_load(self, key, loader, ttl):
+        """
+        Return the cached value for `key`, calling `loader()` when it is missing or too old.
+        Loaded values must be JSON serializable for the file and SQLite backends.
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < ttl:
+                self._count("hits")
+                return entry["value"]
+            if age < ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, loader)
+                return entry["value"]
+
+        self._count("misses")
+        return self._load(key, loader)
+
+    def peek(self, key, ttl):
+        """Return a fresh cached value without loading, or None. Counts as a hit or miss."""
+        entry = self.backend.get(key)
+        if entry is not None and time.time() - entry["stored_at"] < ttl:
+            self._count("hits")
+            return entry["value"]
+        self._count("misses")
+        return None
+
+    def store(self, key, value):
+        """Store a value loaded outside get_or_load (e.g. as part of a bulk fetch)."""
+        self.backend.set(key, {"value": value, "stored_at": time.time()})
+
+    def invalidate(self, key):
+        self._count("invalidations")
+        self.backend.delete(key)
+
+    def invalidate_prefix(self, prefix):
+        """Drop every entry whose key starts with `prefix` (e.g. all of an account's application listings)."""
+        self._count("invalidations")
+        self.backend.delete_prefix(prefix)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+        stats["backend"] = type(self.backend).__name__
+        return stats
+
+    def _load(self, key, loader):
+        value = loader()
+        self.backend.set(key, {"value": value, "stored_at": time.time()})
+        return value
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key, loader)
+                self._count("refreshes")
+            except Exception as e:
+                # Keep serving the stale copy; the next request past the stale window reloads synchronously
+                self._count("refresh_errors")
+                print(f"Warning: Background cache refresh failed for {key}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # The refresh runs with the caller's context (tenant settings, trace), but not
+        # its deadline: it may outlive the request, and a cut-short copy must not replace a full one
+        context = contextvars.copy_context()
+        context.run(detach_deadline)
+        threading.Thread(target=context.run, args=(refresh,), name=f"cache-refresh-{key}", daemon=True).start()
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+def cached_list(cache, key, loader, ttl):
+    """
+    Cache a provider listing, keeping its pagination truncation flag. Listings cut
+    short by the request deadline are returned but not kept.
+
+    :param loader: Callable returning a list (or PaginatedList) of normalized records.
+    :return: A PaginatedList.
+    """
+    def load():
+        items = loader()
+        return {"items": list(items), "truncated": getattr(items, "truncated", False), "partial": getattr(items, "partial", False)}
+
+    data = cache.get_or_load(key, load, ttl)
+    if data.get("partial"):
+        cache.invalidate(key)
+    return PaginatedList(data["items"], truncated=data["truncated"], partial=data.get("partial", False))
+
+def jobs_cache_key(provider_name):
+    return f"jobs:{_account_scope(provider_name)}"
+
+def applications_cache_key(provider_name, job_id):
+    return f"applications:{_account_scope(provider_name)}:{job_id}"
+
+def _account_scope(provider_name):
+    # Tenants share the container's cache, so their listings are keyed apart
+    return f"{settings.TENANT_ID}/{provider_name}" if settings.TENANT_ID else provider_name
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Return the process-wide read cache, or None when CACHE_BACKEND is 'none'."""
+    global _cache
+    if _cache is None and settings.CACHE_BACKEND != "none":
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReadCache(_build_backend(settings.CACHE_BACKEND), stale_ttl=settings.CACHE_STALE_TTL)
+    return _cache
+
+def reset_cache():
+    """Drop the process-wide cache so the next get_cache() rebuilds it from settings."""
+    global _cache
+    with _cache_lock:
+        _cache = None
+
+def _build_backend(name):
+    if name == "memory":
+        return MemoryCacheBackend(settings.CACHE_MAX_ENTRIES)
+    if name == "file":
+        return FileCacheBackend(settings.CACHE_DIR, settings.CACHE_MAX_ENTRIES)
+    if name == "sqlite":
+        return SQLiteCacheBackend(settings.CACHE_SQLITE_PATH, settings.CACHE_MAX_ENTRIES)
+    raise ValueError(f"Unsupported CACHE_BACKEND: {name}")
@@ -0,0 +1,115 @@
+import threading
+import time
+from config.settings import settings
+from utils.cache import MemoryCacheBackend, SQLiteCacheBackend
+
+def normalize_email(email):
+    """Canonical form used as the index key (ATS email matching is case-insensitive)."""
+    if not isinstance(email, str):
+        return None
+    return email.strip().lower() or None
+
+class CandidateIndex:
+    """
+    Bounded email -> candidate id map, so repeat applicants skip the create and
+    duplicate-search round trips. A small in-memory LRU fronts an optional
+    persistent backend shared by every index in the container. Each id also maps
+    back to its email, so id-only change notifications can forget it.
+    """
+
+    def __init__(self, namespace, backend=None, memory_entries=1024):
+        """
+        :param namespace: Prefix keeping provider accounts apart, e.g. "zoho:<client_id>".
+        :param backend: Persistent cache backend (get/set/delete), or None for memory only.
+        :param memory_entries: Size of the in-memory LRU in front of the backend.
+        """
+        self.namespace = namespace
+        self.backend = backend
+        self._memory = MemoryCacheBackend(memory_entries)
+
+    def get(self, email):
+        key = self._key(email)
+        if key is None:
+            return None
+        entry = self._memory.get(key)
+        if entry is None and self.backend is not None:
+            entry = self.backend.get(key)
+            if entry is not None:
+                self._memory.set(key, entry)
+        return entry["value"] if entry is not None else None
+
+    def put(self, email, candidate_id):
+        key = self._key(email)
+        if key is None or not candidate_id:
+            return
+        now = time.time()
+        self._set(key, {"value": str(candidate_id), "stored_at": now})
+        self._set(self._id_key(candidate_id), {"value": normalize_email(email), "stored_at": now})
+
+    def discard(self, email):
+        key = self._key(email)
+        if key is None:
+            return
+        candidate_id = self.get(email)
+        self._delete(key)
+        if candidate_id:
+            self._delete(self._id_key(candidate_id))
+
+    def discard_id(self, candidate_id):
+        """
+        Forget a candidate id and the email it was remembered for.
+        :return: The forgotten email, or None when the id was not indexed.
+        """
+        if not candidate_id:
+            return None
+        id_key = self._id_key(candidate_id)
+        entry = self._memory.get(id_key) or (self.backend.get(id_key) if self.backend is not None else None)
+        self._delete(id_key)
+        email = entry["value"] if entry is not None else None
+        # Only drop the email if it still points at this id (it may have been re-created since)
+        if email and self.get(email) == str(candidate_id):
+            self._delete(self._key(email))
+        return email
+
+    def _set(self, key, entry):
+        self._memory.set(key, entry)
+        if self.backend is not None:
+            self.backend.set(key, entry)
+
+    def _delete(self, key):
+        self._memory.delete(key)
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def _key(self, email):
+        email = normalize_email(email)
+        return f"{self.namespace}:{email}" if email else None
+
+    def _id_key(self, candidate_id):
+        # Normalized emails always contain "@", so "id:<id>" cannot collide with one
+        return f"{self.namespace}:id:{candidate_id}"
+
+_backend = None
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_candidate_index(namespace):
+    """Return the process-wide index for a provider account, or None when CANDIDATE_INDEX_BACKEND is 'none'."""
+    global _backend
+    if settings.CANDIDATE_INDEX_BACKEND == "none":
+        return None
+    with _indexes_lock:
+        index = _indexes.get(namespace)
+        if index is None:
+            if _backend is None and settings.CANDIDATE_INDEX_BACKEND == "sqlite":
+                _backend = SQLiteCacheBackend(settings.CANDIDATE_INDEX_PATH, settings.CANDIDATE_INDEX_MAX_ENTRIES)
+            index = _indexes[namespace] = CandidateIndex(
+                namespace, backend=_backend, memory_entries=settings.CANDIDATE_INDEX_MEMORY_ENTRIES
+            )
+        return index
+
+def reset_candidate_indexes():
+    global _backend
+    with _indexes_lock:
+        _indexes.clear()
+        _backend = None
@@ -0,0 +1,110 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from functools import wraps
+from config.settings import settings
+from utils.errors import UpstreamTimeoutError
+from utils.telemetry import event as trace_event
+
+# The running invocation's deadline, if any. Like the trace, worker threads see it
+# when work is submitted through telemetry.submit, and asyncio tasks inherit it.
+_current = contextvars.ContextVar("ats_deadline", default=None)
+
+class Deadline:
+    """
+    When an invocation must stop calling the ATS to still answer before Lambda
+    times it out. `partial` is set once a listing was cut short because of it.
+    """
+
+    __slots__ = ("expires_at", "partial")
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+        self.partial = False
+
+    def remaining(self):
+        return self.expires_at - time.monotonic()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+def start_deadline(context):
+    """
+    A Deadline for a Lambda invocation: its remaining time less DEADLINE_MARGIN_MS, which
+    is kept for encoding the response. None without a Lambda context or when disabled.
+    """
+    if not settings.DEADLINE_ENABLED or not hasattr(context, "get_remaining_time_in_millis"):
+        return None
+    return Deadline((context.get_remaining_time_in_millis() - settings.DEADLINE_MARGIN_MS) / 1000)
+
+@contextmanager
+def deadline_scope(deadline):
+    """Make `deadline` the current invocation's deadline for the duration of the block."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+def current_deadline():
+    return _current.get()
+
+def time_left():
+    """Seconds until the current deadline (never negative), or None when there is none."""
+    deadline = _current.get()
+    return None if deadline is None else max(deadline.remaining(), 0.0)
+
+def past_deadline():
+    """True when the current invocation has run out of time for upstream calls."""
+    deadline = _current.get()
+    return deadline is not None and deadline.expired()
+
+def within_deadline(seconds):
+    """`seconds`, shortened to the time left before the current deadline."""
+    left = time_left()
+    return seconds if left is None else min(seconds, left)
+
+def request_timeout():
+    """
+    (connect, read) timeouts for one upstream HTTP call: HTTP_CONNECT_TIMEOUT and
+    HTTP_READ_TIMEOUT, shortened to the time left before the deadline.
+    :raises UpstreamTimeoutError: When the deadline has already passed.
+    """
+    left = time_left()
+    if left is not None and left <= 0:
+        raise UpstreamTimeoutError("Out of time for calling the ATS before the request deadline.")
+    return within_deadline(settings.HTTP_CONNECT_TIMEOUT), within_deadline(settings.HTTP_READ_TIMEOUT)
+
+def mark_partial(reason, **fields):
+    """Record that a listing stopped early because the deadline was reached."""
+    deadline = _current.get()
+    if deadline is None:
+        return
+    if not deadline.partial:
+        print(f"Warning: Returning a partial result; the request deadline was reached ({reason}).")
+    deadline.partial = True
+    trace_event("deadline.partial", reason=reason, **fields)
+
+def detach_deadline():
+    """Drop the deadline from the current context, for work that outlives the request (e.g. background refreshes)."""
+    _current.set(None)
+
+def deadline_aware(handler):
+    """
+    Run a Lambda handler under a deadline taken from its context, so upstream calls,
+    retries and pagination stop in time to return what was fetched. Partial
+    responses carry an X-Result-Partial header.
+    """
+
+    @wraps(handler)
+    def wrapper(event, context):
+        deadline = start_deadline(context)
+        if deadline is None:
+            return handler(event, context)
+        with deadline_scope(deadline):
+            response = handler(event, context)
+        if deadline.partial and response.get("statusCode", 500) < 400:
+            response.setdefault("headers", {})["X-Result-Partial"] = "true"
+        return response
+
+    return wrapper
@@ -20,7 +20,33 @@ class ResourceNotFoundError(ATSError):
     def __init__(self, message="Resource not found in ATS."):
         super().__init__(message, status_code=404)
 
+class TenantNotFoundError(ATSError):
+    """Raised when a request names a tenant that is not configured."""
+    def __init__(self, tenant_id):
+        super().__init__(f"Unknown tenant '{tenant_id}'.", status_code=404)
+
 class ValidationError(ATSError):
     """Raised when input validation fails."""
     def __init__(self, message="Validation error."):
         super().__init__(message, status_code=400)
+
+class CircuitOpenError(ATSError):
+    """Raised when calls to an ATS are short-circuited because it keeps failing."""
+    def __init__(self, provider, retry_in):
+        super().__init__(f"ATS provider '{provider}' is temporarily unavailable; retry in {retry_in:.0f}s.", status_code=503)
+
+class UpstreamTimeoutError(ATSError):
+    """Raised when an ATS read does not complete in time."""
+    def __init__(self, message="Timed out waiting for the ATS."):
+        super().__init__(message, status_code=504)
+
+class SubmissionQueueUnavailableError(ATSError):
+    """Raised when async submission is requested but no usable submission queue is configured."""
+    def __init__(self, message):
+        super().__init__(message, status_code=503)
+
+class CandidateNotFoundError(ResourceNotFoundError):
+    """Raised when the ATS reports that a known candidate id no longer exists."""
+    def __init__(self, candidate_id):
+        super().__init__(f"Candidate {candidate_id} no longer exists in ATS.")
+        self.candidate_id = candidate_id
@@ -0,0 +1,38 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.settings import settings
+
+def build_session(pool_connections=None, pool_maxsize=None, max_retries=None, pool_block=None):
+    """
+    Build a requests.Session with a tuned keep-alive connection pool.
+
+    Sessions are meant to live as long as the provider that owns them, so a warm
+    Lambda container reuses open TCP/TLS connections instead of handshaking on
+    every upstream call. Retries here only cover connection setup failures; HTTP
+    status codes are left to the caller.
+
+    :param pool_connections: Number of per-host pools to cache.
+    :param pool_maxsize: Maximum keep-alive connections per host.
+    :param max_retries: Connect/read retries for failed connection attempts.
+    :param pool_block: Block when the per-host pool is exhausted instead of opening extra connections.
+    :return: A configured requests.Session.
+    """
+    retries = Retry(
+        total=settings.HTTP_MAX_RETRIES if max_retries is None else max_retries,
+        connect=settings.HTTP_MAX_RETRIES if max_retries is None else max_retries,
+        read=0,
+        status=0,
+        backoff_factor=0.1,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or settings.HTTP_POOL_MAXSIZE,
+        max_retries=retries,
+        pool_block=settings.HTTP_POOL_BLOCK if pool_block is None else pool_block
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,47 +1,262 @@
-def paginate_all(fetch_page_func, start_page=1, **kwargs):
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import islice
+from config.settings import settings
+from utils.deadline import past_deadline, time_left, mark_partial
+from utils.errors import ATSError, UpstreamTimeoutError
+from utils.telemetry import submit
+
+class PaginatedList(list):
+    """
+    A list of paginated items that also records how pagination ended.
+
+    `truncated` is True when the page limit was reached while the ATS still
+    reported more records, so callers can surface it instead of silently
+    returning a partial dataset. `partial` is True when the request deadline
+    stopped pagination early.
+    """
+
+    def __init__(self, items=(), truncated=False, pages=0, partial=False):
+        super().__init__(items)
+        self.truncated = truncated
+        self.pages = pages
+        self.partial = partial
+
+class PageStream:
+    """
+    Lazily iterates over the pages (or items) of a paginated ATS resource.
+
+    The first page is fetched on its own. If the ATS reports more records, up to
+    `concurrency` following pages are fetched ahead on a bounded thread pool, so
+    at most that many pages are held in memory at once. Pages are yielded in page
+    order, and iteration ends when a page reports no more records rather than when
+    a page comes back empty.
+
+    After iteration, `truncated` is True if the page limit was reached while the
+    ATS still reported more records. No new page is started once the request
+    deadline has passed (see utils.deadline); pages already fetched are yielded
+    and `partial` is set instead of failing the listing.
+    """
+
+    def __init__(self, fetch_page_func, start_page=1, concurrency=1, max_pages=None, flatten=False, **kwargs):
+        """
+        :param fetch_page_func: Function that takes (page, **kwargs) and returns (items, more_records).
+        :param start_page: The first page index.
+        :param concurrency: Maximum number of pages fetched at the same time.
+        :param max_pages: Maximum number of pages to fetch (defaults to PAGINATION_MAX_PAGES).
+        :param flatten: Yield individual items instead of page lists.
+        :param kwargs: Additional arguments for fetch_page_func.
+        """
+        self.fetch_page_func = fetch_page_func
+        self.start_page = start_page
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages or settings.PAGINATION_MAX_PAGES
+        self.flatten = flatten
+        self.kwargs = kwargs
+        self.truncated = False
+        self.partial = False
+        self.pages = 0
+
+    def __iter__(self):
+        for items in self._iter_pages():
+            if self.flatten:
+                yield from items
+            else:
+                yield items
+
+    def _iter_pages(self):
+        last_page = self.start_page + self.max_pages - 1
+
+        items, more_records = self.fetch_page_func(page=self.start_page, **self.kwargs)
+        self.pages = 1
+        yield items
+        if not more_records:
+            return
+
+        if self.start_page >= last_page:
+            self._mark_truncated()
+            return
+
+        next_page = self.start_page + 1
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        in_flight = deque()
+        try:
+            while True:
+                # Keep the prefetch window full without going past the page limit or the deadline
+                while len(in_flight) < self.concurrency and next_page <= last_page and not past_deadline():
+                    in_flight.append(submit(executor, self.fetch_page_func, page=next_page, **self.kwargs))
+                    next_page += 1
+
+                if not in_flight:
+                    if next_page <= last_page:
+                        self._mark_partial()
+                    else:
+                        self._mark_truncated()
+                    return
+
+                try:
+                    items, more_records = in_flight.popleft().result(timeout=time_left())
+                except (FutureTimeoutError, ATSError) as e:
+                    # A page cut off by the deadline ends the listing; other failures still raise
+                    if not (past_deadline() or isinstance(e, UpstreamTimeoutError)):
+                        raise
+                    self._mark_partial()
+                    return
+                self.pages += 1
+                yield items
+
+                if not more_records:
+                    return
+        finally:
+            # Pages fetched past the end, after an error, or after the consumer
+            # stopped early are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _mark_truncated(self):
+        print(f"Warning: Pagination stopped after {self.pages} pages; the ATS reported more records.")
+        self.truncated = True
+
+    def _mark_partial(self):
+        mark_partial("pagination", pages=self.pages)
+        self.partial = True
+
+def iter_pages(fetch_page_func, start_page=1, concurrency=1, max_pages=None, **kwargs):
+    """Lazily yield page lists in order. See PageStream."""
+    return PageStream(fetch_page_func, start_page, concurrency, max_pages, flatten=False, **kwargs)
+
+def iter_items(fetch_page_func, start_page=1, concurrency=1, max_pages=None, **kwargs):
+    """Lazily yield individual items across all pages in order. See PageStream."""
+    return PageStream(fetch_page_func, start_page, concurrency, max_pages, flatten=True, **kwargs)
+
+def paginate_all(fetch_page_func, start_page=1, concurrency=1, max_pages=None, **kwargs):
     """
     Generic helper to fetch all pages from an ATS API.
-    
-    :param fetch_page_func: Function that takes (page, **kwargs) and returns a list of items.
+
+    :param fetch_page_func: Function that takes (page, **kwargs) and returns (items, more_records).
     :param start_page: The first page index.
+    :param concurrency: Maximum number of pages fetched at the same time.
+    :param max_pages: Maximum number of pages to fetch (defaults to PAGINATION_MAX_PAGES).
     :param kwargs: Additional arguments for fetch_page_func.
-    :return: A combined list of all items.
-    """
-    all_items = []
-    current_page = start_page
-    
-    while True:
-        items = fetch_page_func(page=current_page, **kwargs)
-        if not items:
-            break
-        
-        all_items.extend(items)
-        current_page += 1
-        
-        # Safety break for mock/infinite loops
-        if current_page > 100:
-            break
-            
-    return all_items
-
-def paginate_with_cursor(fetch_func, **kwargs):
-    """
-    Generic helper to fetch all records using cursor-based pagination.
-    
-    :param fetch_func: Function that returns (items, next_cursor).
-    :param kwargs: Initial arguments.
-    :return: Combined list of all items.
-    """
-    all_items = []
-    next_cursor = None
-    
-    while True:
-        items, cursor = fetch_func(cursor=next_cursor, **kwargs)
-        all_items.extend(items)
-        
-        if not cursor:
-            break
-        
-        next_cursor = cursor
-        
-    return all_items
+    :return: A PaginatedList of all items.
+    """
+    stream = iter_items(fetch_page_func, start_page, concurrency, max_pages, **kwargs)
+    result = PaginatedList(stream)
+    result.truncated = stream.truncated
+    result.partial = stream.partial
+    result.pages = stream.pages
+    return result
+
+async def aiter_pages(fetch_page_coro, start_page=1, concurrency=1, max_pages=None, state=None, **kwargs):
+    """
+    Async counterpart of iter_pages: yields page lists in order while keeping up to
+    `concurrency` page requests in flight on the event loop.
+
+    :param fetch_page_coro: Coroutine function taking (page, **kwargs) and returning (items, more_records).
+    :param state: Optional PaginatedList whose `truncated`/`partial`/`pages` are updated as pages arrive.
+    """
+    max_pages = max_pages or settings.PAGINATION_MAX_PAGES
+    concurrency = max(1, concurrency)
+    last_page = start_page + max_pages - 1
+    state = state if state is not None else PaginatedList()
+
+    items, more_records = await fetch_page_coro(page=start_page, **kwargs)
+    state.pages = 1
+    yield items
+    if not more_records:
+        return
+
+    next_page = start_page + 1
+    in_flight = deque()
+    try:
+        while True:
+            while len(in_flight) < concurrency and next_page <= last_page and not past_deadline():
+                in_flight.append(asyncio.ensure_future(fetch_page_coro(page=next_page, **kwargs)))
+                next_page += 1
+
+            if not in_flight:
+                if next_page <= last_page:
+                    mark_partial("pagination", pages=state.pages)
+                    state.partial = True
+                else:
+                    print(f"Warning: Pagination stopped after {state.pages} pages; the ATS reported more records.")
+                    state.truncated = True
+                return
+
+            try:
+                items, more_records = await asyncio.wait_for(in_flight.popleft(), time_left())
+            except (asyncio.TimeoutError, ATSError) as e:
+                if not (past_deadline() or isinstance(e, UpstreamTimeoutError)):
+                    raise
+                mark_partial("pagination", pages=state.pages)
+                state.partial = True
+                return
+            state.pages += 1
+            yield items
+
+            if not more_records:
+                return
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+async def apaginate_all(fetch_page_coro, start_page=1, concurrency=1, max_pages=None, **kwargs):
+    """
+    Async counterpart of paginate_all.
+
+    :param fetch_page_coro: Coroutine function taking (page, **kwargs) and returning (items, more_records).
+    :return: A PaginatedList of all items.
+    """
+    result = PaginatedList()
+    async for items in aiter_pages(fetch_page_coro, start_page, concurrency, max_pages, state=result, **kwargs):
+        result.extend(items)
+    return result
+
+def fetch_window(fetch_page_func, position, limit, page_size=None, max_pages=None, **kwargs):
+    """
+    Return `limit` records starting at absolute `position`, fetching only the
+    upstream pages that cover them.
+
+    :param fetch_page_func: Function called as fetch(page=..., **kwargs) returning (items, more_records).
+    :param page_size: Records per upstream page; None when the upstream returns everything as page 1.
+    :return: (items, next_position); next_position is None once the upstream is exhausted.
+        When the request deadline passes before the window is full, the records fetched
+        so far are returned with a next_position that resumes after them.
+    """
+    max_pages = settings.PAGINATION_MAX_PAGES if max_pages is None else max_pages
+    if page_size:
+        page, skip = position // page_size + 1, position % page_size
+    else:
+        page, skip = 1, position
+
+    items = []
+    for index in range(max_pages):
+        try:
+            if index and past_deadline():
+                raise UpstreamTimeoutError()
+            records, more_records = fetch_page_func(page=page, **kwargs)
+        except ATSError as e:
+            # Past the first page, the deadline ends the window early instead of failing it
+            if not index or not (past_deadline() or isinstance(e, UpstreamTimeoutError)):
+                raise
+            mark_partial("window", records=len(items))
+            return items, position + len(items)
+        records = records[skip:]
+        needed = limit - len(items)
+        items.extend(records[:needed])
+        if len(records) > needed:
+            return items, position + len(items)
+        if not more_records:
+            return items, None
+        if len(items) == limit:
+            return items, position + limit
+        page, skip = page + 1, 0
+    print(f"Warning: Window fetch stopped after {max_pages} pages; more records may exist.")
+    return items, position + len(items)
+
+def slice_window(items, position, limit):
+    """Window over an already-available iterable. Returns (items, next_position) like fetch_window."""
+    window = list(islice(items, position, position + limit + 1))
+    if len(window) > limit:
+        return window[:limit], position + limit
+    return window, None
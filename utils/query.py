@@ -0,0 +1,117 @@
+from datetime import datetime, timezone
+from utils.errors import ValidationError
+
+# Normalized fields each listing exposes (see BaseATSProvider.normalize_*)
+RESOURCE_FIELDS = {
+    "jobs": ("id", "title", "location", "status", "external_url"),
+    "applications": ("id", "candidate_name", "email", "status"),
+}
+JOB_STATUSES = ("OPEN", "CLOSED")
+
+class ListQuery:
+    """
+    Filters and projection for a listing, from the `fields`, `status`, `location`
+    and `updated_since` query parameters.
+
+    Providers translate what they can into upstream parameters (see
+    BaseATSProvider.query_jobs) and evaluate the rest locally with `apply`.
+    """
+
+    def __init__(self, fields=None, status=None, location=None, updated_since=None):
+        """
+        :param fields: Normalized fields to return ("id" is always included), or None for all.
+        :param status: Normalized status to match (case-insensitive; kept as given for upstream queries).
+        :param location: Job location to match (case-insensitive).
+        :param updated_since: Timezone-aware datetime; only records modified at or after it match.
+        """
+        self.fields = tuple(dict.fromkeys(("id",) + tuple(fields))) if fields else None
+        self.status = status
+        self.location = location
+        self.updated_since = updated_since
+
+    @classmethod
+    def from_params(cls, params, resource):
+        """Build a query from API Gateway query parameters, raising ValidationError on bad input."""
+        params = params or {}
+        allowed = RESOURCE_FIELDS[resource]
+
+        fields = None
+        if params.get("fields"):
+            fields = [f.strip() for f in params["fields"].split(",") if f.strip()]
+            unknown = [f for f in fields if f not in allowed]
+            if unknown:
+                raise ValidationError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}.")
+
+        status = (params.get("status") or "").strip() or None
+        if status and resource == "jobs" and status.upper() not in JOB_STATUSES:
+            raise ValidationError(f"status must be one of: {', '.join(JOB_STATUSES)}.")
+
+        location = (params.get("location") or "").strip() or None
+        if location and resource != "jobs":
+            raise ValidationError("location can only be used to filter jobs.")
+
+        updated_since = None
+        if params.get("updated_since"):
+            updated_since = parse_timestamp(params["updated_since"])
+
+        return cls(fields=fields, status=status, location=location, updated_since=updated_since)
+
+    def __bool__(self):
+        return any(v is not None for v in (self.fields, self.status, self.location, self.updated_since))
+
+    def key(self):
+        """Stable description of the query, for cache keys and cursor scopes."""
+        parts = [
+            f"fields={','.join(self.fields)}" if self.fields else "",
+            f"status={self.status.upper()}" if self.status else "",
+            f"location={self.location.lower()}" if self.location else "",
+            f"updated_since={self.updated_since.isoformat()}" if self.updated_since else "",
+        ]
+        return ";".join(p for p in parts if p)
+
+    def matches(self, record):
+        """Evaluate the status/location filters against a normalized record."""
+        if self.status and str(record.get("status", "")).upper() != self.status.upper():
+            return False
+        if self.location and str(record.get("location", "")).lower() != self.location.lower():
+            return False
+        return True
+
+    def project(self, record):
+        if not self.fields:
+            return record
+        return {field: record.get(field) for field in self.fields}
+
+    def apply(self, records, normalize=None, updated_at=None):
+        """
+        Lazily filter and project records locally.
+
+        :param records: Normalized records, or raw upstream records when `normalize` is given.
+        :param normalize: Callable mapping a raw record to its normalized form.
+        :param updated_at: Callable returning a raw record's modification datetime;
+            required when the query has `updated_since`.
+        """
+        if self.updated_since and updated_at is None:
+            raise ValidationError("updated_since is not supported for this provider.")
+        return self._iter_matching(records, normalize, updated_at)
+
+    def _iter_matching(self, records, normalize, updated_at):
+        for record in records:
+            if self.updated_since:
+                modified = updated_at(record)
+                if modified is None or modified < self.updated_since:
+                    continue
+            if normalize is not None:
+                record = normalize(record)
+            if self.matches(record):
+                yield self.project(record)
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 timestamp; naive values are taken as UTC."""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        raise ValidationError("updated_since must be an ISO 8601 timestamp, e.g. 2024-01-31T00:00:00Z.")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
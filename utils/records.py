@@ -0,0 +1,96 @@
+from json import dumps
+from json.encoder import encode_basestring_ascii
+
+class Record:
+    """
+    Fixed-field normalized record stored in `__slots__` instead of a per-record dict.
+
+    Records read like the dicts they replace (`record["id"]`, `record.get("status")`,
+    `dict(record)`, equality with a dict of the same fields) and encode straight to
+    the JSON `json.dumps(record.to_dict())` would produce, without building that dict.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field, default=None):
+        if field not in self.FIELDS:
+            return default
+        return getattr(self, field)
+
+    def keys(self):
+        return self.FIELDS
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __contains__(self, field):
+        return field in self.FIELDS
+
+    def values(self):
+        return [getattr(self, field) for field in self.FIELDS]
+
+    def to_dict(self):
+        return dict(zip(self.FIELDS, self.values()))
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self.FIELDS == other.FIELDS and self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{f}={getattr(self, f)!r}' for f in self.FIELDS)})"
+
+class Job(Record):
+    __slots__ = FIELDS = ("id", "title", "location", "status", "external_url")
+
+    def __init__(self, id, title, location, status, external_url):
+        self.id = id
+        self.title = title
+        self.location = location
+        self.status = status
+        self.external_url = external_url
+
+    def to_json(self):
+        return '{"id": %s, "title": %s, "location": %s, "status": %s, "external_url": %s}' % (
+            _encode(self.id), _encode(self.title), _encode(self.location),
+            _encode(self.status), _encode(self.external_url)
+        )
+
+class Application(Record):
+    __slots__ = FIELDS = ("id", "candidate_name", "email", "status")
+
+    def __init__(self, id, candidate_name, email, status):
+        self.id = id
+        self.candidate_name = candidate_name
+        self.email = email
+        self.status = status
+
+    def to_json(self):
+        return '{"id": %s, "candidate_name": %s, "email": %s, "status": %s}' % (
+            _encode(self.id), _encode(self.candidate_name), _encode(self.email), _encode(self.status)
+        )
+
+def _encode(value):
+    # Normalized values are almost always strings; anything else takes the generic path
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    return dumps(value)
+
+def json_default(value):
+    """`default=` hook letting json.dumps encode records nested in other structures."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
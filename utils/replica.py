@@ -0,0 +1,276 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from config.settings import settings
+
+# resource name -> table
+RESOURCES = {
+    "jobs": "job_openings",
+    "applications": "applications",
+}
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS job_openings ("
+    "id TEXT PRIMARY KEY, status TEXT, modified_time TEXT, data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_job_openings_status ON job_openings (status)",
+    "CREATE INDEX IF NOT EXISTS idx_job_openings_modified_time ON job_openings (modified_time)",
+    "CREATE TABLE IF NOT EXISTS applications ("
+    "id TEXT PRIMARY KEY, job_id TEXT, status TEXT, modified_time TEXT, data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications (job_id)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status)",
+    "CREATE INDEX IF NOT EXISTS idx_applications_modified_time ON applications (modified_time)",
+    "CREATE TABLE IF NOT EXISTS sync_state ("
+    "resource TEXT PRIMARY KEY, watermark TEXT, synced_at REAL NOT NULL)",
+    # Pushed deletions, so a late update delivered after the delete can't resurrect the record
+    "CREATE TABLE IF NOT EXISTS tombstones ("
+    "resource TEXT NOT NULL, id TEXT NOT NULL, deleted_at REAL NOT NULL, PRIMARY KEY (resource, id))",
+]
+
+class ReplicaStore:
+    """
+    Local SQLite replica of raw ATS records (job openings and applications).
+
+    Records are stored as the provider returned them and normalized on read, so
+    normalization changes never require a resync. A per-resource watermark tracks
+    the newest modification time seen, which the provider uses for delta syncs.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+
+    def upsert_jobs(self, records):
+        rows = [
+            (str(r["id"]), r.get("Job_Opening_Status") or r.get("Status"), r.get("Modified_Time"), json.dumps(r))
+            for r in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO job_openings (id, status, modified_time, data) VALUES (?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def upsert_applications(self, records):
+        rows = [
+            (str(r["id"]), application_job_id(r), r.get("Application_Status"), r.get("Modified_Time"), json.dumps(r))
+            for r in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO applications (id, job_id, status, modified_time, data) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def delete(self, resource, ids):
+        table = RESOURCES[resource]
+        rows = [(str(i),) for i in ids]
+        with self._lock, self._conn:
+            self._conn.executemany(f"DELETE FROM {table} WHERE id = ?", rows)
+        return len(rows)
+
+    def apply_changes(self, resource, records):
+        """
+        Upsert pushed records unless the replica already holds a newer version or
+        the record was deleted after it was modified. Safe to repeat and to call
+        with deliveries out of order.
+        :return: (applied_records, stale_count)
+        """
+        table = RESOURCES[resource]
+        upsert = self.upsert_jobs if resource == "jobs" else self.upsert_applications
+        applied = []
+        with self._lock:
+            for record in records:
+                record_id = str(record["id"])
+                modified = _timestamp(record.get("Modified_Time"))
+                row = self._conn.execute(f"SELECT modified_time FROM {table} WHERE id = ?", (record_id,)).fetchone()
+                if row and modified is not None and (_timestamp(row[0]) or 0) > modified:
+                    continue
+                tombstone = self._conn.execute(
+                    "SELECT deleted_at FROM tombstones WHERE resource = ? AND id = ?", (resource, record_id)
+                ).fetchone()
+                if tombstone and (modified is None or modified <= tombstone[0]):
+                    continue
+                applied.append(record)
+        upsert(applied)
+        if applied:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "DELETE FROM tombstones WHERE resource = ? AND id = ?",
+                    [(resource, str(r["id"])) for r in applied]
+                )
+        return applied, len(records) - len(applied)
+
+    def apply_deletes(self, resource, ids, deleted_at=None, tombstone_ttl=None):
+        """
+        Delete pushed record ids and remember the deletions. A stored version
+        modified after `deleted_at` (e.g. restored from the recycle bin) is kept.
+        :param deleted_at: Unix time of the deletion (defaults to now).
+        :return: The raw records that were removed.
+        """
+        table = RESOURCES[resource]
+        deleted_at = time.time() if deleted_at is None else deleted_at
+        tombstone_ttl = settings.WEBHOOK_TOMBSTONE_TTL if tombstone_ttl is None else tombstone_ttl
+        removed = []
+        with self._lock, self._conn:
+            for record_id in (str(i) for i in ids):
+                row = self._conn.execute(
+                    f"SELECT modified_time, data FROM {table} WHERE id = ?", (record_id,)
+                ).fetchone()
+                if row and (_timestamp(row[0]) or 0) > deleted_at:
+                    continue
+                if row:
+                    self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (record_id,))
+                    removed.append(json.loads(row[1]))
+                self._conn.execute(
+                    "INSERT INTO tombstones (resource, id, deleted_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (resource, id) DO UPDATE SET deleted_at = MAX(deleted_at, excluded.deleted_at)",
+                    (resource, record_id, deleted_at)
+                )
+            self._conn.execute("DELETE FROM tombstones WHERE deleted_at < ?", (time.time() - tombstone_ttl,))
+        return removed
+
+    def get(self, resource, record_id):
+        """Return a single raw record, or None."""
+        table = RESOURCES[resource]
+        with self._lock:
+            row = self._conn.execute(f"SELECT data FROM {table} WHERE id = ?", (str(record_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_jobs(self, status=None):
+        """Yield raw job openings, optionally filtered by upstream status."""
+        query, params = "SELECT data FROM job_openings", ()
+        if status is not None:
+            query, params = query + " WHERE status = ?", (status,)
+        return self._iter_rows(query + " ORDER BY id", params)
+
+    def iter_applications(self, job_id):
+        """Yield raw applications for a job."""
+        return self._iter_rows("SELECT data FROM applications WHERE job_id = ? ORDER BY id", (str(job_id),))
+
+    def get_watermark(self, resource, completed=False):
+        """
+        Newest modification time fetched for a resource: including an unfinished sync's
+        progress, or with `completed` only as of the last completed sync. None before any.
+        """
+        with self._lock:
+            row = None if completed else self._conn.execute(
+                "SELECT watermark FROM sync_state WHERE resource = ?", (_progress_key(resource),)
+            ).fetchone()
+            if row is None:
+                row = self._conn.execute("SELECT watermark FROM sync_state WHERE resource = ?", (resource,)).fetchone()
+        return row[0] if row else None
+
+    def last_synced(self, resource):
+        """Unix time of the last completed sync for a resource, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT synced_at FROM sync_state WHERE resource = ?", (resource,)).fetchone()
+        return row[0] if row else None
+
+    def set_progress(self, resource, watermark):
+        """Record how far an unfinished sync got, without marking the resource synced."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (resource, watermark, synced_at) VALUES (?, ?, 0)",
+                (_progress_key(resource), watermark)
+            )
+
+    def mark_synced(self, resource, watermark):
+        """Record a completed sync (modifications and deletions applied) up to `watermark`."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (resource, watermark, synced_at) VALUES (?, ?, ?)",
+                (resource, watermark, time.time())
+            )
+            self._conn.execute("DELETE FROM sync_state WHERE resource = ?", (_progress_key(resource),))
+
+    def _iter_rows(self, query, params, batch_size=500):
+        # Fetch in batches so large tables are streamed rather than loaded at once
+        offset = 0
+        while True:
+            with self._lock:
+                batch = self._conn.execute(f"{query} LIMIT ? OFFSET ?", params + (batch_size, offset)).fetchall()
+            for row in batch:
+                yield json.loads(row[0])
+            if len(batch) < batch_size:
+                return
+            offset += batch_size
+
+def _progress_key(resource):
+    # An unfinished sync's watermark is kept in its own row, so it never counts as synced
+    return f"{resource}:progress"
+
+def _timestamp(modified_time):
+    """Unix time of a Zoho Modified_Time value (ISO 8601 with offset), or None."""
+    if not modified_time:
+        return None
+    try:
+        parsed = datetime.fromisoformat(modified_time)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def application_job_id(raw_app):
+    """Extract the job opening id from a raw Zoho application record."""
+    job = raw_app.get("Job_Opening_Name")
+    if isinstance(job, dict) and job.get("id"):
+        return str(job["id"])
+    job_id = raw_app.get("$Job_Opening_Id") or raw_app.get("Job_Opening_Id")
+    return str(job_id) if job_id else None
+
+_replicas = {}  # REPLICA_PATH -> store (each tenant has its own file)
+_replica_lock = threading.Lock()
+# Serializes syncs within the container
+sync_lock = threading.Lock()
+
+def get_replica():
+    """Return the process-wide replica store for REPLICA_PATH, or None when REPLICA_ENABLED is off."""
+    if not settings.REPLICA_ENABLED:
+        return None
+    path = settings.REPLICA_PATH
+    store = _replicas.get(path)
+    if store is None:
+        with _replica_lock:
+            store = _replicas.get(path)
+            if store is None:
+                store = _replicas[path] = ReplicaStore(path)
+    return store
+
+def replica_for(provider):
+    """
+    Return the replica store when reads should be served from it, or None.
+    A replica older than REPLICA_MAX_STALENESS is delta-synced before it is used.
+    """
+    if not settings.REPLICA_READS or not provider.supports_replica:
+        return None
+    store = get_replica()
+    if store is None:
+        return None
+
+    if _is_stale(store):
+        has_data = all(store.last_synced(resource) for resource in RESOURCES)
+        # If another caller is already syncing, serve what we have (unless we have nothing yet)
+        if sync_lock.acquire(blocking=not has_data):
+            try:
+                if _is_stale(store):
+                    provider.sync_replica(store)
+            finally:
+                sync_lock.release()
+    return store
+
+def _is_stale(store):
+    last_synced = min(store.last_synced(resource) or 0 for resource in RESOURCES)
+    return time.time() - last_synced > settings.REPLICA_MAX_STALENESS
@@ -0,0 +1,283 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from config.settings import settings
+from utils.deadline import time_left
+from utils.errors import CircuitOpenError, UpstreamTimeoutError
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. `reserve()` takes a token immediately and returns how
+    long the caller must wait before using it, so waiting works for both threads
+    (time.sleep) and coroutines (asyncio.sleep) and callers are served in order.
+    """
+
+    def __init__(self, rate_per_second, capacity):
+        self.rate = float(rate_per_second)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def available(self):
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate)
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and fails fast for
+    `reset_timeout` seconds; then lets a single trial call through (half-open).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_in(self):
+        """Seconds until an open breaker allows a trial call, or 0 if calls are allowed now."""
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    return self.reset_timeout
+                self._trial_in_flight = True
+            return 0
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """Let the next call be the half-open trial when this one ended without an upstream verdict."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+class UpstreamGuard:
+    """
+    Shared policy for calls to one ATS account: rate limiting, retries with
+    exponential backoff and jitter (honouring Retry-After) for idempotent calls,
+    and a circuit breaker.
+    """
+
+    def __init__(self, name, rate_per_minute, burst, max_retries, backoff_base, backoff_max,
+                 failure_threshold, reset_timeout, account=None):
+        """
+        :param account: Non-secret label of the ATS account, telling guards of one provider apart in metrics.
+        """
+        self.name = name
+        self.account = account
+        self.limiter = TokenBucket(rate_per_minute / 60.0, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "throttled": 0, "short_circuited": 0, "failures": 0, "deadline_stops": 0, "wait_seconds": 0.0}
+
+    def call(self, send, idempotent=True, retry_exceptions=()):
+        """
+        Run `send()` (which returns a response with `status_code` and `headers`) under the policy.
+        After the last attempt, or when waiting to retry would pass the request deadline,
+        the final response is returned (or the error raised) for the caller to handle.
+        """
+        attempt = 0
+        while True:
+            self._before_attempt(time.sleep)
+            try:
+                response = send()
+            except retry_exceptions:
+                self._record_failure()
+                delay = self._retry_delay(attempt, None) if idempotent and attempt < self.max_retries else None
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Not an upstream verdict (e.g. a failed token refresh); don't hold the half-open trial
+                self.breaker.release_trial()
+                raise
+
+            delay = self._retry_delay(attempt, response) if self._should_retry(response, idempotent, attempt) else None
+            if delay is None:
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, send, idempotent=True, retry_exceptions=()):
+        """Async counterpart of call(); `send` is a coroutine function."""
+        attempt = 0
+        while True:
+            wait = self._before_attempt(None)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                response = await send()
+            except retry_exceptions:
+                self._record_failure()
+                delay = self._retry_delay(attempt, None) if idempotent and attempt < self.max_retries else None
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+
+            delay = self._retry_delay(attempt, response) if self._should_retry(response, idempotent, attempt) else None
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def snapshot(self):
+        """Current limiter/breaker state and counters, for metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        stats.update({
+            "name": self.name,
+            "account": self.account,
+            "tokens_available": round(self.limiter.available(), 2),
+            "breaker_state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+        })
+        return stats
+
+    def _before_attempt(self, sleep):
+        retry_in = self.breaker.retry_in()
+        if retry_in:
+            self._count("short_circuited")
+            raise CircuitOpenError(self.name, retry_in)
+
+        wait = self.limiter.reserve()
+        self._count("calls")
+        if wait:
+            left = time_left()
+            if left is not None and wait >= left:
+                self._count("deadline_stops")
+                self.breaker.release_trial()
+                raise UpstreamTimeoutError(f"Rate limit for '{self.name}' would delay the call past the request deadline.")
+            self._count("throttled")
+            self._count("wait_seconds", wait)
+            if sleep is not None:
+                sleep(wait)
+        return wait
+
+    def _should_retry(self, response, idempotent, attempt):
+        if response.status_code not in RETRY_STATUSES:
+            self.breaker.record_success()
+            return False
+        self._record_failure()
+        return idempotent and attempt < self.max_retries
+
+    def _record_failure(self):
+        self._count("failures")
+        self.breaker.record_failure()
+
+    def _retry_delay(self, attempt, response):
+        """Seconds to wait before the next attempt, or None when it would end past the request deadline."""
+        retry_after = _retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            delay = min(retry_after, self.backoff_max)
+        else:
+            # Full jitter: uniform in [0, base * 2^attempt], capped
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        left = time_left()
+        if left is not None and delay >= left:
+            self._count("deadline_stops")
+            return None
+        self._count("retries")
+        return delay
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+def _retry_after_seconds(response):
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+def get_guard(provider_name, account):
+    """Return the process-wide guard for a provider account, creating it from settings."""
+    key = (provider_name, account)
+    with _guards_lock:
+        guard = _guards.get(key)
+        if guard is None:
+            guard = _guards[key] = UpstreamGuard(
+                name=provider_name,
+                account=account_label(account),
+                rate_per_minute=settings.UPSTREAM_RATE_PER_MINUTE,
+                burst=settings.UPSTREAM_BURST,
+                max_retries=settings.UPSTREAM_MAX_RETRIES,
+                backoff_base=settings.UPSTREAM_BACKOFF_BASE,
+                backoff_max=settings.UPSTREAM_BACKOFF_MAX,
+                failure_threshold=settings.UPSTREAM_BREAKER_THRESHOLD,
+                reset_timeout=settings.UPSTREAM_BREAKER_RESET
+            )
+        return guard
+
+def account_label(account):
+    """Short stable hash of an account key (e.g. an OAuth client id), safe to show in metrics."""
+    return hashlib.sha256(repr(account).encode("utf-8")).hexdigest()[:12]
+
+def reset_guards():
+    with _guards_lock:
+        _guards.clear()
+
+def guard_snapshots():
+    """Metrics for every guard in the process."""
+    with _guards_lock:
+        guards = list(_guards.values())
+    return [guard.snapshot() for guard in guards]
@@ -1,16 +1,92 @@
+import base64
+import hashlib
+import io
 import json
+import time
+from config.settings import settings
+from utils.records import Record, json_default
+from utils.telemetry import span, record, tracing
 
-def success_response(data, status_code=200):
+def success_response(data, status_code=200, headers=None):
     """Return a standard success response for API Gateway."""
+    with span("serialize") as timing:
+        body = json.dumps(data, default=json_default)
+        timing.set(bytes=len(body))
+    return success_response_body(body, status_code, headers)
+
+def stream_response(items, status_code=200, headers=None):
+    """
+    Return a success response whose JSON array body is encoded incrementally.
+
+    `items` may be any iterable (e.g. a provider's lazy iter_jobs()); records are
+    serialized one at a time so the full dataset is never held as Python objects
+    alongside its encoded form.
+    """
+    body = encode_json_array(items)
+    # Pagination state is only known once the stream has been consumed
+    response_headers = pagination_headers(items)
+    if headers:
+        response_headers.update(headers)
+    return success_response_body(body, status_code, response_headers)
+
+def encode_json_array(items):
+    """Encode an iterable as a JSON array, one element at a time (records encode themselves)."""
+    traced = tracing()
+    if traced:
+        # Lazy listings fetch upstream pages while being encoded; time only the encoding
+        started, waited = time.perf_counter(), [0.0, 0]
+        items = _timed_iter(items, waited)
+    buffer = io.StringIO()
+    write = buffer.write
+    encode = json.JSONEncoder(default=json_default).encode
+    write("[")
+    first = True
+    for item in items:
+        if not first:
+            write(", ")
+        write(item.to_json() if isinstance(item, Record) else encode(item))
+        first = False
+    write("]")
+    body = buffer.getvalue()
+    if traced:
+        encode_ms = (time.perf_counter() - started - waited[0]) * 1000
+        record("serialize", encode_ms, records=waited[1], bytes=len(body))
+    return body
+
+def _timed_iter(items, waited):
+    """Yield from `items`, adding time spent waiting on it to waited[0] and counting items in waited[1]."""
+    iterator = iter(items)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            waited[0] += time.perf_counter() - start
+            return
+        waited[0] += time.perf_counter() - start
+        waited[1] += 1
+        yield item
+
+def success_response_body(body, status_code=200, headers=None):
+    """Return a success response for an already-encoded JSON body."""
+    response_headers = {
+        "Content-Type": "application/json",
+        "Access-Control-Allow-Origin": "*"  # Permissive CORS for development
+    }
+    if headers:
+        response_headers.update(headers)
     return {
         "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*"  # Permissive CORS for development
-        },
-        "body": json.dumps(data)
+        "headers": response_headers,
+        "body": body
     }
 
+def pagination_headers(result):
+    """Headers describing how a paginated upstream fetch ended."""
+    if getattr(result, "truncated", False):
+        return {"X-Result-Truncated": "true"}
+    return {}
+
 def error_response(message, status_code=400):
     """Return a standard error response for API Gateway."""
     return {
@@ -25,3 +101,140 @@ def error_response(message, status_code=400):
             "status_code": status_code
         })
     }
+
+def compute_etag(body):
+    """Stable strong ETag for a response body."""
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+def conditional_response(response, event):
+    """
+    Attach an ETag to a successful response and answer a matching
+    `If-None-Match` with a bodiless 304 Not Modified.
+    """
+    if response["statusCode"] != 200:
+        return response
+
+    etag = compute_etag(response["body"])
+    response["headers"]["ETag"] = etag
+
+    if_none_match = get_header(event, "If-None-Match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        headers = {k: v for k, v in response["headers"].items() if k != "Content-Type"}
+        # A 304 carries the Vary the full response would have (see compress_response)
+        if settings.RESPONSE_COMPRESSION and len(response["body"].encode("utf-8")) >= settings.RESPONSE_COMPRESSION_MIN_BYTES:
+            _vary_on_encoding(headers)
+        return {"statusCode": 304, "headers": headers, "body": ""}
+    return response
+
+def negotiate_response(response, event):
+    """Apply per-request negotiation to a GET response: ETag/304, then Accept-Encoding."""
+    return compress_response(conditional_response(response, event), event)
+
+def compress_response(response, event, min_size=None, gzip_level=None, brotli_quality=None):
+    """
+    Compress a successful response body with the best encoding the client accepts
+    (brotli when the module is installed, else gzip). Bodies below `min_size` bytes
+    are left alone. The compressed body is base64-encoded for API Gateway's binary
+    support, so the API must list the response media type in binaryMediaTypes.
+    """
+    if not settings.RESPONSE_COMPRESSION or response["statusCode"] != 200 or response.get("isBase64Encoded"):
+        return response
+    min_size = settings.RESPONSE_COMPRESSION_MIN_BYTES if min_size is None else min_size
+    body = response["body"].encode("utf-8")
+    if len(body) < min_size:
+        return response
+
+    headers = response["headers"]
+    _vary_on_encoding(headers)
+
+    encoding = choose_encoding(get_header(event, "Accept-Encoding"))
+    if encoding is None:
+        return response
+    with span("compress", encoding=encoding) as timing:
+        if encoding == "br":
+            quality = settings.RESPONSE_BROTLI_QUALITY if brotli_quality is None else brotli_quality
+            compressed = _brotli().compress(body, quality=quality)
+        else:
+            import gzip
+            level = settings.RESPONSE_GZIP_LEVEL if gzip_level is None else gzip_level
+            compressed = gzip.compress(body, compresslevel=level, mtime=0)
+        timing.set(bytes_in=len(body), bytes_out=len(compressed))
+
+    headers["Content-Encoding"] = encoding
+    # The same ETag now covers several byte representations, which makes it weak
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+    response["body"] = base64.b64encode(compressed).decode("ascii")
+    response["isBase64Encoded"] = True
+    return response
+
+def _vary_on_encoding(headers):
+    vary = headers.get("Vary")
+    headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+def choose_encoding(accept_encoding):
+    """Pick "br", "gzip" or None from an Accept-Encoding header, honouring q-values."""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    wildcard = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if _brotli() is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:  # earlier candidates win ties
+            best, best_quality = encoding, quality
+    return best
+
+_brotli_module = False
+
+def _brotli():
+    """The optional brotli module, or None when it isn't installed."""
+    global _brotli_module
+    if _brotli_module is False:
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        _brotli_module = brotli
+    return _brotli_module
+
+def get_body(event):
+    """Return the raw request body, decoding API Gateway's base64 binary payloads."""
+    body = (event or {}).get("body") or ""
+    if event and event.get("isBase64Encoded") and body:
+        body = base64.b64decode(body).decode("utf-8")
+    return body
+
+def get_header(event, name):
+    """Case-insensitive lookup of a request header in an API Gateway event."""
+    headers = (event or {}).get("headers") or {}
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
@@ -0,0 +1,123 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from config.settings import settings
+from utils.deadline import within_deadline, mark_partial
+from utils.errors import UpstreamTimeoutError
+from utils.telemetry import metric
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent reads: the first caller for a key runs the
+    fetch and every caller that arrives while it is in flight waits for, and
+    shares, its result or exception. Thread and asyncio callers share the same
+    in-flight calls, so upstream load stays at one fetch per key no matter how
+    many clients ask at once.
+
+    Shared results are handed to every waiter as-is, so fetches must return
+    materialized values (lists), not lazy iterators, and callers must not mutate them.
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> concurrent.futures.Future of the in-flight call
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "shared": 0, "timeouts": 0}
+
+    def do(self, key, fetch, timeout=None):
+        """
+        Return fetch(), or the result of an identical call already in flight.
+        :param timeout: Seconds a waiting caller gives the in-flight call before
+                        raising UpstreamTimeoutError (the leader is not limited).
+        """
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                return future.result(timeout)
+            except FutureTimeoutError:
+                raise self._timeout() from None
+        try:
+            result = fetch()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def do_async(self, key, fetch, timeout=None):
+        """Coroutine version of `do`: `fetch` is a coroutine function; waiting never blocks the event loop."""
+        import asyncio
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                # shield: a waiter timing out must not cancel the call others share
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except asyncio.TimeoutError:
+                raise self._timeout() from None
+        try:
+            result = await fetch()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+    def _join(self, key):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats["shared"] += 1
+                leader = False
+            else:
+                future = self._calls[key] = Future()
+                self._stats["leaders"] += 1
+                leader = True
+        metric("single_flight.leader" if leader else "single_flight.shared", 1)
+        return future, leader
+
+    def _finish(self, key, future, result=None, error=None):
+        # Later callers start a new fetch; waiters of this one get its outcome
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _timeout(self):
+        with self._lock:
+            self._stats["timeouts"] += 1
+        return UpstreamTimeoutError("Timed out waiting for an identical ATS request in progress.")
+
+_flight = SingleFlight()
+
+def flight_key(provider, resource, query=None):
+    """Coalescing key for a read: (provider, account, resource, query)."""
+    return (settings.ATS_PROVIDER, provider.account, resource, query)
+
+def coalesce(key, fetch):
+    """
+    Run fetch() through the process-wide SingleFlight (or directly when SINGLE_FLIGHT_ENABLED
+    is off). Waiting for another caller's fetch ends by this request's deadline.
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return fetch()
+    return _shared_result(_flight.do(key, fetch, within_deadline(settings.SINGLE_FLIGHT_TIMEOUT)))
+
+async def coalesce_async(key, fetch):
+    """Await fetch() through the process-wide SingleFlight (see coalesce)."""
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return await fetch()
+    return _shared_result(await _flight.do_async(key, fetch, within_deadline(settings.SINGLE_FLIGHT_TIMEOUT)))
+
+def _shared_result(result):
+    # A listing another request's deadline cut short is partial for this request too
+    if getattr(result, "partial", False):
+        mark_partial("shared fetch")
+    return result
+
+def single_flight_stats():
+    return _flight.stats()
@@ -0,0 +1,218 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from config.settings import settings
+from utils.errors import SubmissionQueueUnavailableError
+
+# queued -> processing -> succeeded | failed (a retryable failure goes back to queued)
+QUEUED, PROCESSING, SUCCEEDED, FAILED = "queued", "processing", "succeeded", "failed"
+
+class SubmissionQueue:
+    """
+    Durable queue of candidate submissions accepted by POST /candidates in async
+    mode, and the record of how each one ended. Implementations must survive the
+    accepting invocation; a claimed submission whose worker dies is handed out
+    again once its lease expires.
+    """
+
+    def enqueue(self, payload):
+        """Store a validated submission and return its tracking id."""
+        raise NotImplementedError
+
+    def claim(self, limit, lease_seconds):
+        """Lease up to `limit` queued submissions (oldest first) as [(id, payload)]."""
+        raise NotImplementedError
+
+    def complete(self, submission_id, result):
+        """Record a submission as succeeded with its result (e.g. the application id)."""
+        raise NotImplementedError
+
+    def fail(self, submission_id, message, status_code, retry=False):
+        """
+        Record a failed attempt; with retry=True the submission is queued again
+        unless it is out of attempts.
+        :return: The submission's new status.
+        """
+        raise NotImplementedError
+
+    def status(self, submission_id):
+        """The submission's current state as a dict, or None if the id is unknown."""
+        raise NotImplementedError
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS submissions ("
+    "id TEXT PRIMARY KEY, payload TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+    "result TEXT, error TEXT, status_code INTEGER, lease_until REAL, created_at REAL NOT NULL, updated_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_submissions_status ON submissions (status, created_at)",
+]
+
+class SQLiteSubmissionQueue(SubmissionQueue):
+    """
+    SubmissionQueue in a local SQLite file, so the async flow runs offline. Lambda's
+    /tmp is per container: point SUBMISSION_QUEUE_PATH at storage shared with the
+    worker (e.g. an EFS mount) or provide another SubmissionQueue in production.
+    """
+
+    def __init__(self, path, max_attempts=5, retention=86400):
+        """
+        :param path: SQLite file.
+        :param max_attempts: Attempts before a retryable failure becomes final.
+        :param retention: Seconds finished submissions stay available to status lookups.
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retention = retention
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+
+    def enqueue(self, payload):
+        submission_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO submissions (id, payload, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (submission_id, json.dumps(payload), QUEUED, now, now)
+            )
+        return submission_id
+
+    def claim(self, limit, lease_seconds):
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so concurrent workers
+            # (other threads or containers sharing the file) never claim the same row
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # A worker that died mid-batch leaves its lease to expire; give up on
+                # submissions that have already used all their attempts that way
+                self._conn.execute(
+                    "UPDATE submissions SET status = ?, error = ?, lease_until = NULL, updated_at = ? "
+                    "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                    (FAILED, "Worker did not finish the submission.", now, PROCESSING, now, self.max_attempts)
+                )
+                rows = self._conn.execute(
+                    "SELECT id, payload FROM submissions WHERE status = ? OR (status = ? AND lease_until < ?) "
+                    "ORDER BY created_at LIMIT ?",
+                    (QUEUED, PROCESSING, now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE submissions SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ? WHERE id = ?",
+                    [(PROCESSING, now + lease_seconds, now, submission_id) for submission_id, _ in rows]
+                )
+                self._purge(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(submission_id, json.loads(payload)) for submission_id, payload in rows]
+
+    def complete(self, submission_id, result):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE submissions SET status = ?, result = ?, error = NULL, status_code = NULL, "
+                "lease_until = NULL, updated_at = ? WHERE id = ?",
+                (SUCCEEDED, json.dumps(result), time.time(), submission_id)
+            )
+
+    def fail(self, submission_id, message, status_code, retry=False):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE submissions SET status = CASE WHEN ? AND attempts < ? THEN ? ELSE ? END, "
+                "error = ?, status_code = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (int(retry), self.max_attempts, QUEUED, FAILED, message, status_code, time.time(), submission_id)
+            )
+            row = self._conn.execute("SELECT status FROM submissions WHERE id = ?", (submission_id,)).fetchone()
+        return row[0] if row else None
+
+    def status(self, submission_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, attempts, result, error, status_code, created_at, updated_at FROM submissions WHERE id = ?",
+                (submission_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, attempts, result, error, status_code, created_at, updated_at = row
+        entry = {"id": submission_id, "status": status, "attempts": attempts,
+                 "submitted_at": created_at, "updated_at": updated_at}
+        if result is not None:
+            entry.update(json.loads(result))
+        if error is not None:
+            entry["error"] = {"message": error, "status_code": status_code}
+        return entry
+
+    def counts(self):
+        """Number of submissions per status."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM submissions GROUP BY status").fetchall())
+
+    def _purge(self, now):
+        if self.retention:
+            self._conn.execute(
+                "DELETE FROM submissions WHERE status IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, now - self.retention)
+            )
+
+_queues = {}  # SUBMISSION_QUEUE_PATH -> queue (each tenant has its own file)
+_queue_lock = threading.Lock()
+
+def get_submission_queue():
+    """Return the process-wide submission queue for SUBMISSION_QUEUE_BACKEND and SUBMISSION_QUEUE_PATH."""
+    path = settings.SUBMISSION_QUEUE_PATH
+    queue = _queues.get(path)
+    if queue is None:
+        with _queue_lock:
+            queue = _queues.get(path)
+            if queue is None:
+                if settings.SUBMISSION_QUEUE_BACKEND != "sqlite":
+                    raise SubmissionQueueUnavailableError(
+                        f"Unsupported SUBMISSION_QUEUE_BACKEND: {settings.SUBMISSION_QUEUE_BACKEND}"
+                    )
+                _check_shared_path(path)
+                queue = _queues[path] = SQLiteSubmissionQueue(
+                    path, settings.SUBMISSION_MAX_ATTEMPTS, settings.SUBMISSION_RETENTION
+                )
+    return queue
+
+def submission_queue_ready():
+    """
+    Whether a queued submission would be processed: the processSubmissions worker is
+    enabled (SUBMISSION_WORKER_ENABLED) and the queue can be opened.
+    """
+    if not settings.SUBMISSION_WORKER_ENABLED:
+        return False
+    try:
+        get_submission_queue()
+    except SubmissionQueueUnavailableError:
+        return False
+    return True
+
+def _check_shared_path(path):
+    """
+    Refuse a queue the submission worker cannot see: on Lambda, /tmp belongs to one
+    container, so submissions accepted there would be answered 202 and never processed.
+    """
+    if not path:
+        raise SubmissionQueueUnavailableError(
+            "SUBMISSION_QUEUE_PATH is not set; async submission needs a queue shared with the worker."
+        )
+    on_lambda = os.getenv("AWS_LAMBDA_FUNCTION_NAME") and os.getenv("IS_OFFLINE") != "true"
+    if on_lambda and os.path.abspath(path).startswith("/tmp/"):
+        raise SubmissionQueueUnavailableError(
+            f"SUBMISSION_QUEUE_PATH {path} is container-local on Lambda; point it at storage shared "
+            "by every container (e.g. an EFS mount)."
+        )
+
+def reset_submission_queue():
+    """Drop the process-wide queues so the next call re-reads settings (used by tests)."""
+    with _queue_lock:
+        _queues.clear()
@@ -0,0 +1,190 @@
+import contextvars
+import json
+import random
+import threading
+import time
+from functools import wraps
+from config.settings import settings
+
+# CloudWatch Embedded Metric Format accepts at most 100 values per metric per log line
+MAX_METRIC_VALUES = 100
+
+# The invocation being traced, if any. Worker threads see it when work is submitted
+# through `submit`; asyncio tasks and asyncio.to_thread inherit it automatically.
+_current = contextvars.ContextVar("ats_trace", default=None)
+
+class Span:
+    """Times one operation of a traced invocation; extra fields are logged with it."""
+
+    __slots__ = ("trace", "name", "fields", "start")
+
+    def __init__(self, trace, name, fields):
+        self.trace = trace
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.fields.setdefault("error", exc_type.__name__)
+        self.trace.record(self.name, (time.perf_counter() - self.start) * 1000, self.fields)
+        return False
+
+class _NoopSpan:
+    """Returned by `span` when the invocation is not traced, so disabled spans cost one lookup."""
+
+    __slots__ = ()
+
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NOOP_SPAN = _NoopSpan()
+
+class Trace:
+    """
+    Spans, metrics and events of one sampled handler invocation, emitted as a
+    single CloudWatch Embedded Metric Format log line when it finishes.
+    """
+
+    def __init__(self, function, namespace="ATSIntegration", max_spans=100):
+        self.function = function
+        self.namespace = namespace
+        self.max_spans = max_spans
+        self.timestamp = int(time.time() * 1000)
+        self.metrics = {}  # name -> (unit, values)
+        self.spans = []
+        self.events = []
+        self.properties = {}
+        self.dropped_spans = 0
+        self._lock = threading.Lock()
+
+    def record(self, name, duration_ms, fields):
+        with self._lock:
+            self._add_metric(f"{name}.duration", duration_ms, "Milliseconds")
+            if len(self.spans) < self.max_spans:
+                self.spans.append({"name": name, "ms": round(duration_ms, 3), **fields})
+            else:
+                self.dropped_spans += 1
+
+    def metric(self, name, value, unit="Count"):
+        with self._lock:
+            self._add_metric(name, value, unit)
+
+    def event(self, name, **fields):
+        with self._lock:
+            if len(self.events) < self.max_spans:
+                self.events.append({"name": name, **fields})
+
+    def _add_metric(self, name, value, unit):
+        values = self.metrics.setdefault(name, (unit, []))[1]
+        if len(values) < MAX_METRIC_VALUES:
+            values.append(round(value, 3) if isinstance(value, float) else value)
+
+    def to_emf(self):
+        """The invocation as an EMF document (metrics keyed by name, spans and events as log properties)."""
+        document = {
+            "_aws": {
+                "Timestamp": self.timestamp,
+                "CloudWatchMetrics": [{
+                    "Namespace": self.namespace,
+                    "Dimensions": [["Function"]],
+                    "Metrics": [{"Name": name, "Unit": unit} for name, (unit, _) in self.metrics.items()],
+                }],
+            },
+            "Function": self.function,
+            **self.properties,
+        }
+        for name, (_, values) in self.metrics.items():
+            document[name] = values[0] if len(values) == 1 else values
+        document["spans"] = self.spans
+        if self.events:
+            document["events"] = self.events
+        if self.dropped_spans:
+            document["dropped_spans"] = self.dropped_spans
+        return document
+
+def start_trace(function):
+    """A new Trace for this invocation, or None when metrics are disabled or it was not sampled."""
+    if not settings.METRICS_ENABLED:
+        return None
+    if settings.METRICS_SAMPLE_RATE < 1 and random.random() >= settings.METRICS_SAMPLE_RATE:
+        return None
+    trace = Trace(function, settings.METRICS_NAMESPACE, settings.METRICS_MAX_SPANS)
+    trace.properties["Provider"] = settings.ATS_PROVIDER
+    if settings.TENANT_ID:
+        trace.properties["Tenant"] = settings.TENANT_ID
+    return trace
+
+def emit(trace):
+    """Write the trace to stdout, where Lambda ships it to CloudWatch Logs for metric extraction."""
+    print(json.dumps(trace.to_emf(), default=str))
+
+def traced(handler):
+    """
+    Trace a Lambda handler: sampled invocations collect spans from every layer
+    below and log them, with the status code and response size, as one EMF line.
+    """
+    name = handler.__name__
+
+    @wraps(handler)
+    def wrapper(event, context):
+        trace = start_trace(name)
+        if trace is None:
+            return handler(event, context)
+        token = _current.set(trace)
+        try:
+            with Span(trace, "handler", {}):
+                response = handler(event, context)
+            trace.properties["StatusCode"] = response.get("statusCode")
+            trace.metric("response.bytes", len(response.get("body") or ""), "Bytes")
+            return response
+        finally:
+            _current.reset(token)
+            emit(trace)
+
+    return wrapper
+
+def span(name, **fields):
+    """Context manager timing `name` in the current trace (a shared no-op when untraced)."""
+    trace = _current.get()
+    if trace is None:
+        return NOOP_SPAN
+    return Span(trace, name, fields)
+
+def tracing():
+    """True when the current invocation is being traced."""
+    return _current.get() is not None
+
+def record(name, duration_ms, **fields):
+    """Record an already-measured span in the current trace, if any."""
+    trace = _current.get()
+    if trace is not None:
+        trace.record(name, duration_ms, fields)
+
+def metric(name, value, unit="Count"):
+    """Record a metric value in the current trace, if any."""
+    trace = _current.get()
+    if trace is not None:
+        trace.metric(name, value, unit)
+
+def event(name, **fields):
+    """Log a notable occurrence (e.g. a resolved duplicate) with the current trace, if any."""
+    trace = _current.get()
+    if trace is not None:
+        trace.event(name, **fields)
+
+def submit(executor, func, *args, **kwargs):
+    """executor.submit that carries the current trace into the worker thread."""
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
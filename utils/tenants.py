@@ -0,0 +1,187 @@
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from config.settings import settings
+from utils.errors import ATSError, ValidationError, TenantNotFoundError
+from utils.response import error_response, get_header
+
+# Tenant ids end up in cache keys and file names
+TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Local files every tenant gets its own copy of, unless its config names one
+TENANT_PATHS = ("REPLICA_PATH", "SUBMISSION_QUEUE_PATH")
+
+class Tenant:
+    """One customer account: its settings overrides and usage counters."""
+
+    def __init__(self, tenant_id, overrides):
+        self.id = tenant_id
+        self.overrides = {
+            **{name: tenant_path(getattr(settings, name), tenant_id) for name in TENANT_PATHS},
+            **overrides,
+            "TENANT_ID": tenant_id,
+        }
+        self._lock = threading.Lock()
+        self._usage = {"requests": 0, "errors": 0, "functions": {}, "last_request_at": None}
+
+    def record(self, function, status_code):
+        with self._lock:
+            self._usage["requests"] += 1
+            if status_code is None or status_code >= 400:
+                self._usage["errors"] += 1
+            self._usage["functions"][function] = self._usage["functions"].get(function, 0) + 1
+            self._usage["last_request_at"] = time.time()
+
+    def usage(self):
+        with self._lock:
+            usage = {**self._usage, "functions": dict(self._usage["functions"])}
+        return {"tenant": self.id, "provider": self.overrides.get("ATS_PROVIDER", settings.ATS_PROVIDER), **usage}
+
+class TenantRegistry:
+    """The configured tenants, keyed by id."""
+
+    def __init__(self, tenants):
+        self.tenants = {tenant.id: tenant for tenant in tenants}
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build the registry from {"tenant": {"SETTING": value, ...}}, rejecting unknown
+        settings and coercing values to the type of the deployment's setting.
+        """
+        if not isinstance(config, dict) or not config:
+            raise ValueError("Tenant config must be a non-empty object of tenant -> settings.")
+        tenants = []
+        for tenant_id, values in config.items():
+            if not TENANT_ID_PATTERN.match(tenant_id):
+                raise ValueError(f"Invalid tenant id: {tenant_id!r}")
+            if not isinstance(values, dict):
+                raise ValueError(f"Settings of tenant {tenant_id} must be an object.")
+            tenants.append(Tenant(tenant_id, {name: _coerce(name, value) for name, value in values.items()}))
+        return cls(tenants)
+
+    def get(self, tenant_id):
+        tenant = self.tenants.get(tenant_id)
+        if tenant is None:
+            raise TenantNotFoundError(tenant_id)
+        return tenant
+
+    def __iter__(self):
+        return iter(self.tenants.values())
+
+def _coerce(name, value):
+    if not name.isupper() or name == "TENANT_ID" or not hasattr(settings, name):
+        raise ValueError(f"Unknown setting in tenant config: {name}")
+    current = getattr(settings, name)
+    if isinstance(current, bool):
+        return value if isinstance(value, bool) else str(value).lower() == "true"
+    if isinstance(current, (int, float)):
+        return type(current)(value)
+    return str(value)
+
+def tenant_path(path, tenant_id):
+    """`path` with the tenant id before its extension, e.g. /tmp/ats_replica.acme.sqlite3 (unset stays unset)."""
+    if not path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{tenant_id}{ext}"
+
+_registry = None
+_registry_loaded = False
+_registry_lock = threading.Lock()
+
+def get_tenants():
+    """The TenantRegistry from TENANTS_JSON or TENANTS_FILE, or None for a single-account deployment."""
+    global _registry, _registry_loaded
+    if not _registry_loaded:
+        with _registry_lock:
+            if not _registry_loaded:
+                config = None
+                if settings.TENANTS_JSON:
+                    config = json.loads(settings.TENANTS_JSON)
+                elif settings.TENANTS_FILE:
+                    with open(settings.TENANTS_FILE) as f:
+                        config = json.load(f)
+                _registry = TenantRegistry.from_config(config) if config is not None else None
+                _registry_loaded = True
+    return _registry
+
+def reset_tenants():
+    """Forget the loaded tenant config (used by tests and config reloads)."""
+    global _registry, _registry_loaded
+    with _registry_lock:
+        _registry, _registry_loaded = None, False
+
+def resolve_tenant(event):
+    """
+    The tenant an API Gateway event is for: the {tenant} path parameter, else the
+    TENANT_HEADER header, else TENANT_DEFAULT. None when no tenants are configured.
+    """
+    registry = get_tenants()
+    if registry is None:
+        return None
+    tenant_id = (
+        ((event or {}).get("pathParameters") or {}).get("tenant")
+        or get_header(event, settings.TENANT_HEADER)
+        or settings.TENANT_DEFAULT
+    )
+    if not tenant_id:
+        raise ValidationError(f"A tenant is required ({settings.TENANT_HEADER} header or /t/{{tenant}}/ path).")
+    return registry.get(tenant_id)
+
+@contextmanager
+def tenant_scope(tenant):
+    """Apply a tenant's settings for the duration of the block (no-op for None)."""
+    if tenant is None:
+        yield
+        return
+    with settings.override(tenant.overrides):
+        yield
+
+def tenant_aware(handler):
+    """
+    Run a Lambda handler with the settings of the tenant its request is for, and
+    count the request against that tenant. Apply above @traced so traces carry the tenant.
+    """
+    name = handler.__name__
+
+    @wraps(handler)
+    def wrapper(event, context):
+        try:
+            tenant = resolve_tenant(event)
+        except ATSError as e:
+            return error_response(e.message, e.status_code)
+        with tenant_scope(tenant):
+            response = handler(event, context)
+        if tenant is not None:
+            tenant.record(name, response.get("statusCode"))
+        return response
+
+    return wrapper
+
+def for_each_tenant(func):
+    """
+    Run func() once per tenant in its scope (once, unscoped, without tenants).
+    A tenant's ATSError is reported in its entry instead of stopping the others.
+    :return: func()'s result, or a dict of tenant id -> result.
+    """
+    registry = get_tenants()
+    if registry is None:
+        return func()
+    results = {}
+    for tenant in registry:
+        with tenant_scope(tenant):
+            try:
+                results[tenant.id] = func()
+            except ATSError as e:
+                results[tenant.id] = {"error": {"message": e.message, "status_code": e.status_code}}
+    return results
+
+def tenant_usage():
+    """Usage counters of every configured tenant."""
+    registry = get_tenants()
+    return [tenant.usage() for tenant in registry] if registry is not None else []
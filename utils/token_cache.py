@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from config.settings import settings
+from utils.errors import ATSError
+
+# Process-wide token store shared by every provider instance in the container.
+# Keyed by (client_id, refresh_token) so distinct OAuth clients never share tokens.
+_tokens = {}
+# key -> (retry_after, ATSError) of a failed refresh that left no usable token
+_failures = {}
+_locks = {}
+_async_locks = {}
+_registry_lock = threading.Lock()
+
+DEFAULT_EXPIRES_IN = 3600
+
+def clear_tokens():
+    """Forget all cached tokens (in memory only; persisted files are left alone)."""
+    with _registry_lock:
+        _tokens.clear()
+        _failures.clear()
+        _locks.clear()
+        _async_locks.clear()
+
+class TokenManager:
+    """
+    Caches OAuth access tokens with expiry tracking.
+
+    - Tokens are refreshed `refresh_margin` seconds before they expire.
+    - Only one caller refreshes a given token at a time; concurrent callers either
+      keep using the still-valid token or wait for the refresh to finish.
+    - A failed refresh (e.g. the token endpoint throttling us) falls back to the
+      current token while it is still valid and backs off before trying again.
+      With no usable token, callers fail fast with the same error for a short
+      while instead of each retrying the refresh in turn.
+    - Optionally persists tokens under `cache_dir` so new containers can reuse them.
+    """
+
+    def __init__(self, key, fetch_token, refresh_margin=None, cache_dir=None, retry_backoff=None,
+                 failure_backoff=None):
+        """
+        :param key: Hashable cache key, usually (client_id, refresh_token).
+        :param fetch_token: Callable returning (access_token, expires_in_seconds).
+        :param refresh_margin: Seconds before expiry at which to refresh.
+        :param cache_dir: Directory for persisted tokens; empty disables persistence.
+        :param retry_backoff: Seconds to wait after a failed refresh before retrying.
+        :param failure_backoff: Seconds to fail fast after a failed refresh that left no usable token.
+        """
+        self.key = key
+        self.fetch_token = fetch_token
+        self.refresh_margin = settings.ZOHO_TOKEN_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        self.cache_dir = settings.ZOHO_TOKEN_CACHE_DIR if cache_dir is None else cache_dir
+        self.retry_backoff = settings.ZOHO_TOKEN_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.failure_backoff = settings.ZOHO_TOKEN_FAILURE_BACKOFF if failure_backoff is None else failure_backoff
+
+    def get_token(self, stale_token=None):
+        """
+        Return a valid access token, refreshing it if needed.
+
+        :param stale_token: A token the caller saw rejected (401). If it is still the
+            cached token a refresh is forced; if another caller already replaced it,
+            the new token is returned without another round trip.
+        """
+        entry = self._get_entry()
+        if self._is_usable(entry, stale_token) and not self._needs_refresh(entry):
+            return entry["access_token"]
+
+        self._check_recent_failure(entry, stale_token)
+        lock = self._get_lock()
+        # A token that is merely close to expiry can still be served while someone else refreshes it
+        if not lock.acquire(blocking=not self._is_usable(entry, stale_token)):
+            return entry["access_token"]
+
+        try:
+            entry = self._get_entry()
+            if not self._should_refresh(entry, stale_token):
+                return entry["access_token"]
+            # Callers queued behind a refresh that just failed don't each try again
+            self._check_recent_failure(entry, stale_token)
+            try:
+                access_token, expires_in = self.fetch_token()
+            except ATSError as e:
+                return self._refresh_failed(entry, stale_token, e)
+            return self._store(access_token, expires_in)
+        finally:
+            lock.release()
+
+    def invalidate(self):
+        """Drop the cached token for this key."""
+        with _registry_lock:
+            _tokens.pop(self.key, None)
+        path = self._cache_path()
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _should_refresh(self, entry, stale_token):
+        """Re-checked under the lock: another caller may have refreshed, or we may be backing off."""
+        if not self._is_usable(entry, stale_token):
+            return True
+        if not self._needs_refresh(entry):
+            return False
+        return time.time() >= entry.get("retry_after", 0)
+
+    def _refresh_failed(self, entry, stale_token, error):
+        """
+        Fall back to the current token after a failed refresh, or re-raise if there is
+        none (and fail fast with the same error for `failure_backoff` seconds).
+        """
+        if self._is_usable(entry, stale_token):
+            print("Warning: Token refresh failed, reusing current token until it expires.")
+            entry["retry_after"] = time.time() + self.retry_backoff
+            return entry["access_token"]
+        with _registry_lock:
+            _failures[self.key] = (time.time() + self.failure_backoff, error)
+        raise error
+
+    def _check_recent_failure(self, entry, stale_token):
+        """Raise the last refresh error while backing off from it, unless a usable token exists."""
+        if self._is_usable(entry, stale_token):
+            return
+        failure = _failures.get(self.key)
+        if failure is not None and time.time() < failure[0]:
+            raise ATSError(failure[1].message, failure[1].status_code)
+
+    def _store(self, access_token, expires_in):
+        entry = {
+            "access_token": access_token,
+            "expires_at": time.time() + int(expires_in or DEFAULT_EXPIRES_IN)
+        }
+        with _registry_lock:
+            _tokens[self.key] = entry
+            _failures.pop(self.key, None)
+        self._persist(entry)
+        return access_token
+
+    def _is_usable(self, entry, stale_token=None):
+        if not entry:
+            return False
+        if stale_token is not None and entry["access_token"] == stale_token:
+            return False
+        return time.time() < entry["expires_at"]
+
+    def _needs_refresh(self, entry):
+        return time.time() >= entry["expires_at"] - self.refresh_margin
+
+    def _get_entry(self):
+        entry = _tokens.get(self.key)
+        if entry is None:
+            entry = self._load_persisted()
+            if entry is not None:
+                with _registry_lock:
+                    entry = _tokens.setdefault(self.key, entry)
+        return entry
+
+    def _get_lock(self):
+        with _registry_lock:
+            lock = _locks.get(self.key)
+            if lock is None:
+                lock = _locks[self.key] = threading.Lock()
+            return lock
+
+    def _cache_path(self):
+        if not self.cache_dir:
+            return None
+        digest = hashlib.sha256(repr(self.key).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"ats_token_{digest}.json")
+
+    def _load_persisted(self):
+        path = self._cache_path()
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if time.time() < data["expires_at"]:
+                return {"access_token": data["access_token"], "expires_at": data["expires_at"]}
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _persist(self, entry):
+        path = self._cache_path()
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not persist access token: {str(e)}")
+
+class AsyncTokenManager(TokenManager):
+    """
+    asyncio counterpart of TokenManager for async providers.
+
+    Shares the same process-wide token store (and persistence), so sync and async
+    providers for one OAuth client reuse each other's tokens. `fetch_token` must be
+    a coroutine function returning (access_token, expires_in_seconds).
+    """
+
+    async def get_token(self, stale_token=None):
+        entry = self._get_entry()
+        if self._is_usable(entry, stale_token) and not self._needs_refresh(entry):
+            return entry["access_token"]
+
+        self._check_recent_failure(entry, stale_token)
+        lock = self._get_async_lock()
+        if lock.locked() and self._is_usable(entry, stale_token):
+            return entry["access_token"]
+
+        async with lock:
+            entry = self._get_entry()
+            if not self._should_refresh(entry, stale_token):
+                return entry["access_token"]
+            self._check_recent_failure(entry, stale_token)
+            try:
+                access_token, expires_in = await self.fetch_token()
+            except ATSError as e:
+                return self._refresh_failed(entry, stale_token, e)
+            return self._store(access_token, expires_in)
+
+    def _get_async_lock(self):
+        with _registry_lock:
+            lock = _async_locks.get(self.key)
+            if lock is None:
+                lock = _async_locks[self.key] = asyncio.Lock()
+            return lock